@@ -0,0 +1,92 @@
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from cache import TTLCache
+
+# Writes under a resource also change what these other read endpoints return
+# (inventory and roster lookups are derived from teams; reports are regenerated
+# when their race strategy or the teams change).
+DEPENDENT_RESOURCES = {
+    "teams": ("inventory", "drivers", "engineers", "report_system"),
+    "race_strategy": ("report_system",),
+}
+
+WRITE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+
+def _resource(endpoint: str) -> str:
+    return endpoint.lstrip("/").split("/", 1)[0].split("?", 1)[0]
+
+
+class ApiClient:
+    """Backend client for the Streamlit frontend.
+
+    One pooled keep-alive session is shared by every rerun and every browser
+    session. Successful GETs are cached for `cache_ttl` seconds per token; a
+    write drops the cached GETs of its resource (and of resources derived from
+    it) so the next read after a save sees the new data.
+    """
+
+    def __init__(self, base_url: str, timeout: Tuple[float, float] = (3.05, 30.0), pool_size: int = 16,
+                 cache_ttl: float = 5.0, cache_size: int = 256):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        # Bumped on every write; a GET that raced with a write is not cached.
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def login(self, username: str, password: str) -> requests.Response:
+        return self.session.post(
+            f"{self.base_url}/token", data={"username": username, "password": password}, timeout=self.timeout
+        )
+
+    def request(self, method: str, endpoint: str, token: Optional[str] = None, data=None, params=None,
+                cached: bool = True) -> requests.Response:
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        url = f"{self.base_url}{endpoint}"
+
+        if method != "GET":
+            try:
+                return self.session.request(method, url, headers=headers, json=data, params=params,
+                                            timeout=self.timeout)
+            finally:
+                if method in WRITE_METHODS:
+                    self.invalidate(endpoint)
+
+        if not cached:
+            return self.session.get(url, headers=headers, params=params, timeout=self.timeout)
+
+        resource = _resource(endpoint)
+        key = (token, resource, endpoint, urlencode(params or {}, doseq=True))
+        response = self.cache.get(key)
+        if response is not None:
+            return response
+
+        generation = self._generations.get(resource, 0)
+        response = self.session.get(url, headers=headers, params=params, timeout=self.timeout)
+        if response.status_code == 200:
+            with self._lock:
+                if self._generations.get(resource, 0) == generation:
+                    self.cache.set(key, response)
+        return response
+
+    def invalidate(self, endpoint: str) -> None:
+        resource = _resource(endpoint)
+        affected = {resource, *DEPENDENT_RESOURCES.get(resource, ())}
+        with self._lock:
+            for name in affected:
+                self._generations[name] = self._generations.get(name, 0) + 1
+            self.cache.discard_if(lambda key: key[1] in affected)
+
+    def close(self) -> None:
+        self.session.close()
+        self.cache.clear()
@@ -1,18 +1,22 @@
+import os
 import streamlit as st
 import requests
 import pandas as pd
+from api_client import ApiClient
 from datetime import datetime, time
 
 st.set_page_config(page_title="F1 Team Management", layout="wide", page_icon="🏎️")
 
 API_URL = "http://127.0.0.1:8000"
+DASHBOARD_REFRESH_SECONDS = int(os.getenv("DASHBOARD_REFRESH_SECONDS", 5))
+
+@st.cache_resource
+def get_api_client():
+    return ApiClient(API_URL)
 
 def login(username, password):
     try:
-        response = requests.post(
-            f"{API_URL}/token",
-            data={"username": username, "password": password}
-        )
+        response = get_api_client().login(username, password)
         if response.status_code == 200:
             return response.json()
         else:
@@ -21,18 +25,39 @@ def login(username, password):
         st.error("Gagal terhubung ke server API. Pastikan backend berjalan!")
         return None
 
-def authenticated_request(method, endpoint, data=None, params=None):
-    headers = {"Authorization": f"Bearer {st.session_state['token']}"}
-    url = f"{API_URL}{endpoint}"
+def authenticated_request(method, endpoint, data=None, params=None, cached=True):
+    return get_api_client().request(
+        method, endpoint, token=st.session_state['token'], data=data, params=params, cached=cached
+    )
+
+def sync_table(state_key, endpoint, id_column):
+    """Refresh a DataFrame kept in session state from a `?since=` delta endpoint."""
+    state = st.session_state.get(state_key)
+    params = {"since": state['sequence'], "epoch": state['epoch']} if state else {"since": 0}
+    res = authenticated_request("GET", endpoint, params=params)
+    if res.status_code != 200:
+        return None
 
-    if method=="GET":
-        response = requests.get(url, headers=headers, params=params)
-    elif method=="POST":
-        response = requests.post(url, headers=headers, json=data)
-    elif method=="PUT":
-        response = requests.put(url, headers=headers, json=data)
-    
-    return response
+    delta = res.json()
+    changed = pd.DataFrame(delta['changed'])
+    if not changed.empty:
+        changed = changed.set_index(id_column, drop=False)
+
+    if state is None or delta['reset']:
+        frame = changed
+    else:
+        frame = state['frame']
+        existing = changed.index.intersection(frame.index)
+        if len(existing):
+            frame.loc[existing, changed.columns] = changed.loc[existing]
+        new = changed.index.difference(frame.index)
+        if len(new):
+            frame = pd.concat([frame, changed.loc[new]])
+        if delta['deleted']:
+            frame = frame.drop(index=delta['deleted'], errors="ignore")
+
+    st.session_state[state_key] = {"frame": frame, "sequence": delta['sequence'], "epoch": delta['epoch']}
+    return frame
 
 if 'token' not in st.session_state:
     st.session_state['token'] = None
@@ -57,15 +82,50 @@ def show_login_page():
             else:
                 st.error("Username atau Password salah")
 
+def show_dashboard_summary():
+    start = datetime.now()
+    try:
+        res = authenticated_request("GET", "/dashboard/summary", cached=False)
+    except requests.exceptions.RequestException:
+        st.error("Gagal terhubung ke server API.")
+        return
+    round_trip = (datetime.now() - start).total_seconds() * 1000
+    if res.status_code != 200:
+        st.error(f"Gagal mengambil ringkasan: {res.status_code}")
+        return
+
+    summary = res.json()
+    api = summary['api']
+    col1, col2, col3 = st.columns(3)
+    col1.metric("API Status", "Online", f"{round_trip:.0f} ms round-trip", delta_color="off")
+    col2.metric("Latency p50 / p95", f"{api['p50Ms']:.1f} / {api['p95Ms']:.1f} ms",
+                f"{api['requests']} request, {api['inFlight']} aktif", delta_color="off")
+    col3.metric("Laporan Dibuat", summary['reports'])
+
+    col4, col5, col6 = st.columns(3)
+    col4.metric("Tim", summary['teams'])
+    col5.metric("Driver / Engineer", f"{summary['drivers']} / {summary['engineers']}")
+    col6.metric("Jadwal Engineer", summary['schedules'])
+
+    st.subheader("Telemetri Terakhir per Driver")
+    if summary['telemetry']:
+        st.dataframe(pd.DataFrame(summary['telemetry']), hide_index=True)
+    else:
+        st.info("Belum ada data telemetri.")
+    st.caption(f"Diperbarui {datetime.now():%H:%M:%S}")
+
 def show_dashboard():
     st.title(f"Selamat Datang, {st.session_state['username']}! 👋")
     st.info("Gunakan sidebar di sebelah kiri untuk navigasi antar fitur.")
-    
+
     st.subheader("Status Sistem")
-    col1, col2, col3 = st.columns(3)
-    col1.metric("API Status", "Online", "200 OK")
-    col2.metric("Role", "API Manager", "Verified")
-    col3.metric("Season", "2025", "Current")
+    interval = st.select_slider(
+        "Interval refresh (detik)", options=sorted({2, 5, 10, 30, 60, DASHBOARD_REFRESH_SECONDS}),
+        value=DASHBOARD_REFRESH_SECONDS,
+        key="dashboard_refresh"
+    )
+    # Hanya fragment ini yang dijalankan ulang tiap interval; halaman lain tidak ikut menunggu.
+    st.fragment(run_every=interval)(show_dashboard_summary)()
 
 def show_team_management():
     st.header("🛡️ Manajemen Tim 🛡️")
@@ -79,7 +139,7 @@ def show_team_management():
             'drivers': []
         }
     
-    tab1, tab2 = st.tabs(["Buat Tim Baru", "Lihat Data Tim"])
+    tab1, tab2, tab3 = st.tabs(["Buat Tim Baru", "Lihat Data Tim", "Update Cepat"])
     
     with tab1:
         st.subheader("Informasi Utama Tim")
@@ -217,6 +277,47 @@ def show_team_management():
             else:
                 st.warning("Tim tidak ditemukan.")
 
+    with tab3:
+        st.caption("Ubah satu elemen tim tanpa mengirim ulang seluruh data tim.")
+        u_team = st.number_input("Team ID", min_value=1, step=1, key="patch_team")
+
+        st.markdown("##### Inventory")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            u_item = st.number_input("Item ID", min_value=0, step=1, key="patch_item")
+        with col2:
+            u_qty = st.number_input("Quantity Baru", min_value=0, step=1, key="patch_qty")
+        with col3:
+            u_status = st.selectbox("Status Baru", ["Ready", "Damaged", "In Use"], key="patch_status")
+        b1, b2 = st.columns(2)
+        if b1.button("Update Item"):
+            res = authenticated_request("PATCH", f"/teams/{u_team}/inventory/{u_item}",
+                                        data={"quantity": u_qty, "status": u_status})
+            if res.status_code == 200:
+                st.success("Item inventory diperbarui.")
+            else:
+                st.error(f"Gagal: {res.text}")
+        if b2.button("Hapus Item"):
+            res = authenticated_request("DELETE", f"/teams/{u_team}/inventory/{u_item}")
+            if res.status_code == 204:
+                st.success("Item inventory dihapus.")
+            else:
+                st.error(f"Gagal: {res.text}")
+
+        st.markdown("##### Kondisi Driver")
+        col1, col2 = st.columns(2)
+        with col1:
+            u_driver = st.number_input("Driver ID", min_value=0, step=1, key="patch_driver")
+        with col2:
+            u_cond = st.selectbox("Kondisi Fisik", ["Fit", "Injured", "Recovering"], key="patch_cond")
+        if st.button("Update Driver"):
+            res = authenticated_request("PATCH", f"/teams/{u_team}/drivers/{u_driver}",
+                                        data={"physicalCondition": u_cond})
+            if res.status_code == 200:
+                st.success("Kondisi driver diperbarui.")
+            else:
+                st.error(f"Gagal: {res.text}")
+
 def show_engineer_management():
     st.header("🔧 Engineer Management 🔧")
     st.caption("Penjadwalan tugas untuk mekanik dan teknisi.")
@@ -254,17 +355,15 @@ def show_engineer_management():
                     st.error(f"Error: {res.text}")
 
     with tab2:
-        if st.button("Refresh Jadwal"):
-            res = authenticated_request("GET", "/engineer_management/schedules/")
-            if res.status_code == 200:
-                data = res.json()
-                if data:
-                    df = pd.DataFrame(data)
-                    st.dataframe(df)
-                else:
-                    st.info("Belum ada jadwal.")
-            else:
+        if st.button("Refresh Jadwal") or 'schedule_table' in st.session_state:
+            df = sync_table('schedule_table', "/engineer_management/schedules/changes", "scheduleID")
+            if df is None:
                 st.error("Gagal mengambil data.")
+            elif not df.empty:
+                st.dataframe(df.sort_index(), hide_index=True)
+            else:
+                st.info("Belum ada jadwal.")
+
 def show_report_system():
     st.header("📄 Report System 📄")
     st.caption("Generate laporan otomatis hasil balapan.")
@@ -312,6 +411,17 @@ def show_report_system():
                 with st.expander(f"Analisis: {team}"):
                     st.write(analysis)
 
+    st.divider()
+    st.subheader("Daftar Laporan")
+    if st.button("Refresh Daftar Laporan") or 'report_table' in st.session_state:
+        df = sync_table('report_table', "/report_system/changes", "reportID")
+        if df is None:
+            st.error("Gagal mengambil daftar laporan.")
+        elif not df.empty:
+            st.dataframe(df[["reportID", "raceID", "generatedDate", "raceSummary"]].sort_index(), hide_index=True)
+        else:
+            st.info("Belum ada laporan.")
+
 
 def show_race_strategy_simple():
     st.header("🏎️ Race Strategy (Simple) 🏎️")
@@ -363,6 +473,8 @@ else:
         if st.button("Logout"):
             st.session_state['token'] = None
             st.session_state['username'] = None
+            st.session_state.pop('schedule_table', None)
+            st.session_state.pop('report_table', None)
             st.rerun()
 
     if menu == "Dashboard":
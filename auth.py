@@ -1,15 +1,19 @@
 import os
+import asyncio
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import JWTError, jwt
+from jose import jwt
 from passlib.context import CryptContext
-from dotenv import load_dotenv 
 
-load_dotenv()
+import config  # noqa: F401  (loads .env)
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
+LOGIN_HASH_CONCURRENCY = int(os.getenv("LOGIN_HASH_CONCURRENCY", 4))
+LOGIN_QUEUE_TIMEOUT = float(os.getenv("LOGIN_QUEUE_TIMEOUT", 5))
 
 if not SECRET_KEY:
     raise ValueError("SECRET_KEY belum diset di file .env!")
@@ -22,6 +26,44 @@ def verify_password(plain_password, hashed_password):
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+_hash_executor: Optional[ThreadPoolExecutor] = None
+_hash_slots = weakref.WeakKeyDictionary()
+
+def get_hash_executor() -> ThreadPoolExecutor:
+    """Created on first use and again after shutdown_hash_executor()."""
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ThreadPoolExecutor(max_workers=LOGIN_HASH_CONCURRENCY, thread_name_prefix="pwhash")
+    return _hash_executor
+
+def shutdown_hash_executor() -> None:
+    global _hash_executor
+    executor, _hash_executor = _hash_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+def _slots_for_running_loop() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    slots = _hash_slots.get(loop)
+    if slots is None:
+        slots = asyncio.Semaphore(LOGIN_HASH_CONCURRENCY)
+        _hash_slots[loop] = slots
+    return slots
+
+async def verify_password_async(plain_password, hashed_password):
+    """verify_password on the hash executor, without blocking the event loop.
+
+    At most LOGIN_HASH_CONCURRENCY hashes run at once; a caller that waits longer
+    than LOGIN_QUEUE_TIMEOUT for a slot gets asyncio.TimeoutError.
+    """
+    slots = _slots_for_running_loop()
+    await asyncio.wait_for(slots.acquire(), timeout=LOGIN_QUEUE_TIMEOUT)
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_hash_executor(), verify_password, plain_password, hashed_password)
+    finally:
+        slots.release()
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -0,0 +1,247 @@
+"""Per-endpoint load test of main.app, run in-process over httpx's ASGI transport.
+
+Seeds teams, races, strategies, reports, schedules, laps and telemetry, then
+fires each scenario with a fixed number of concurrent clients and reports
+p50/p95/p99 latency and throughput. Results are compared with
+benchmarks/baselines.json; a scenario whose p50 or p95 is worse than the
+baseline by more than --tolerance (plus a small absolute slack) fails the
+run with exit status 1. Throughput is reported but not gated: at a fixed
+concurrency it moves with latency.
+
+Baselines are machine-specific: regenerate them with --update-baseline on the
+machine that runs the comparison.
+
+Usage: python -m benchmarks.asgi_suite [--concurrency N] [--requests N] [--only SUBSTRING]
+                                       [--tolerance X] [--baseline PATH] [--update-baseline]
+"""
+import argparse
+import asyncio
+import gc
+import itertools
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import date, time as clock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+import httpx  # noqa: E402
+
+import main  # noqa: E402
+from auth import create_access_token  # noqa: E402
+from dependencies import db_driver_performance, db_race_strategies, db_teams, users_db  # noqa: E402
+from engineer_management import db_engineer_schedules, schedule_ids  # noqa: E402
+from lap_store import CompactDriverPerformance  # noqa: E402
+from models import (  # noqa: E402
+    Driver, Engineer, EngineerSchedule, InventoryItem, Race, RaceStrategy, Sponsor, StrategyPlan, Team,
+    TelemetryData
+)
+from report_system import submit_report  # noqa: E402
+from telemetry import telemetry_hub  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+
+TEAMS = 20
+RACES = 50
+SCHEDULES = 5_000
+DRIVERS = TEAMS * 2
+LAPS = 60
+# Races reserved for the report generation scenario, one per request.
+GENERATE_FROM = 10_000
+# Absolute slack so fast endpoints do not fail on scheduler noise.
+SLACK_MS = 2.0
+
+
+def seed(requests):
+    for t in range(1, TEAMS + 1):
+        db_teams[t] = Team(
+            teamID=t, name=f"Team{t}",
+            drivers=[Driver(driverID=d, name=f"Driver {d}", driverAbb=f"D{d:02d}", nationality="ITA",
+                            physicalCondition="Fit") for d in (2 * t - 1, 2 * t)],
+            sponsors=[Sponsor(sponsorID=s, sponsorName=f"Sponsor {s}", contractValue=1e6) for s in range(10)],
+            engineers=[Engineer(engineerID=100 * t + e, name=f"Engineer {e}", role="Mechanic") for e in range(25)],
+            members=[f"Member {m}" for m in range(30)],
+            inventory=[InventoryItem(itemID=i, partName=f"Part {i % 40}", quantity=i % 12, status="Ready")
+                       for i in range(200)],
+        )
+
+    def strategy(race_id):
+        return RaceStrategy(
+            race=Race(raceID=race_id, circuitName="Monza", date=date(2025, 9, 7), weather="Sunny",
+                      result=[f"P{p}: Driver {p} (Team{(p - 1) // 2 + 1})" for p in range(1, DRIVERS + 1)]),
+            strategyPlan=StrategyPlan(pitStopSchedule=[18, 36], tyreStrategy=["Medium", "Hard"], fuelPlan="Lean"),
+            liveTelemetry=TelemetryData(speed=300, rpm=11000, temperature=90),
+        )
+
+    db_race_strategies.put_many((r, strategy(r)) for r in range(1, RACES + 1))
+    db_race_strategies.put_many((r, strategy(r)) for r in range(GENERATE_FROM, GENERATE_FROM + requests))
+    for r in range(1, RACES + 1):
+        submit_report(r).result()
+
+    db_engineer_schedules.put_many(
+        (i, EngineerSchedule(scheduleID=i, engineerID=100 + i % 500, taskDescription="Setup",
+                             date=date(2025, 3 + i % 9, 1 + i % 28), startTime=clock(8 + i % 10),
+                             endTime=clock(9 + i % 10), location=f"Garage {i % 5}", raceID=1 + i % RACES))
+        for i in range(1, SCHEDULES + 1)
+    )
+    schedule_ids.observe(SCHEDULES)
+
+    for d in range(1, DRIVERS + 1):
+        driver = Driver(driverID=d, name=f"Driver {d}", driverAbb=f"D{d:02d}", nationality="ITA",
+                        physicalCondition="Fit")
+        laps = [90_000 + 37 * lap + (d * 113 + lap * 71) % 900 for lap in range(LAPS)]
+        db_driver_performance[d] = CompactDriverPerformance.from_ms(
+            driver, laps, TelemetryData(speed=300, rpm=11000, temperature=90)
+        )
+        for t in range(1000):
+            telemetry_hub.ingest({"driverID": d, "ts": t, "speed": 300.0, "rpm": 11000, "temperature": 90.0})
+
+
+def schedule_body(i):
+    return {"engineerID": 50_000 + i, "taskDescription": "Bench", "date": "2025-10-10",
+            "startTime": "09:00:00", "endTime": "10:00:00", "location": "Garage", "raceID": 1}
+
+
+# name -> (method, path(i), body(i) or None)
+SCENARIOS = {
+    "GET /teams/{id}": ("GET", lambda i: f"/teams/{i % TEAMS + 1}", None),
+    "PATCH /teams/{id}/inventory/{item}": (
+        "PATCH", lambda i: f"/teams/{i % TEAMS + 1}/inventory/{i % 200}", lambda i: {"quantity": i % 12}),
+    "GET /drivers/{id}": ("GET", lambda i: f"/drivers/{i % DRIVERS + 1}", None),
+    "GET /inventory/low-stock": ("GET", lambda i: "/inventory/low-stock?threshold=3", None),
+    "GET /race_strategy/{id}": ("GET", lambda i: f"/race_strategy/{i % RACES + 1}", None),
+    "GET /report_system/{id}": ("GET", lambda i: f"/report_system/race/{i % RACES + 1}", None),
+    "POST /report_system/generate/{race}": ("POST", lambda i: f"/report_system/generate/{GENERATE_FROM + i}", None),
+    "GET /engineer_management/schedules/?race_id": (
+        "GET", lambda i: f"/engineer_management/schedules/?race_id={i % RACES + 1}", None),
+    "GET /engineer_management/schedules/?limit=100": (
+        "GET", lambda i: f"/engineer_management/schedules/?limit=100&after={(i * 100) % SCHEDULES}", None),
+    "GET /engineer_management/schedules/engineer/{id}": (
+        "GET", lambda i: f"/engineer_management/schedules/engineer/{100 + i % 500}", None),
+    "GET /engineer_management/schedules/conflicts": (
+        "GET", lambda i: f"/engineer_management/schedules/conflicts?race_id={i % RACES + 1}", None),
+    "POST /engineer_management/schedules/": ("POST", lambda i: "/engineer_management/schedules/", schedule_body),
+    "GET /driver_performance/{id}/analytics": (
+        "GET", lambda i: f"/driver_performance/{i % DRIVERS + 1}/analytics?pit_laps=18&pit_laps=36", None),
+    "GET /telemetry/{id}?last=200": ("GET", lambda i: f"/telemetry/{i % DRIVERS + 1}?last=200", None),
+}
+
+
+def percentile(sorted_ms, q):
+    return sorted_ms[min(len(sorted_ms) - 1, int(len(sorted_ms) * q))]
+
+
+async def run_scenario(client, headers, scenario, requests, concurrency, counter):
+    method, path, body = scenario
+    latencies, failures = [], []
+
+    async def worker():
+        while True:
+            i = next(counter)
+            if i >= requests:
+                return
+            start = time.perf_counter()
+            res = await client.request(method, path(i), json=body(i) if body else None, headers=headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if res.status_code >= 300:
+                failures.append(res.status_code)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "rps": round(requests / wall, 1),
+        "errors": len(failures),
+    }
+
+
+async def run_suite(names, requests, concurrency):
+    users_db["bench"] = {"username": "bench", "full_name": "Bench", "email": None,
+                         "hashed_password": "x", "disabled": False}
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'bench'})}"}
+    transport = httpx.ASGITransport(app=main.app)
+    results = {}
+    # ASGITransport does not send lifespan events; run the app's lifespan so the
+    # pools are shut down at the end, and finish its background warm-up (numpy)
+    # first so the first analytics requests do not pay for it inside the window.
+    async with main.app.router.lifespan_context(main.app), \
+            httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await asyncio.get_running_loop().run_in_executor(None, main.warm_up)
+        for name in names:
+            if SCENARIOS[name][0] == "GET":
+                # Unmeasured pass: worker threads and first-call code paths warm up outside the window.
+                await run_scenario(client, headers, SCENARIOS[name], concurrency, concurrency, itertools.count())
+            results[name] = await run_scenario(
+                client, headers, SCENARIOS[name], requests, concurrency, itertools.count()
+            )
+    return results
+
+
+def compare(results, baselines, tolerance):
+    regressions = []
+    for name, result in results.items():
+        base = baselines.get(name)
+        if base is None:
+            continue
+        for key in ("p50_ms", "p95_ms"):
+            if result[key] > base[key] * tolerance + SLACK_MS:
+                regressions.append(f"{name}: {key[:3]} {result[key]:.2f} ms vs baseline {base[key]:.2f} ms")
+    return regressions
+
+
+def main_():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=400, help="requests per scenario")
+    parser.add_argument("--only", default=None, help="run scenarios whose name contains this string")
+    parser.add_argument("--tolerance", type=float, default=2.0, help="allowed slowdown factor vs. baseline")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    names = [name for name in SCENARIOS if args.only is None or args.only in name]
+    seed(args.requests)
+    # Seeded data lives for the whole run; keep full collections from rescanning it mid-scenario.
+    gc.collect()
+    gc.freeze()
+    results = asyncio.run(run_suite(names, args.requests, args.concurrency))
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baselines = json.load(f)
+
+    print(f"{args.requests} requests per scenario, concurrency {args.concurrency}")
+    print(f"{'scenario':<50}{'p50':>9}{'p95':>9}{'p99':>9}{'req/s':>9}{'base p95':>10}")
+    for name, r in results.items():
+        base = baselines.get(name, {}).get("p95_ms")
+        base_text = f"{base:>10.2f}" if base is not None else f"{'-':>10}"
+        print(f"{name:<50}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}{r['rps']:>9.0f}{base_text}")
+
+    errors = [f"{name}: {r['errors']} non-2xx responses" for name, r in results.items() if r["errors"]]
+    if args.update_baseline:
+        baselines.update({name: {k: r[k] for k in ("p50_ms", "p95_ms", "p99_ms", "rps")}
+                          for name, r in results.items()})
+        with open(args.baseline, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"baselines written to {args.baseline}")
+        regressions = []
+    else:
+        regressions = compare(results, baselines, args.tolerance)
+
+    for problem in errors + regressions:
+        print(f"FAIL {problem}")
+    sys.exit(1 if errors or regressions else 0)
+
+
+if __name__ == "__main__":
+    main_()
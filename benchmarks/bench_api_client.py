@@ -0,0 +1,97 @@
+"""Frontend round-trip time: bare requests calls vs. the pooled, cached ApiClient.
+
+Serves main.app with uvicorn on a local port and replays a Streamlit rerun (team
+lookup, schedule list, report view) ITERATIONS times with each client.
+
+Usage: python -m benchmarks.bench_api_client [ITERATIONS]
+"""
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+from datetime import date, time as clock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+import requests  # noqa: E402
+import uvicorn  # noqa: E402
+
+import main  # noqa: E402
+from api_client import ApiClient  # noqa: E402
+from auth import create_access_token  # noqa: E402
+from dependencies import db_race_strategies, db_teams, users_db  # noqa: E402
+from engineer_management import db_engineer_schedules  # noqa: E402
+from models import EngineerSchedule, Race, RaceStrategy, StrategyPlan, Team, TelemetryData  # noqa: E402
+from report_system import submit_report  # noqa: E402
+
+RERUN = ["/teams/1", "/engineer_management/schedules/", "/report_system/1"]
+
+
+def seed():
+    db_teams[1] = Team(teamID=1, name="Ferrari", members=[f"Member {m}" for m in range(30)])
+    db_engineer_schedules.put_many(
+        (i, EngineerSchedule(scheduleID=i, engineerID=100 + i % 20, taskDescription="Setup", date=date(2025, 3, 1),
+                             startTime=clock(8), endTime=clock(9), location="Garage", raceID=1))
+        for i in range(1, 201)
+    )
+    db_race_strategies[1] = RaceStrategy(
+        race=Race(raceID=1, circuitName="Monza", date=date(2025, 9, 7), weather="Sunny",
+                  result=["P1: Driver 1 (Ferrari)", "P2: Driver 2 (Ferrari)"]),
+        strategyPlan=StrategyPlan(pitStopSchedule=[20], tyreStrategy=["Soft", "Hard"], fuelPlan="Push"),
+        liveTelemetry=TelemetryData(speed=0, rpm=0, temperature=0),
+    )
+    submit_report(1).result()
+
+
+def serve():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, f"http://127.0.0.1:{port}"
+
+
+def measure(fetch, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        for endpoint in RERUN:
+            assert fetch(endpoint).status_code == 200
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main_():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    seed()
+    users_db["bench"] = {"username": "bench", "full_name": "Bench", "email": None,
+                         "hashed_password": "x", "disabled": False}
+    token = create_access_token(data={"sub": "bench"})
+    headers = {"Authorization": f"Bearer {token}"}
+    server, base_url = serve()
+
+    pooled = ApiClient(base_url)
+    cached = ApiClient(base_url)
+    clients = {
+        "requests.get (new connection)": lambda e: requests.get(f"{base_url}{e}", headers=headers),
+        "ApiClient, pooled, no cache": lambda e: pooled.request("GET", e, token=token, cached=False),
+        "ApiClient, pooled + TTL cache": lambda e: cached.request("GET", e, token=token),
+    }
+
+    print(f"{iterations} reruns of {len(RERUN)} GETs each")
+    for label, fetch in clients.items():
+        samples = sorted(measure(fetch, iterations))
+        print(f"{label:<32} p50={statistics.median(samples):7.2f} ms  "
+              f"p95={samples[int(len(samples) * 0.95) - 1]:7.2f} ms")
+
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main_()
@@ -0,0 +1,85 @@
+"""Throughput of the NDJSON bulk import endpoints vs. one POST per record.
+
+Runs main.app in-process over httpx's ASGI transport.
+
+Usage: python -m benchmarks.bench_bulk_import [RECORDS] [SINGLE_POST_SAMPLE]
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+import httpx  # noqa: E402
+
+import main  # noqa: E402
+from auth import get_password_hash  # noqa: E402
+from dependencies import db_race_strategies, db_teams, users_db  # noqa: E402
+from engineer_management import db_engineer_schedules  # noqa: E402
+
+
+def team(i):
+    return {"teamID": i, "name": f"Team{i}", "members": [f"M{i}"], "inventory": [
+        {"itemID": 1, "partName": "Front Wing", "quantity": 4, "status": "Ready"}]}
+
+
+def schedule(i):
+    return {"engineerID": i, "taskDescription": "Check tyres", "date": "2025-10-10",
+            "startTime": "09:00:00", "endTime": "10:00:00", "location": "Garage", "raceID": i % 24}
+
+
+def strategy(i):
+    return {"race": {"raceID": i, "circuitName": "Spa", "date": "2025-08-01", "weather": "Sunny", "result": []},
+            "strategyPlan": {"pitStopSchedule": [20], "tyreStrategy": ["Soft", "Hard"], "fuelPlan": "Push"},
+            "liveTelemetry": {"speed": 0, "rpm": 0, "temperature": 0}}
+
+
+CASES = [
+    ("teams", "/teams/bulk", "/teams/", team, db_teams),
+    ("schedules", "/engineer_management/schedules/bulk", "/engineer_management/schedules/", schedule,
+     db_engineer_schedules),
+    ("race strategies", "/race_strategy/bulk", "/race_strategy/", strategy, db_race_strategies),
+]
+
+
+async def run(records, sample):
+    users_db["bench"] = {"username": "bench", "full_name": "Bench", "email": None,
+                         "hashed_password": get_password_hash("bench"), "disabled": False}
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        token = (await client.post("/token", data={"username": "bench", "password": "bench"})).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        for label, bulk_url, single_url, make, store in CASES:
+            store.clear()
+            body = ("\n".join(json.dumps(make(i)) for i in range(1, records + 1))).encode()
+
+            async def chunks():
+                for i in range(0, len(body), 64 * 1024):
+                    yield body[i:i + 64 * 1024]
+
+            start = time.perf_counter()
+            result = (await client.post(bulk_url, content=chunks(), headers=headers)).json()
+            bulk_s = time.perf_counter() - start
+
+            store.clear()
+            start = time.perf_counter()
+            for i in range(1, sample + 1):
+                await client.post(single_url, json=make(i), headers=headers)
+            single_s = time.perf_counter() - start
+
+            print(f"{label:<16} bulk: {result['inserted']:>7} rows in {bulk_s:6.2f} s = {records / bulk_s:>9,.0f} rows/s"
+                  f" | single POST: {sample / single_s:>7,.0f} rows/s")
+
+
+def main_():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    sample = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+    asyncio.run(run(records, sample))
+
+
+if __name__ == "__main__":
+    main_()
@@ -0,0 +1,77 @@
+"""Cold start cost: `import main` time and time to first served request.
+
+Each sample is a fresh interpreter. "first request" spawns uvicorn and polls
+GET /metrics until it answers, measured from process start. Runs once with a
+plaintext ADMIN_PASSWORD and once with a pre-hashed ADMIN_PASSWORD_HASH.
+
+Usage: python -m benchmarks.bench_cold_start [RUNS]
+"""
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from passlib.context import CryptContext  # noqa: E402
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+
+
+def environment(prehashed: bool):
+    env = dict(os.environ, ADMIN_USERNAME="bench_admin", ADMIN_PASSWORD="bench-password")
+    if prehashed:
+        env["ADMIN_PASSWORD_HASH"] = CryptContext(schemes=["pbkdf2_sha256"]).hash("bench-password")
+        # Empty rather than unset, so a local .env cannot fill it back in.
+        env["ADMIN_PASSWORD"] = ""
+    return env
+
+
+def import_seconds(env):
+    out = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def first_request_seconds(env):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=1) as res:
+                    if res.status == 200:
+                        return time.perf_counter() - start
+            except OSError:
+                if server.poll() is not None:
+                    raise RuntimeError("uvicorn exited before serving")
+                time.sleep(0.005)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main_():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"median of {runs} fresh processes")
+    for label, prehashed in (("ADMIN_PASSWORD (plaintext)", False), ("ADMIN_PASSWORD_HASH", True)):
+        env = environment(prehashed)
+        imports = [import_seconds(env) * 1000 for _ in range(runs)]
+        first = [first_request_seconds(env) * 1000 for _ in range(runs)]
+        print(f"{label:<28} import main {statistics.median(imports):7.1f} ms   "
+              f"first request {statistics.median(first):7.1f} ms")
+
+
+if __name__ == "__main__":
+    main_()
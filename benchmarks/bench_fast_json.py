@@ -0,0 +1,101 @@
+"""Per-endpoint latency and CPU of GET responses with and without FAST_JSON_RESPONSES.
+
+Usage: python -m benchmarks.bench_fast_json [ITERATIONS]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import date, time as clock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+import httpx  # noqa: E402
+
+import fast_json  # noqa: E402
+import main  # noqa: E402
+from auth import create_access_token  # noqa: E402
+from dependencies import db_race_strategies, db_teams, users_db  # noqa: E402
+from engineer_management import db_engineer_schedules  # noqa: E402
+from models import (  # noqa: E402
+    Driver, Engineer, EngineerSchedule, InventoryItem, Race, RaceStrategy, Sponsor, StrategyPlan, Team,
+    TelemetryData
+)
+from telemetry import telemetry_hub  # noqa: E402
+
+ENDPOINTS = [
+    "/teams/1",
+    "/engineer_management/schedules/",
+    "/engineer_management/schedules/?limit=500",
+    "/race_strategy/1",
+    "/telemetry/1",
+    "/inventory/",
+]
+
+
+def seed():
+    db_teams[1] = Team(
+        teamID=1, name="Ferrari",
+        drivers=[Driver(driverID=i, name=f"Driver {i}", driverAbb="DRV", nationality="ITA", physicalCondition="Fit")
+                 for i in range(500)],
+        sponsors=[Sponsor(sponsorID=i, sponsorName=f"Sponsor {i}", contractValue=1e6) for i in range(500)],
+        engineers=[Engineer(engineerID=i, name=f"Engineer {i}", role="Mechanic") for i in range(500)],
+        members=[f"Member {i}" for i in range(500)],
+        inventory=[InventoryItem(itemID=i, partName=f"Part {i % 200}", quantity=i % 9, status="Ready")
+                   for i in range(2000)],
+    )
+    db_engineer_schedules.put_many(
+        (i, EngineerSchedule(scheduleID=i, engineerID=i, taskDescription="Setup", date=date(2025, 9, 7),
+                             startTime=clock(9), endTime=clock(10), location="Garage", raceID=1))
+        for i in range(1, 5001)
+    )
+    db_race_strategies[1] = RaceStrategy(
+        race=Race(raceID=1, circuitName="Monza", date=date(2025, 9, 7), weather="Sunny",
+                  result=[f"P{p}: Driver {p} (Ferrari)" for p in range(1, 21)]),
+        strategyPlan=StrategyPlan(pitStopSchedule=list(range(1, 60)), tyreStrategy=["Soft", "Medium"] * 30,
+                                  fuelPlan="Lean"),
+        liveTelemetry=TelemetryData(speed=300, rpm=11000, temperature=90),
+    )
+    for t in range(telemetry_hub.capacity):
+        telemetry_hub.ingest({"driverID": 1, "ts": t, "speed": 300.5, "rpm": 11000, "temperature": 90.1})
+
+
+async def measure(client, headers, path, iterations):
+    latencies = []
+    cpu_start = time.process_time()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        res = await client.get(path, headers=headers)
+        latencies.append(time.perf_counter() - start)
+    cpu = (time.process_time() - cpu_start) / iterations
+    assert res.status_code == 200, (path, res.status_code)
+    return statistics.median(latencies), cpu, len(res.content)
+
+
+async def run(iterations):
+    users_db["bench"] = {"username": "bench", "full_name": "Bench", "email": None,
+                         "hashed_password": "x", "disabled": False}
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'bench'})}"}
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{'endpoint':<44}{'bytes':>10}{'default p50':>13}{'fast p50':>10}{'default cpu':>13}"
+              f"{'fast cpu':>10}")
+        for path in ENDPOINTS:
+            fast_json.FAST_JSON_RESPONSES = False
+            slow_p50, slow_cpu, size = await measure(client, headers, path, iterations)
+            fast_json.FAST_JSON_RESPONSES = True
+            fast_p50, fast_cpu, _ = await measure(client, headers, path, iterations)
+            print(f"{path:<44}{size:>10,}{slow_p50 * 1000:>10.2f} ms{fast_p50 * 1000:>7.2f} ms"
+                  f"{slow_cpu * 1000:>10.2f} ms{fast_cpu * 1000:>7.2f} ms")
+
+
+def main_():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    seed()
+    asyncio.run(run(iterations))
+
+
+if __name__ == "__main__":
+    main_()
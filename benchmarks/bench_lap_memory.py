@@ -0,0 +1,48 @@
+"""Bytes per lap: list of pydantic LapTime objects vs. the packed array('I') store.
+
+Usage: python -m benchmarks.bench_lap_memory [LAPS]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lap_store import CompactDriverPerformance  # noqa: E402
+from models import DriverPerformance, DriverPerformanceCompact  # noqa: E402
+
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    obj = build()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return obj, size, elapsed
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    raw_laps = [{"minutes": 1, "seconds": 20 + i % 40, "milliseconds": i % 1000} for i in range(n)]
+    payload = {
+        "driver": {"driverID": 1, "name": "Lewis", "driverAbb": "HAM", "nationality": "UK", "physicalCondition": "Fit"},
+        "lapTimes": raw_laps,
+        "liveTelemetry": {"speed": 0, "rpm": 0, "temperature": 0},
+    }
+
+    record, model_bytes, model_s = measure(lambda: DriverPerformance.model_validate(payload))
+    compact, compact_bytes, compact_s = measure(lambda: CompactDriverPerformance.from_model(record))
+    compact_payload = {**payload, "lapTimesMs": list(compact.lap_ms)}
+    _, _, compact_validate_s = measure(lambda: DriverPerformanceCompact.model_validate(compact_payload))
+
+    print(f"{n} laps")
+    print(f"  pydantic LapTime list: {model_bytes / n:8.1f} bytes/lap  (validate {model_s * 1000:.1f} ms)")
+    print(f"  packed array('I'):     {compact_bytes / n:8.1f} bytes/lap  (pack {compact_s * 1000:.1f} ms)")
+    print(f"  compact POST body validation: {compact_validate_s * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
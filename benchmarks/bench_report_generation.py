@@ -0,0 +1,56 @@
+"""Race report generation: previous per-team scan vs. the single-pass position table.
+
+Usage: python -m benchmarks.bench_report_generation [TEAMS] [RESULT_ENTRIES]
+"""
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from dependencies import db_teams  # noqa: E402
+from models import Race, Team  # noqa: E402
+from report_system import simulate_report_generation  # noqa: E402
+
+
+def legacy_team_analysis(race):
+    team_analysis = {}
+    for team in db_teams.values():
+        team_drivers_in_result = [r for r in race.result if f"({team.name})" in r]
+        if team_drivers_in_result:
+            best_pos_index = min([race.result.index(r) for r in team_drivers_in_result])
+            best_driver_result = race.result[best_pos_index]
+            team_analysis[team.name] = (best_pos_index + 1, best_driver_result.split(':')[1].split('(')[0].strip())
+        else:
+            team_analysis[team.name] = None
+    return team_analysis
+
+
+def main():
+    n_teams = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    n_results = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+
+    db_teams.clear()
+    for i in range(n_teams):
+        db_teams[i] = Team(teamID=i, name=f"Team{i}")
+    race = Race(
+        raceID=1, circuitName="Monza", date=date(2025, 9, 7), weather="Sunny",
+        result=[f"P{p}: Driver{p} (Team{(p * 7) % n_teams})" for p in range(1, n_results + 1)],
+    )
+
+    start = time.perf_counter()
+    simulate_report_generation(race)
+    new = time.perf_counter() - start
+    print(f"single pass:     {new * 1000:10.1f} ms  ({n_teams} teams, {n_results} result entries)")
+
+    start = time.perf_counter()
+    legacy_team_analysis(race)
+    old = time.perf_counter() - start
+    print(f"per-team scan:   {old * 1000:10.1f} ms")
+    print(f"speedup:         {old / new:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
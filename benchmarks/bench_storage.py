@@ -0,0 +1,77 @@
+"""Read/write throughput of the in-memory and SQLite repositories.
+
+Usage: python -m benchmarks.bench_storage [N]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, time as dtime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import EngineerSchedule  # noqa: E402
+from storage import InMemoryRepository, SQLiteRepository  # noqa: E402
+
+
+def make_schedules(n):
+    return [
+        EngineerSchedule(
+            scheduleID=i, engineerID=100 + i % 50, taskDescription=f"Task {i}",
+            date=date(2025, 3 + i % 9, 1 + i % 28), startTime=dtime(9), endTime=dtime(10),
+            location="Garage", raceID=i % 24,
+        )
+        for i in range(1, n + 1)
+    ]
+
+
+def timed(label, n, fn):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {n / elapsed:>12,.0f} ops/s  ({elapsed * 1000:.1f} ms)")
+
+
+def run(repo, schedules):
+    n = len(schedules)
+    keys = [random.randint(1, n) for _ in range(n)]
+
+    def single_writes():
+        for s in schedules:
+            repo[s.scheduleID] = s
+
+    def batched_writes():
+        repo.put_many((s.scheduleID, s) for s in schedules)
+
+    def point_reads():
+        for k in keys:
+            repo.get(k)
+
+    def indexed_lookups():
+        for engineer_id in range(100, 150):
+            repo.find("engineerID", engineer_id)
+
+    timed("write (one per commit)", n, single_writes)
+    repo.clear()
+    timed("write (batched commit)", n, batched_writes)
+    timed("point read", n, point_reads)
+    timed("find engineerID x50", 50, indexed_lookups)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    schedules = make_schedules(n)
+    fields = ("engineerID", "raceID", "date")
+
+    print(f"memory backend, {n} schedules")
+    run(InMemoryRepository("engineer_schedules", EngineerSchedule, fields), schedules)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"sqlite (WAL) backend, {n} schedules")
+        run(SQLiteRepository("engineer_schedules", EngineerSchedule, fields, path=os.path.join(tmp, "bench.sqlite3")),
+            schedules)
+
+
+if __name__ == "__main__":
+    main()
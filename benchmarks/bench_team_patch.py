@@ -0,0 +1,71 @@
+"""Updating one inventory item of a large team: full POST /teams/ vs. PATCH of the sub-resource.
+
+Usage: python -m benchmarks.bench_team_patch [ITEMS_PER_COLLECTION] [ITERATIONS]
+"""
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+import httpx  # noqa: E402
+
+import main  # noqa: E402
+from auth import get_password_hash  # noqa: E402
+from dependencies import users_db  # noqa: E402
+
+
+def big_team(n):
+    return {
+        "teamID": 1, "name": "Ferrari",
+        "drivers": [{"driverID": i, "name": f"Driver {i}", "driverAbb": "DRV", "nationality": "ITA",
+                     "physicalCondition": "Fit"} for i in range(n)],
+        "sponsors": [{"sponsorID": i, "sponsorName": f"Sponsor {i}", "contractValue": 1e6} for i in range(n)],
+        "engineers": [{"engineerID": i, "name": f"Engineer {i}", "role": "Mechanic"} for i in range(n)],
+        "members": [f"Member {i}" for i in range(n)],
+        "inventory": [{"itemID": i, "partName": f"Part {i}", "quantity": 10, "status": "Ready"} for i in range(n)],
+    }
+
+
+async def run(n, iterations):
+    users_db["bench"] = {"username": "bench", "full_name": "Bench", "email": None,
+                         "hashed_password": get_password_hash("bench"), "disabled": False}
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        token = (await client.post("/token", data={"username": "bench", "password": "bench"})).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        team = big_team(n)
+        await client.post("/teams/", json=team, headers=headers)
+
+        full_times, patch_times = [], []
+        full_body = patch_body = b""
+        for k in range(iterations):
+            team["inventory"][0]["quantity"] = k
+            full_body = json.dumps(team).encode()
+            start = time.perf_counter()
+            await client.post("/teams/", content=full_body, headers={**headers, "Content-Type": "application/json"})
+            full_times.append(time.perf_counter() - start)
+
+            patch_body = json.dumps({"quantity": k}).encode()
+            start = time.perf_counter()
+            await client.patch("/teams/1/inventory/0", content=patch_body,
+                               headers={**headers, "Content-Type": "application/json"})
+            patch_times.append(time.perf_counter() - start)
+
+    print(f"team with {n} drivers/sponsors/engineers/members/inventory items")
+    print(f"  POST /teams/ (whole team): {len(full_body):>10,} bytes  median {statistics.median(full_times) * 1000:8.2f} ms")
+    print(f"  PATCH /inventory/{{id}}:    {len(patch_body):>10,} bytes  median {statistics.median(patch_times) * 1000:8.2f} ms")
+
+
+def main_():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    asyncio.run(run(n, iterations))
+
+
+if __name__ == "__main__":
+    main_()
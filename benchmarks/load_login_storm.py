@@ -0,0 +1,92 @@
+"""Latency of an authenticated GET while a burst of logins is in progress.
+
+Runs main.app in-process over httpx's ASGI transport, once with the password
+check offloaded (current code) and once with it run inline on the event loop.
+
+Usage: python -m benchmarks.load_login_storm [LOGINS] [PROBES]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+import httpx  # noqa: E402
+
+import auth  # noqa: E402
+import main  # noqa: E402
+from dependencies import users_db  # noqa: E402
+
+USERNAME, PASSWORD = "storm", "storm-password"
+
+
+async def inline_verify(plain_password, hashed_password):
+    return auth.verify_password(plain_password, hashed_password)
+
+
+async def probe_latencies(client, headers, probes, stop):
+    latencies = []
+    while len(latencies) < probes and not stop.is_set():
+        start = time.perf_counter()
+        await client.get("/teams/1", headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0)
+    return latencies
+
+
+async def storm(logins, probes):
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        res = await client.post("/token", data={"username": USERNAME, "password": PASSWORD})
+        headers = {"Authorization": f"Bearer {res.json()['access_token']}"}
+        await client.post("/teams/", json={"teamID": 1, "name": "Ferrari"}, headers=headers)
+
+        stop = asyncio.Event()
+        probe = asyncio.create_task(probe_latencies(client, headers, probes, stop))
+        start = time.perf_counter()
+        statuses = await asyncio.gather(*[
+            client.post("/token", data={"username": USERNAME, "password": PASSWORD}) for _ in range(logins)
+        ])
+        storm_seconds = time.perf_counter() - start
+        stop.set()
+        latencies = await probe
+
+    codes = {}
+    for r in statuses:
+        codes[r.status_code] = codes.get(r.status_code, 0) + 1
+    return storm_seconds, latencies, codes
+
+
+def report(label, storm_seconds, latencies, codes):
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else float("nan")
+    print(f"{label}")
+    print(f"  login storm took {storm_seconds * 1000:.0f} ms, statuses {codes}")
+    print(f"  GET /teams/1 during storm: n={len(latencies)}  "
+          f"p50={statistics.median(latencies) if latencies else float('nan'):.1f} ms  "
+          f"p95={p95:.1f} ms  max={max(latencies) if latencies else float('nan'):.1f} ms")
+
+
+def main_():
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    probes = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    users_db[USERNAME] = {
+        "username": USERNAME, "full_name": "Storm", "email": None,
+        "hashed_password": auth.get_password_hash(PASSWORD), "disabled": False,
+    }
+
+    report("offloaded to the hash executor", *asyncio.run(storm(logins, probes)))
+
+    offloaded = main.verify_password_async
+    main.verify_password_async = inline_verify
+    try:
+        report("inline on the event loop", *asyncio.run(storm(logins, probes)))
+    finally:
+        main.verify_password_async = offloaded
+
+
+if __name__ == "__main__":
+    main_()
@@ -0,0 +1,8 @@
+"""Loads .env into the process environment, once.
+
+Import this before reading settings with os.getenv at import time; values
+already set in the real environment win over .env.
+"""
+from dotenv import load_dotenv
+
+load_dotenv()
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends
+from models import ApiLatency, DashboardSummary, DriverTelemetrySnapshot, User
+from dependencies import get_current_user, roster_index, teams_count
+from profiling import ProfiledRoute, profiling_gate
+from engineer_management import schedules_count
+from report_system import reports_count
+from metrics import metrics_registry
+from telemetry import telemetry_hub
+from fast_json import trusted_response
+
+router = APIRouter(
+    prefix="/dashboard",
+    tags=["Dashboard"],
+    route_class=ProfiledRoute,
+    dependencies=[Depends(profiling_gate)]
+)
+
+@router.get("/summary", response_model=DashboardSummary)
+def get_dashboard_summary(current_user: User = Depends(get_current_user)):
+    """Every figure comes from a counter or index kept up to date on write; nothing is scanned here."""
+    telemetry = []
+    for driver_id in telemetry_hub.drivers():
+        ring = telemetry_hub.get(driver_id)
+        last = ring.last() if ring is not None else None
+        if last is not None:
+            timestamp, speed, rpm, temperature = last
+            telemetry.append(DriverTelemetrySnapshot(
+                driverID=driver_id, timestamp=timestamp, speed=speed, rpm=rpm, temperature=temperature
+            ))
+
+    return trusted_response(DashboardSummary(
+        teams=teams_count.count,
+        drivers=roster_index.driver_count(),
+        engineers=roster_index.engineer_count(),
+        schedules=schedules_count.count,
+        reports=reports_count.count,
+        api=ApiLatency(
+            requests=metrics_registry.total, inFlight=metrics_registry.in_flight,
+            **metrics_registry.recent_latency()
+        ),
+        telemetry=telemetry,
+    ))
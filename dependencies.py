@@ -1,36 +1,133 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from typing import Dict
 import os
-from dotenv import load_dotenv
+import threading
+from typing import Callable, Dict
 
+import config  # noqa: F401  (loads .env)
 from auth import SECRET_KEY, ALGORITHM, get_password_hash
-from models import UserInDB, TokenData, Team, Driver, RaceStrategy, DriverPerformance
+from models import UserInDB, Team, Driver, RaceStrategy
+from lap_store import CompactDriverPerformance
+from inventory import InventoryIndex
+from roster import RosterIndex
+from storage import CountIndex, IndexedStore, Repository, VersionIndex, create_repository
+from cache import LRUCache, TTLCache
 
-load_dotenv()
+teams_version = VersionIndex()
+teams_count = CountIndex()
+inventory_index = InventoryIndex()
+race_strategies_version = VersionIndex()
 
-db_teams: Dict[int, Team] = {}
-db_drivers: Dict[int, Driver] = {}
-db_race_strategies: Dict[int, RaceStrategy] = {}
-db_driver_performance: Dict[int, DriverPerformance] = {}
+db_drivers: Repository = create_repository("drivers", Driver)
+roster_index = RosterIndex(db_drivers)
+
+db_teams = IndexedStore(
+    create_repository("teams", Team), indexes=[teams_version, teams_count, inventory_index, roster_index]
+)
+db_race_strategies = IndexedStore(create_repository("race_strategies", RaceStrategy), indexes=[race_strategies_version])
+db_driver_performance: Repository = create_repository("driver_performance", CompactDriverPerformance)
 
 admin_user = os.getenv("ADMIN_USERNAME")
 admin_pass = os.getenv("ADMIN_PASSWORD")
+# Pre-hashed (pbkdf2_sha256) admin password; preferred over ADMIN_PASSWORD, skips hashing on startup.
+admin_password_hash = os.getenv("ADMIN_PASSWORD_HASH")
 admin_email = os.getenv("ADMIN_EMAIL")
 admin_fullname = os.getenv("ADMIN_FULL_NAME", "System Admin") 
 
-users_db = {}
+class UserDirectory(dict):
+    """users_db dict that bumps `version` on every top-level write, so cached users can be invalidated.
+
+    Entries registered with defer() are built on first lookup instead of up front.
+    """
+
+    version = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._deferred: Dict[str, Callable[[], dict]] = {}
+        self._deferred_lock = threading.Lock()
+
+    def defer(self, key, factory: Callable[[], dict]) -> None:
+        self._deferred[key] = factory
+
+    def resolve_deferred(self) -> None:
+        for key in list(self._deferred):
+            self._resolve(key)
+
+    def _resolve(self, key) -> bool:
+        # The factory stays registered until its entry is stored, so a concurrent
+        # lookup sees the key as deferred and waits here instead of missing it.
+        with self._deferred_lock:
+            factory = self._deferred.get(key)
+            if factory is not None:
+                self[key] = factory()
+                del self._deferred[key]
+        return super().__contains__(key)
+
+    def __contains__(self, key):
+        return super().__contains__(key) or (key in self._deferred and self._resolve(key))
+
+    def __missing__(self, key):
+        if key in self._deferred and self._resolve(key):
+            return super().__getitem__(key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def _changed(self):
+        self.version += 1
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def clear(self):
+        super().clear()
+        self._deferred.clear()
+        self._changed()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._changed()
+        return value
 
-if admin_user and admin_pass:
-    users_db[admin_user] = {
+    def popitem(self):
+        item = super().popitem()
+        self._changed()
+        return item
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self._changed()
+        return value
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+
+users_db = UserDirectory()
+
+def _admin_record(hashed_password: str) -> dict:
+    return {
         "username": admin_user,
         "full_name": admin_fullname,
         "email": admin_email,
-        "hashed_password": get_password_hash(admin_pass),
+        "hashed_password": hashed_password,
         "disabled": False,
     }
 
+if admin_user and admin_password_hash:
+    users_db[admin_user] = _admin_record(admin_password_hash)
+elif admin_user and admin_pass:
+    # A full pbkdf2 run; done by main's lifespan (off the event loop) before serving, not at import.
+    users_db.defer(admin_user, lambda: _admin_record(get_password_hash(admin_pass)))
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 def get_user(db, username: str):
@@ -39,22 +136,48 @@ def get_user(db, username: str):
         return UserInDB(**user_dict)
     return None
 
+# raw token -> username, dropped at the token's exp at the latest
+token_cache = TTLCache(
+    maxsize=int(os.getenv("TOKEN_CACHE_SIZE", 4096)), ttl=float(os.getenv("TOKEN_CACHE_TTL", 300)),
+    name="auth_tokens",
+)
+# (username, users_db.version) -> UserInDB
+user_cache = LRUCache(maxsize=int(os.getenv("USER_CACHE_SIZE", 1024)), name="auth_users")
+
+def authenticate_token(token: str):
+    """Resolve a bearer token to its user, or None if the token or user is invalid."""
+    username = token_cache.get(token)
+    if username is None:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError:
+            return None
+        username = payload.get("sub")
+        if username is None:
+            return None
+        token_cache.set(token, username, expires_at=payload.get("exp"))
+
+    key = (username, users_db.version)
+    user = user_cache.get(key)
+    if user is None:
+        user = get_user(users_db, username=username)
+        if user is not None:
+            user_cache.set(key, user)
+    return user
+
+def auth_cache_stats():
+    return {"tokens": token_cache.stats(), "users": user_cache.stats()}
+
+def is_admin(user) -> bool:
+    return admin_user is not None and user.username == admin_user
+
 async def get_current_user(token: str = Depends(oauth2_scheme)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-        token_data = TokenData(username=username)
-    except JWTError:
-        raise credentials_exception
-        
-    user = get_user(users_db, username=token_data.username)
+    user = authenticate_token(token)
     if user is None:
         raise credentials_exception
-    return user
\ No newline at end of file
+    return user
@@ -1,20 +1,71 @@
-from fastapi import APIRouter, HTTPException, Depends, status
-from models import DriverPerformance, User
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+from typing import List, Union
+from models import DriverPerformance, DriverPerformanceCompact, LapAnalytics, User
 from dependencies import get_current_user, db_driver_performance
+from profiling import ProfiledRoute, profiling_gate
+from lap_store import CompactDriverPerformance
+from fast_json import plain_response, trusted_response
 
 router = APIRouter(
     prefix="/driver_performance",
-    tags=["Driver Performance"]
+    tags=["Driver Performance"],
+    route_class=ProfiledRoute,
+    dependencies=[Depends(profiling_gate)]
 )
 
+def _store(record: CompactDriverPerformance) -> None:
+    db_driver_performance[record.driver.driverID] = record
+
 @router.post("/", response_model=DriverPerformance)
 def create_driver_performance_record(record: DriverPerformance, current_user: User = Depends(get_current_user)):
-    db_driver_performance[record.driver.driverID] = record
+    try:
+        _store(CompactDriverPerformance.from_model(record))
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
     return record
 
-@router.get("/{driver_id}", response_model=DriverPerformance)
-def get_driver_performance(driver_id: int, current_user: User = Depends(get_current_user)):
+@router.post("/compact", response_model=DriverPerformanceCompact)
+def create_driver_performance_record_compact(
+    record: DriverPerformanceCompact, current_user: User = Depends(get_current_user)
+):
+    try:
+        _store(CompactDriverPerformance.from_ms(record.driver, record.lapTimesMs, record.liveTelemetry))
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return record
+
+def _analytics_for(driver_id: int, window: int, pit_laps: List[int]) -> dict:
+    # numpy is imported here, not at startup; main's lifespan warms it in the background.
+    from lap_analytics import analyze_laps, packed_to_ms
+
+    record = db_driver_performance.get(driver_id)
+    if not record:
+        raise HTTPException(status_code=404, detail=f"Driver performance data not found for driver {driver_id}")
+    return {"driverID": driver_id, **analyze_laps(packed_to_ms(record.lap_ms), window, pit_laps)}
+
+@router.get("/analytics/compare", response_model=List[LapAnalytics])
+def compare_driver_analytics(
+    driver_ids: List[int] = Query(...),
+    window: int = Query(5, ge=1),
+    pit_laps: List[int] = Query([]),
+    current_user: User = Depends(get_current_user),
+):
+    return plain_response([_analytics_for(driver_id, window, pit_laps) for driver_id in driver_ids])
+
+@router.get("/{driver_id}", response_model=Union[DriverPerformance, DriverPerformanceCompact])
+def get_driver_performance(driver_id: int, compact: bool = False, current_user: User = Depends(get_current_user)):
     record = db_driver_performance.get(driver_id)
     if not record:
         raise HTTPException(status_code=404, detail="Driver performance data not found")
-    return record
\ No newline at end of file
+    if compact:
+        return trusted_response(DriverPerformanceCompact.model_construct(**record.to_compact()))
+    return trusted_response(record.to_model())
+
+@router.get("/{driver_id}/analytics", response_model=LapAnalytics)
+def get_driver_analytics(
+    driver_id: int,
+    window: int = Query(5, ge=1),
+    pit_laps: List[int] = Query([]),
+    current_user: User = Depends(get_current_user),
+):
+    return plain_response(_analytics_for(driver_id, window, pit_laps))
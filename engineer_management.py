@@ -1,53 +1,232 @@
-from fastapi import APIRouter, HTTPException, Depends, status
-from typing import List, Dict
-from models import EngineerSchedule, User
-from dependencies import get_current_user
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+from datetime import date, time
+import heapq
+import os
+from itertools import groupby
+from models import BulkImportResult, EngineerSchedule, ScheduleChanges, ScheduleConflict, User
+from dependencies import get_current_user, roster_index
+from profiling import ProfiledRoute, profiling_gate
+from ndjson import import_ndjson
+from fast_json import trusted_response
+from storage import (
+    CountIndex, FieldIndex, IdAllocator, IndexedStore, IntervalIndex, SortedIndex, VersionIndex, collect_changes,
+    create_repository
+)
 
 router = APIRouter(
     prefix="/engineer_management",
-    tags=["Engineer Management"]
+    tags=["Engineer Management"],
+    route_class=ProfiledRoute,
+    dependencies=[Depends(profiling_gate)]
 )
 
-db_engineer_schedules: Dict[int, EngineerSchedule] = {}
-next_schedule_id = 1
+# Tolak jadwal untuk engineerID yang tidak terdaftar di tim mana pun.
+ENFORCE_ENGINEER_ROSTER = os.getenv("ENFORCE_ENGINEER_ROSTER", "false").lower() in ("1", "true", "yes")
 
-@router.post("/schedules/", response_model=EngineerSchedule, status_code=status.HTTP_201_CREATED)
-def create_engineer_schedule(schedule: EngineerSchedule, current_user: User = Depends(get_current_user)):
-    global next_schedule_id
-    
-    if schedule.scheduleID is None:
-        schedule.scheduleID = next_schedule_id
-        
-    if schedule.scheduleID in db_engineer_schedules:
-        raise HTTPException(status_code=400, detail=f"Schedule ID {schedule.scheduleID} sudah ada")
-        
+schedules_by_engineer = FieldIndex("engineerID")
+schedules_by_race = FieldIndex("raceID")
+schedules_by_location = FieldIndex("location")
+schedules_by_date = SortedIndex("date")
+schedules_by_id = SortedIndex("scheduleID")
+
+def _seconds(t: time) -> int:
+    return t.hour * 3600 + t.minute * 60 + t.second
+
+def _engineer_day(schedule: EngineerSchedule):
+    return (schedule.engineerID, schedule.date)
+
+def _time_span(schedule: EngineerSchedule):
+    return (_seconds(schedule.startTime), _seconds(schedule.endTime))
+
+schedule_intervals = IntervalIndex(_engineer_day, _time_span)
+schedules_version = VersionIndex()
+schedules_count = CountIndex()
+
+db_engineer_schedules = IndexedStore(
+    create_repository("engineer_schedules", EngineerSchedule, index_fields=("engineerID", "raceID", "date")),
+    indexes=[
+        schedules_by_id, schedules_by_engineer, schedules_by_race, schedules_by_location, schedules_by_date,
+        schedule_intervals, schedules_version, schedules_count,
+    ],
+)
+schedule_ids = IdAllocator(start=max(db_engineer_schedules, default=0) + 1)
+
+def _check_overlap(schedule: EngineerSchedule, exclude: Optional[int] = None):
+    start, end = _time_span(schedule)
+    clashes = schedule_intervals.overlapping(_engineer_day(schedule), start, end, exclude=exclude)
+    if clashes:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Jadwal bentrok dengan jadwal {clashes} milik engineer {schedule.engineerID} pada {schedule.date}.",
+        )
+
+def _validate_times(schedule: EngineerSchedule, allow_overlap: bool, exclude: Optional[int] = None):
     if schedule.startTime >= schedule.endTime:
          raise HTTPException(status_code=400, detail="Waktu mulai harus sebelum waktu selesai.")
 
-    db_engineer_schedules[schedule.scheduleID] = schedule
-    next_schedule_id += 1
+    if ENFORCE_ENGINEER_ROSTER and not roster_index.has_engineer(schedule.engineerID):
+        raise HTTPException(
+            status_code=404, detail=f"Engineer {schedule.engineerID} tidak terdaftar di tim mana pun."
+        )
+
+    if not allow_overlap:
+        _check_overlap(schedule, exclude=exclude)
+
+def _insert_schedule(schedule: EngineerSchedule, allow_overlap: bool) -> EngineerSchedule:
+    if schedule.scheduleID is None:
+        schedule.scheduleID = schedule_ids.next()
+
+    # Duplicate and overlap checks must see the same state the insert writes to.
+    with db_engineer_schedules.lock:
+        if schedule.scheduleID in db_engineer_schedules:
+            raise HTTPException(status_code=400, detail=f"Schedule ID {schedule.scheduleID} sudah ada")
+
+        _validate_times(schedule, allow_overlap)
+
+        db_engineer_schedules[schedule.scheduleID] = schedule
+    schedule_ids.observe(schedule.scheduleID)
     return schedule
 
+@router.post("/schedules/", response_model=EngineerSchedule, status_code=status.HTTP_201_CREATED)
+def create_engineer_schedule(
+    schedule: EngineerSchedule, allow_overlap: bool = False, current_user: User = Depends(get_current_user)
+):
+    return _insert_schedule(schedule, allow_overlap)
+
+@router.post("/schedules/bulk", response_model=BulkImportResult)
+async def bulk_import_schedules(
+    request: Request, allow_overlap: bool = False, current_user: User = Depends(get_current_user)
+):
+    def insert_batch(rows):
+        new_ids = iter(schedule_ids.allocate(sum(1 for _, s in rows if s.scheduleID is None)))
+        rejected = []
+        with db_engineer_schedules.batch():
+            for line_no, schedule in rows:
+                if schedule.scheduleID is None:
+                    schedule.scheduleID = next(new_ids)
+                try:
+                    _insert_schedule(schedule, allow_overlap)
+                except HTTPException as exc:
+                    rejected.append((line_no, exc.detail))
+        return rejected
+
+    return await import_ndjson(request.stream(), EngineerSchedule, insert_batch)
+
+def _schedules_for(schedule_ids) -> List[EngineerSchedule]:
+    return [db_engineer_schedules[schedule_id] for schedule_id in sorted(schedule_ids)]
+
+def _matching_ids(race_id, location, date_from, date_to) -> Optional[set]:
+    """Schedule IDs matching every given filter, or None when no filter is given."""
+    candidates = []
+    if race_id is not None:
+        candidates.append(schedules_by_race.lookup(race_id))
+    if location is not None:
+        candidates.append(schedules_by_location.lookup(location))
+    if date_from is not None or date_to is not None:
+        candidates.append(schedules_by_date.range(date_from, date_to))
+
+    if not candidates:
+        return None
+
+    candidates.sort(key=len)
+    matches = set(candidates[0])
+    for other in candidates[1:]:
+        matches.intersection_update(other)
+    return matches
+
+def _page_ids(matches: Optional[set], after: Optional[int], limit: Optional[int]) -> List[int]:
+    """IDs in scheduleID order, strictly after the cursor, at most `limit` of them."""
+    if matches is None:
+        return schedules_by_id.page(after, limit)
+    ids = sorted(i for i in matches if after is None or i > after)
+    return ids if limit is None else ids[:limit]
+
 @router.get("/schedules/", response_model=List[EngineerSchedule])
-def get_all_schedules(current_user: User = Depends(get_current_user)):
-    return list(db_engineer_schedules.values())
+def get_all_schedules(
+    response: Response,
+    race_id: Optional[int] = None,
+    location: Optional[str] = None,
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    limit: Optional[int] = Query(None, ge=1),
+    after: Optional[int] = None,
+    current_user: User = Depends(get_current_user),
+):
+    matches = _matching_ids(race_id, location, date_from, date_to)
+    if matches is None and limit is None and after is None:
+        return trusted_response(db_engineer_schedules.values())
+
+    ids = _page_ids(matches, after, None if limit is None else limit + 1)
+    headers = None
+    if limit is not None and len(ids) > limit:
+        ids = ids[:limit]
+        headers = {"X-Next-Cursor": str(ids[-1])}
+        response.headers.update(headers)
+    return trusted_response([db_engineer_schedules[schedule_id] for schedule_id in ids], headers=headers)
+
+@router.get("/schedules/stream")
+def stream_schedules(
+    race_id: Optional[int] = None,
+    location: Optional[str] = None,
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    after: Optional[int] = None,
+    current_user: User = Depends(get_current_user),
+):
+    ids = _page_ids(_matching_ids(race_id, location, date_from, date_to), after, None)
+
+    def lines():
+        for schedule_id in ids:
+            schedule = db_engineer_schedules.get(schedule_id)
+            if schedule is not None:
+                yield schedule.model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@router.get("/schedules/changes", response_model=ScheduleChanges)
+def get_schedule_changes(
+    since: int = Query(0, ge=0), epoch: Optional[str] = None, current_user: User = Depends(get_current_user)
+):
+    return trusted_response(collect_changes(db_engineer_schedules, schedules_version, since, epoch))
+
+@router.get("/schedules/conflicts", response_model=List[ScheduleConflict])
+def get_schedule_conflicts(race_id: int, current_user: User = Depends(get_current_user)):
+    schedules = sorted(
+        (db_engineer_schedules[schedule_id] for schedule_id in schedules_by_race.lookup(race_id)),
+        key=lambda s: (s.engineerID, s.date, s.startTime, s.scheduleID),
+    )
+
+    conflicts = []
+    for (engineer_id, day), group in groupby(schedules, key=_engineer_day):
+        active = []
+        for schedule in group:
+            start, end = _time_span(schedule)
+            while active and active[0][0] <= start:
+                heapq.heappop(active)
+            for _, other_id in sorted(active, key=lambda a: a[1]):
+                conflicts.append(ScheduleConflict(
+                    engineerID=engineer_id, date=day, scheduleIDs=[other_id, schedule.scheduleID]
+                ))
+            heapq.heappush(active, (end, schedule.scheduleID))
+    return trusted_response(conflicts)
 
 @router.get("/schedules/engineer/{engineer_id}", response_model=List[EngineerSchedule])
 def get_schedules_by_engineer(engineer_id: int, current_user: User = Depends(get_current_user)):
-    schedules = [
-        schedule for schedule in db_engineer_schedules.values() 
-        if schedule.engineerID == engineer_id
-    ]
-    return schedules
+    return trusted_response(_schedules_for(schedules_by_engineer.lookup(engineer_id)))
 
 @router.put("/schedules/{schedule_id}", response_model=EngineerSchedule)
-def update_engineer_schedule(schedule_id: int, updated_schedule: EngineerSchedule, current_user: User = Depends(get_current_user)):
-    if schedule_id not in db_engineer_schedules:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Jadwal tidak ditemukan")
+def update_engineer_schedule(
+    schedule_id: int, updated_schedule: EngineerSchedule, allow_overlap: bool = False,
+    current_user: User = Depends(get_current_user)
+):
+    with db_engineer_schedules.lock:
+        if schedule_id not in db_engineer_schedules:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Jadwal tidak ditemukan")
 
-    if updated_schedule.startTime >= updated_schedule.endTime:
-         raise HTTPException(status_code=400, detail="Waktu mulai harus sebelum waktu selesai.")
+        _validate_times(updated_schedule, allow_overlap, exclude=schedule_id)
 
-    updated_schedule.scheduleID = schedule_id
-    db_engineer_schedules[schedule_id] = updated_schedule
+        updated_schedule.scheduleID = schedule_id
+        db_engineer_schedules[schedule_id] = updated_schedule
     return updated_schedule
\ No newline at end of file
@@ -0,0 +1,56 @@
+import os
+from functools import lru_cache
+from typing import Any, List, Mapping, Optional
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+# Opt-in: GET endpoints serialize stored data directly instead of going through response_model.
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", "false").lower() in ("1", "true", "yes")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when it is installed, else pydantic-core."""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return to_json(content)
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def _dump_models(content: Any) -> bytes:
+    """Use the models' own schema serializers; the generic to_json is slower on model lists."""
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content)
+    if isinstance(content, list) and content and isinstance(content[0], BaseModel):
+        return _list_adapter(type(content[0])).dump_json(content)
+    return to_json(content)
+
+
+def trusted_response(content: Any, status_code: int = 200, headers: Optional[Mapping[str, str]] = None):
+    """Serialize models that were validated when stored, skipping response_model revalidation.
+
+    Only for endpoints whose stored type is exactly their response_model. When
+    FAST_JSON_RESPONSES is off `content` is returned unchanged for FastAPI to handle.
+    """
+    if not FAST_JSON_RESPONSES:
+        return content
+    return Response(_dump_models(content), status_code=status_code, headers=headers, media_type="application/json")
+
+
+def plain_response(content: Any, status_code: int = 200):
+    """Like trusted_response, for handler-built dicts and lists of plain JSON values."""
+    if not FAST_JSON_RESPONSES:
+        return content
+    return FastJSONResponse(content, status_code=status_code)
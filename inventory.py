@@ -0,0 +1,81 @@
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+from storage import StoreIndex
+
+PartKey = Tuple[str, str]
+
+
+class InventoryIndex(StoreIndex):
+    """Inventory aggregated across teams, keyed by (partName, status).
+
+    Attached to db_teams, so every team write subtracts the old team's items
+    and adds the new ones. Totals are also kept in a sorted list of
+    (quantity, partName, status) so low-stock queries are a bisect.
+    """
+
+    def __init__(self):
+        self._by_team: Dict[PartKey, Dict[int, Tuple[int, int]]] = {}
+        self._totals: Dict[PartKey, int] = {}
+        self._by_quantity: List[Tuple[int, str, str]] = []
+        self._statuses: Dict[str, set] = {}
+
+    def _adjust(self, part: PartKey, team_id: int, quantity: int, items: int) -> None:
+        teams = self._by_team.setdefault(part, {})
+        held = teams.get(team_id, (0, 0))
+        held = (held[0] + quantity, held[1] + items)
+        if held[1]:
+            teams[team_id] = held
+        else:
+            del teams[team_id]
+
+        old = self._totals.get(part)
+        if old is not None:
+            del self._by_quantity[bisect_left(self._by_quantity, (old, *part))]
+        if teams:
+            total = (old or 0) + quantity
+            self._totals[part] = total
+            insort(self._by_quantity, (total, *part))
+            self._statuses.setdefault(part[0], set()).add(part[1])
+        else:
+            del self._by_team[part]
+            self._totals.pop(part, None)
+            statuses = self._statuses.get(part[0], set())
+            statuses.discard(part[1])
+            if not statuses:
+                self._statuses.pop(part[0], None)
+
+    def add(self, key, value):
+        for item in value.inventory or []:
+            self._adjust((item.partName, item.status), key, item.quantity, 1)
+
+    def remove(self, key, value):
+        for item in value.inventory or []:
+            self._adjust((item.partName, item.status), key, -item.quantity, -1)
+
+    def clear(self):
+        self._by_team.clear()
+        self._totals.clear()
+        self._by_quantity.clear()
+        self._statuses.clear()
+
+    def parts(self) -> List[PartKey]:
+        return sorted(self._totals)
+
+    def total(self, part_name: str, status: Optional[str] = None) -> int:
+        statuses = self._statuses.get(part_name, ()) if status is None else (status,)
+        return sum(self._totals.get((part_name, s), 0) for s in statuses)
+
+    def statuses(self, part_name: str) -> List[str]:
+        return sorted(self._statuses.get(part_name, ()))
+
+    def breakdown(self, part_name: str, status: str) -> Dict[int, int]:
+        """teamID -> quantity for one (partName, status)."""
+        return {team_id: held[0] for team_id, held in self._by_team.get((part_name, status), {}).items()}
+
+    def team_count(self, part_name: str, status: str) -> int:
+        return len(self._by_team.get((part_name, status), ()))
+
+    def below(self, threshold: int) -> List[Tuple[int, str, str]]:
+        """(quantity, partName, status) for every aggregate with quantity <= threshold."""
+        return self._by_quantity[:bisect_left(self._by_quantity, (threshold + 1,))]
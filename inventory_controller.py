@@ -0,0 +1,70 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import List, Optional
+from models import InventoryBreakdown, InventoryTeamShare, InventoryTotal, User
+from dependencies import get_current_user, db_teams, inventory_index
+from profiling import ProfiledRoute, profiling_gate
+from fast_json import trusted_response
+
+router = APIRouter(
+    prefix="/inventory",
+    tags=["Inventory"],
+    route_class=ProfiledRoute,
+    dependencies=[Depends(profiling_gate)]
+)
+
+def _total(part_name: str, status: str, quantity: Optional[int] = None) -> InventoryTotal:
+    return InventoryTotal(
+        partName=part_name,
+        status=status,
+        quantity=inventory_index.total(part_name, status) if quantity is None else quantity,
+        teams=inventory_index.team_count(part_name, status),
+    )
+
+@router.get("/", response_model=List[InventoryTotal])
+def list_inventory_totals(
+    status: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    with db_teams.lock:
+        return trusted_response(
+            [_total(part, s) for part, s in inventory_index.parts() if status is None or s == status]
+        )
+
+@router.get("/low-stock", response_model=List[InventoryTotal])
+def list_low_stock(
+    threshold: int = Query(5, ge=0),
+    status: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    with db_teams.lock:
+        return trusted_response([
+            _total(part, s, quantity)
+            for quantity, part, s in inventory_index.below(threshold)
+            if status is None or s == status
+        ])
+
+@router.get("/parts/{part_name}", response_model=InventoryBreakdown)
+def get_part_breakdown(
+    part_name: str,
+    status: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    with db_teams.lock:
+        statuses = inventory_index.statuses(part_name)
+        if status is not None:
+            statuses = [s for s in statuses if s == status]
+        if not statuses:
+            raise HTTPException(status_code=404, detail="Part not found in any team inventory")
+
+        shares = []
+        for s in statuses:
+            for team_id, quantity in inventory_index.breakdown(part_name, s).items():
+                team = db_teams.get(team_id)
+                shares.append(InventoryTeamShare(
+                    teamID=team_id, teamName=team.name if team else None, status=s, quantity=quantity
+                ))
+        shares.sort(key=lambda share: (share.teamID, share.status))
+        by_status = {s: inventory_index.total(part_name, s) for s in statuses}
+        return trusted_response(InventoryBreakdown(
+            partName=part_name, quantity=sum(by_status.values()), byStatus=by_status, teams=shares
+        ))
@@ -0,0 +1,76 @@
+from array import array
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+
+def packed_to_ms(lap_ms: array) -> np.ndarray:
+    """Zero-copy uint32 view of a packed array('I') of lap milliseconds.
+
+    The view pins the array's buffer, so the array must not be resized while it
+    is alive (records are replaced on update, never grown in place).
+    analyze_laps only does float math on it, so unsigned values are safe.
+    """
+    return np.frombuffer(lap_ms, dtype=np.uint32)
+
+
+def rolling_mean(ms: np.ndarray, window: int) -> np.ndarray:
+    if window < 1 or len(ms) < window:
+        return np.empty(0)
+    sums = np.cumsum(ms, dtype=np.float64)
+    sums[window:] = sums[window:] - sums[:-window]
+    return sums[window - 1:] / window
+
+
+def slope(ms: np.ndarray) -> float:
+    """Least-squares ms-per-lap trend."""
+    n = len(ms)
+    if n < 2:
+        return 0.0
+    x = np.arange(n, dtype=np.float64)
+    x -= x.mean()
+    return float(np.dot(x, ms - ms.mean()) / np.dot(x, x))
+
+
+def stint_bounds(n_laps: int, pit_laps: Iterable[int]) -> List[Tuple[int, int]]:
+    """Split laps 1..n into stints ending on each pit lap, as [start, end) indices."""
+    cuts = sorted({p for p in pit_laps if 0 < p < n_laps})
+    edges = [0, *cuts, n_laps]
+    return [(edges[i], edges[i + 1]) for i in range(len(edges) - 1) if edges[i] < edges[i + 1]]
+
+
+def analyze_laps(ms: np.ndarray, window: int = 5, pit_laps: Iterable[int] = ()) -> Dict:
+    n = len(ms)
+    if n == 0:
+        return {
+            "laps": 0, "bestLapMs": None, "bestLapNumber": None, "meanLapMs": None, "medianLapMs": None,
+            "stdDevMs": None, "rollingWindow": window, "rollingPaceMs": [], "degradationMsPerLap": 0.0,
+            "stints": [],
+        }
+
+    best_index = int(np.argmin(ms))
+    stints = []
+    for number, (start, end) in enumerate(stint_bounds(n, pit_laps), start=1):
+        stint = ms[start:end]
+        stints.append({
+            "stint": number,
+            "startLap": start + 1,
+            "endLap": end,
+            "laps": end - start,
+            "bestLapMs": int(stint.min()),
+            "meanLapMs": float(stint.mean()),
+            "degradationMsPerLap": slope(stint),
+        })
+
+    return {
+        "laps": n,
+        "bestLapMs": int(ms[best_index]),
+        "bestLapNumber": best_index + 1,
+        "meanLapMs": float(ms.mean()),
+        "medianLapMs": float(np.median(ms)),
+        "stdDevMs": float(ms.std()),
+        "rollingWindow": window,
+        "rollingPaceMs": rolling_mean(ms, window).tolist(),
+        "degradationMsPerLap": slope(ms),
+        "stints": stints,
+    }
@@ -0,0 +1,67 @@
+import json
+from array import array
+from typing import Iterable
+
+from models import Driver, DriverPerformance, LapTime, TelemetryData
+
+
+def lap_to_ms(lap: LapTime) -> int:
+    return lap.minutes * 60000 + lap.seconds * 1000 + lap.milliseconds
+
+
+def _packed(lap_ms: Iterable[int]) -> array:
+    try:
+        return array("I", lap_ms)
+    except OverflowError:
+        raise ValueError("Lap times must be non-negative and fit in 32 bits of milliseconds")
+
+
+class CompactDriverPerformance:
+    """Stored form of DriverPerformance with laps packed as uint32 milliseconds.
+
+    LapTime objects are only built by to_model(), when a response needs them.
+    Implements model_dump_json/model_validate_json so the SQLite repository can store it.
+    """
+
+    __slots__ = ("driver", "lap_ms", "liveTelemetry")
+
+    def __init__(self, driver: Driver, lap_ms: array, liveTelemetry: TelemetryData):
+        self.driver = driver
+        self.lap_ms = lap_ms
+        self.liveTelemetry = liveTelemetry
+
+    @classmethod
+    def from_model(cls, record: DriverPerformance) -> "CompactDriverPerformance":
+        return cls(record.driver, _packed(lap_to_ms(lap) for lap in record.lapTimes), record.liveTelemetry)
+
+    @classmethod
+    def from_ms(cls, driver: Driver, lap_ms: Iterable[int], liveTelemetry: TelemetryData) -> "CompactDriverPerformance":
+        return cls(driver, _packed(lap_ms), liveTelemetry)
+
+    def lap_times(self):
+        return [
+            LapTime.model_construct(minutes=ms // 60000, seconds=ms // 1000 % 60, milliseconds=ms % 1000)
+            for ms in self.lap_ms
+        ]
+
+    def to_model(self) -> DriverPerformance:
+        return DriverPerformance.model_construct(
+            driver=self.driver, lapTimes=self.lap_times(), liveTelemetry=self.liveTelemetry
+        )
+
+    def to_compact(self) -> dict:
+        return {"driver": self.driver, "lapTimesMs": self.lap_ms.tolist(), "liveTelemetry": self.liveTelemetry}
+
+    def model_dump_json(self) -> str:
+        return json.dumps({
+            "driver": self.driver.model_dump(mode="json"),
+            "lapTimesMs": self.lap_ms.tolist(),
+            "liveTelemetry": self.liveTelemetry.model_dump(mode="json"),
+        })
+
+    @classmethod
+    def model_validate_json(cls, data) -> "CompactDriverPerformance":
+        raw = json.loads(data)
+        return cls.from_ms(
+            Driver.model_validate(raw["driver"]), raw["lapTimesMs"], TelemetryData.model_validate(raw["liveTelemetry"])
+        )
@@ -1,33 +1,73 @@
 from fastapi import FastAPI, HTTPException, Depends, status
 from fastapi.security import OAuth2PasswordRequestForm
+from contextlib import asynccontextmanager
 from datetime import timedelta
+import asyncio
 
-from models import Token, User
+from models import AuthCacheStats, Token, User
 from auth import (
-    verify_password, create_access_token, 
+    verify_password_async, create_access_token, shutdown_hash_executor,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
 
-from dependencies import get_user, users_db
+from dependencies import auth_cache_stats, get_current_user, get_user, users_db
 
 from teams_controller import router as teams_router
 from driver_performance_controller import router as driver_perf_router
 from race_strategy_controller import router as race_strat_router
 from engineer_management import router as engineer_router
-from report_system import router as report_router
+from report_system import router as report_router, shutdown_report_pool
+from telemetry_controller import router as telemetry_router
+from inventory_controller import router as inventory_router
+from roster_controller import router as roster_router
+from dashboard_controller import router as dashboard_router
+from metrics import MetricsMiddleware, router as metrics_router
+from profiling import router as profiling_router
 
-app = FastAPI()
+def warm_up():
+    """Work kept out of import time: numpy for lap analytics."""
+    import lap_analytics  # noqa: F401
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    loop = asyncio.get_running_loop()
+    # The deferred admin hash is awaited before serving, so pbkdf2 never runs on the
+    # event loop inside login or get_current_user.
+    await loop.run_in_executor(None, users_db.resolve_deferred)
+    # The rest runs in the background so startup is not held up; the pools are created on first use.
+    warming = loop.run_in_executor(None, warm_up)
+    yield
+    await warming
+    shutdown_report_pool()
+    shutdown_hash_executor()
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(teams_router)
 app.include_router(driver_perf_router)
 app.include_router(race_strat_router)
 app.include_router(engineer_router)
 app.include_router(report_router)
+app.include_router(telemetry_router)
+app.include_router(inventory_router)
+app.include_router(roster_router)
+app.include_router(dashboard_router)
+app.include_router(metrics_router)
+app.include_router(profiling_router)
 
 @app.post("/token", response_model=Token, tags=["Authentication"])
 async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
     user = get_user(users_db, form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    try:
+        valid = bool(user) and await verify_password_async(form_data.password, user.hashed_password)
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Login service busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -37,4 +77,8 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
     access_token = create_access_token(
         data={"sub": user.username}, expires_delta=access_token_expires
     )
-    return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
+    return {"access_token": access_token, "token_type": "bearer"}
+
+@app.get("/auth/cache/stats", response_model=AuthCacheStats, tags=["Authentication"])
+def get_auth_cache_stats(current_user: User = Depends(get_current_user)):
+    return auth_cache_stats()
@@ -0,0 +1,195 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Dict, List, Tuple
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from cache import registered_caches
+from storage import registered_repositories
+
+# Latencies kept for the recent-percentile summary shown on the dashboard.
+RECENT_SAMPLES = 1024
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+RouteKey = Tuple[str, str]
+
+
+class RouteStats:
+    __slots__ = ("buckets", "count", "seconds", "request_bytes", "response_bytes", "statuses")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.seconds = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.statuses: Dict[int, int] = {}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """Per-route request counters and latency histograms, rendered in Prometheus text format."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.total = 0
+        self._routes: Dict[RouteKey, RouteStats] = {}
+        self._recent: deque = deque(maxlen=RECENT_SAMPLES)
+        self._lock = threading.Lock()
+
+    def observe(self, method: str, route: str, status: int, seconds: float,
+                request_bytes: int, response_bytes: int) -> None:
+        bucket = bisect_left(LATENCY_BUCKETS, seconds)
+        with self._lock:
+            stats = self._routes.get((method, route))
+            if stats is None:
+                stats = self._routes[(method, route)] = RouteStats()
+            stats.buckets[bucket] += 1
+            stats.count += 1
+            stats.seconds += seconds
+            stats.request_bytes += request_bytes
+            stats.response_bytes += response_bytes
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            self.total += 1
+            self._recent.append(seconds)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._routes.clear()
+            self._recent.clear()
+            self.total = 0
+
+    def recent_latency(self) -> Dict[str, float]:
+        """p50/p95 in milliseconds over the last RECENT_SAMPLES requests."""
+        with self._lock:
+            samples = sorted(self._recent)
+        if not samples:
+            return {"p50Ms": 0.0, "p95Ms": 0.0}
+        return {
+            "p50Ms": samples[len(samples) // 2] * 1000,
+            "p95Ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000,
+        }
+
+    def render(self) -> str:
+        with self._lock:
+            routes = sorted((key, self._snapshot(stats)) for key, stats in self._routes.items())
+
+        lines: List[str] = [
+            "# HELP http_requests_in_flight Requests currently being handled.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+            "# HELP http_request_duration_seconds Request latency by route template.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), stats in routes:
+            labels = f'method="{method}",route="{_escape(route)}"'
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                cumulative += count
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {stats.count}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {stats.seconds}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {stats.count}")
+
+        lines += ["# HELP http_requests_total Responses by route template and status code.",
+                  "# TYPE http_requests_total counter"]
+        for (method, route), stats in routes:
+            for status, count in sorted(stats.statuses.items()):
+                lines.append(f'http_requests_total{{method="{method}",route="{_escape(route)}",'
+                             f'status="{status}"}} {count}')
+
+        for name, attr, help_text in (
+            ("http_request_size_bytes_total", "request_bytes", "Request body bytes received."),
+            ("http_response_size_bytes_total", "response_bytes", "Response body bytes sent."),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for (method, route), stats in routes:
+                lines.append(f'{name}{{method="{method}",route="{_escape(route)}"}} {getattr(stats, attr)}')
+
+        lines += ["# HELP store_items Records held by each store.", "# TYPE store_items gauge"]
+        for name, repository in sorted(registered_repositories().items()):
+            lines.append(f'store_items{{store="{_escape(name)}"}} {len(repository)}')
+
+        caches = sorted(registered_caches().items())
+        for metric, key, kind, help_text in (
+            ("cache_hits_total", "hits", "counter", "Cache lookups that found an entry."),
+            ("cache_misses_total", "misses", "counter", "Cache lookups that found nothing."),
+            ("cache_hit_ratio", "hitRate", "gauge", "Hits divided by lookups since start."),
+            ("cache_entries", "size", "gauge", "Entries currently cached."),
+        ):
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+            for name, cache in caches:
+                lines.append(f'{metric}{{cache="{_escape(name)}"}} {cache.stats()[key]}')
+
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _snapshot(stats: RouteStats) -> RouteStats:
+        copy = RouteStats()
+        copy.buckets = list(stats.buckets)
+        copy.count = stats.count
+        copy.seconds = stats.seconds
+        copy.request_bytes = stats.request_bytes
+        copy.response_bytes = stats.response_bytes
+        copy.statuses = dict(stats.statuses)
+        return copy
+
+
+metrics_registry = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware feeding a MetricsRegistry.
+
+    Requests are labelled with the matched route template (scope["route"],
+    set by the router), never the raw path, so label cardinality stays bounded.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry = metrics_registry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # status, request bytes, response bytes; 500 if the app raises before responding
+        state = [500, 0, 0]
+
+        async def counting_receive():
+            message = await receive()
+            if message["type"] == "http.request":
+                state[1] += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message):
+            if message["type"] == "http.response.start":
+                state[0] = message["status"]
+            elif message["type"] == "http.response.body":
+                state[2] += len(message.get("body", b""))
+            await send(message)
+
+        registry = self.registry
+        registry.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, counting_receive, counting_send)
+        finally:
+            elapsed = time.perf_counter() - start
+            registry.in_flight -= 1
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            registry.observe(scope["method"], route, state[0], elapsed, state[1], state[2])
+
+
+router = APIRouter(tags=["Metrics"])
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
@@ -1,12 +1,13 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import date, time, datetime
 
 # value objects
 class LapTime(BaseModel):
-    minutes: int
-    seconds: int
-    milliseconds: int
+    # Normalized components, so a lap round-trips unchanged through its packed milliseconds.
+    minutes: int = Field(ge=0)
+    seconds: int = Field(ge=0, le=59)
+    milliseconds: int = Field(ge=0, le=999)
 
 class TyreSet(BaseModel):
     tyreType: str
@@ -18,6 +19,18 @@ class TelemetryData(BaseModel):
     rpm: int
     temperature: float
 
+class TelemetrySeries(BaseModel):
+    driverID: int
+    timestamp: List[float]
+    speed: List[float]
+    rpm: List[int]
+    temperature: List[float]
+
+class TelemetryIngestResult(BaseModel):
+    accepted: int
+    rejected: int
+    errors: List[str] = []
+
 class StrategyPlan(BaseModel):
     pitStopSchedule: List[int]
     tyreStrategy: List[str]
@@ -47,6 +60,29 @@ class Driver(BaseModel):
     nationality: str
     physicalCondition: str
 
+# partial updates for Team sub-collections
+class InventoryItemUpdate(BaseModel):
+    partName: Optional[str] = None
+    quantity: Optional[int] = None
+    status: Optional[str] = None
+
+class SponsorUpdate(BaseModel):
+    sponsorName: Optional[str] = None
+    contractValue: Optional[float] = None
+
+class EngineerUpdate(BaseModel):
+    name: Optional[str] = None
+    role: Optional[str] = None
+
+class DriverUpdate(BaseModel):
+    name: Optional[str] = None
+    driverAbb: Optional[str] = None
+    nationality: Optional[str] = None
+    physicalCondition: Optional[str] = None
+
+class TeamMember(BaseModel):
+    name: str
+
 class Race(BaseModel):
     raceID: int
     circuitName: str
@@ -74,6 +110,33 @@ class DriverPerformance(BaseModel):
     lapTimes: List[LapTime]
     liveTelemetry: TelemetryData
 
+class DriverPerformanceCompact(BaseModel):
+    driver: Driver
+    lapTimesMs: List[int]
+    liveTelemetry: TelemetryData
+
+class StintSummary(BaseModel):
+    stint: int
+    startLap: int
+    endLap: int
+    laps: int
+    bestLapMs: int
+    meanLapMs: float
+    degradationMsPerLap: float
+
+class LapAnalytics(BaseModel):
+    driverID: int
+    laps: int
+    bestLapMs: Optional[int] = None
+    bestLapNumber: Optional[int] = None
+    meanLapMs: Optional[float] = None
+    medianLapMs: Optional[float] = None
+    stdDevMs: Optional[float] = None
+    rollingWindow: int
+    rollingPaceMs: List[float]
+    degradationMsPerLap: float
+    stints: List[StintSummary]
+
 # auth stuff
 class User(BaseModel):
     username: str
@@ -102,6 +165,18 @@ class EngineerSchedule(BaseModel):
     location: str
     raceID: Optional[int] = None
 
+class ScheduleConflict(BaseModel):
+    engineerID: int
+    date: date
+    scheduleIDs: List[int]
+
+class ScheduleChanges(BaseModel):
+    epoch: str
+    sequence: int
+    reset: bool
+    changed: List[EngineerSchedule]
+    deleted: List[int]
+
 # race report
 class RaceReport(BaseModel):
     reportID: int
@@ -111,3 +186,100 @@ class RaceReport(BaseModel):
     keyIncidents: List[str]
     generatedDate: datetime
 
+class ReportChanges(BaseModel):
+    epoch: str
+    sequence: int
+    reset: bool
+    changed: List[RaceReport]
+    deleted: List[int]
+
+class ReportBatchRequest(BaseModel):
+    raceIDs: List[int]
+
+class ReportJobResult(BaseModel):
+    raceID: int
+    status: str
+    reportID: Optional[int] = None
+    error: Optional[str] = None
+
+class ReportJob(BaseModel):
+    jobID: int
+    status: str
+    total: int
+    completed: int
+    results: List[ReportJobResult]
+
+class BulkImportError(BaseModel):
+    line: int
+    error: str
+
+class BulkImportResult(BaseModel):
+    received: int
+    inserted: int
+    failed: int
+    errors: List[BulkImportError]
+
+class CacheStats(BaseModel):
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    hitRate: float
+
+class AuthCacheStats(BaseModel):
+    tokens: CacheStats
+    users: CacheStats
+
+
+class InventoryTotal(BaseModel):
+    partName: str
+    status: str
+    quantity: int
+    teams: int
+
+class InventoryTeamShare(BaseModel):
+    teamID: int
+    teamName: Optional[str] = None
+    status: str
+    quantity: int
+
+class InventoryBreakdown(BaseModel):
+    partName: str
+    quantity: int
+    byStatus: Dict[str, int]
+    teams: List[InventoryTeamShare]
+
+class DriverAssignment(BaseModel):
+    driver: Driver
+    teamID: int
+    teamName: str
+
+class ProfileInfo(BaseModel):
+    profileID: str
+    method: str
+    route: str
+    durationMs: float
+    createdAt: float
+
+# dashboard
+class ApiLatency(BaseModel):
+    requests: int
+    inFlight: int
+    p50Ms: float
+    p95Ms: float
+
+class DriverTelemetrySnapshot(BaseModel):
+    driverID: int
+    timestamp: float
+    speed: float
+    rpm: int
+    temperature: float
+
+class DashboardSummary(BaseModel):
+    teams: int
+    drivers: int
+    engineers: int
+    schedules: int
+    reports: int
+    api: ApiLatency
+    telemetry: List[DriverTelemetrySnapshot]
@@ -0,0 +1,74 @@
+import os
+from typing import AsyncIterable, AsyncIterator, Callable, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+from starlette.concurrency import run_in_threadpool
+
+BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", 1000))
+MAX_REPORTED_ERRORS = 1000
+
+
+async def iter_ndjson_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[Tuple[int, bytes]]:
+    """Yield (line number, line) for each non-blank line of a streamed NDJSON body."""
+    buffer = b""
+    line_no = 0
+    async for chunk in chunks:
+        buffer += chunk
+        lines = buffer.split(b"\n")
+        buffer = lines.pop()
+        for line in lines:
+            line_no += 1
+            if line.strip():
+                yield line_no, line
+    if buffer.strip():
+        yield line_no + 1, buffer
+
+
+def describe_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'body'}: {error['msg']}" for error in exc.errors()
+    )
+
+
+async def import_ndjson(
+    chunks: AsyncIterable[bytes],
+    model: Type[BaseModel],
+    insert_batch: Callable[[List[Tuple[int, BaseModel]]], List[Tuple[int, str]]],
+    batch_size: Optional[int] = None,
+) -> dict:
+    """Validate a streamed NDJSON body line by line and insert it in batches.
+
+    insert_batch runs in the threadpool and returns (line, error) for rows it rejected.
+    Bad lines are reported individually and never abort the import.
+    """
+    batch_size = batch_size or BULK_BATCH_SIZE
+    received = inserted = failed = 0
+    errors = []
+    batch: List[Tuple[int, BaseModel]] = []
+
+    def record(line_no: int, error: str) -> None:
+        nonlocal failed
+        failed += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append({"line": line_no, "error": error})
+
+    async def flush() -> None:
+        nonlocal inserted
+        rejected = await run_in_threadpool(insert_batch, batch)
+        inserted += len(batch) - len(rejected)
+        for line_no, error in rejected:
+            record(line_no, error)
+        batch.clear()
+
+    async for line_no, line in iter_ndjson_lines(chunks):
+        received += 1
+        try:
+            batch.append((line_no, model.model_validate_json(line)))
+        except ValidationError as exc:
+            record(line_no, describe_validation_error(exc))
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+
+    return {"received": received, "inserted": inserted, "failed": failed, "errors": errors}
@@ -0,0 +1,241 @@
+import cProfile
+import functools
+import inspect
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qs
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import FileResponse
+from fastapi.routing import APIRoute
+
+from dependencies import get_current_user, is_admin
+from models import ProfileInfo, User
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", 50))
+# Collapsed stacks: deeper paths and paths under this many microseconds are dropped.
+MAX_STACK_DEPTH = 64
+MIN_STACK_US = 1
+# From 3.12 cProfile sits on sys.monitoring: one active profiler per interpreter,
+# which sees every thread. Before that each profiler only sees its own thread.
+PER_THREAD_PROFILERS = sys.version_info < (3, 12)
+
+
+class _ProfileSlot:
+    """Per-request profiling state; `authorized` is set by profiling_gate once the caller is known."""
+
+    __slots__ = ("authorized", "profilers")
+
+    def __init__(self):
+        self.authorized = False
+        self.profilers: List[cProfile.Profile] = []
+
+
+_profile_slot: ContextVar[Optional[_ProfileSlot]] = ContextVar("profile_slot", default=None)
+# Held while an event-loop profile is running: two cProfile instances enabled on
+# the same thread would replace each other's hook.
+_loop_profiler_lock = threading.Lock()
+
+
+def _wants_profile(scope) -> bool:
+    query = scope.get("query_string", b"")
+    if b"profile=" in query and parse_qs(query.decode("latin-1")).get("profile") == ["1"]:
+        return True
+    return any(name == b"x-profile" and value == b"1" for name, value in scope["headers"])
+
+
+async def profiling_gate(current_user: User = Depends(get_current_user)):
+    """Router dependency: arms profiling for this request if it asked for it and the user is an admin."""
+    slot = _profile_slot.get()
+    if slot is None:
+        return
+    if not is_admin(current_user):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Profiling is restricted to admins")
+    slot.authorized = True
+
+
+def _profiled_endpoint(endpoint: Callable) -> Callable:
+    """Sync endpoints run on the threadpool, out of reach of a pre-3.12 event-loop profiler; profile them there.
+
+    On 3.12+ the event-loop profiler already covers the worker thread, and a
+    second profiler could not be enabled anyway.
+    """
+    if inspect.iscoroutinefunction(endpoint) or not PER_THREAD_PROFILERS:
+        return endpoint
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        slot = _profile_slot.get()
+        if slot is None or not slot.authorized:
+            return endpoint(*args, **kwargs)
+        profiler = cProfile.Profile()
+        slot.profilers.append(profiler)
+        return profiler.runcall(endpoint, *args, **kwargs)
+
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """APIRoute that profiles a request when it carries `X-Profile: 1` or `?profile=1`.
+
+    Requests without the flag go straight to the normal handler. Flagged requests
+    are profiled on the event loop (parsing, validation, serialization) and, for
+    sync endpoints, on the worker thread (by the same profiler on 3.12+); the output is kept only if
+    profiling_gate authorized it. The event-loop profile can include slices of
+    other requests that were interleaved with this one. Only one flagged request
+    is profiled at a time; others that arrive meanwhile are served unprofiled.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, _profiled_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def profiled_handler(request: Request):
+            if not _wants_profile(request.scope) or not _loop_profiler_lock.acquire(blocking=False):
+                return await handler(request)
+
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:  # 3.12+: another profiling tool (debugger, coverage) holds sys.monitoring
+                _loop_profiler_lock.release()
+                return await handler(request)
+
+            slot = _ProfileSlot()
+            token = _profile_slot.set(slot)
+            start = time.perf_counter()
+            try:
+                response = await handler(request)
+            finally:
+                profiler.disable()
+                _loop_profiler_lock.release()
+                _profile_slot.reset(token)
+            if slot.authorized:
+                slot.profilers.append(profiler)
+                info = save_profile(request.method, self.path, slot.profilers, time.perf_counter() - start)
+                response.headers["X-Profile-Id"] = info.profileID
+            return response
+
+        return profiled_handler
+
+
+def _label(func) -> str:
+    filename, line, name = func
+    return f"{name} ({os.path.basename(filename)}:{line})".replace(";", ":")
+
+
+def collapsed_stacks(stats: pstats.Stats) -> List[str]:
+    """Approximate `frame;frame;frame microseconds` lines from cProfile's caller/callee edges.
+
+    cProfile only records one level of callers, so time under a function reached
+    along several paths is split between them in proportion to each path's time.
+    """
+    entries = stats.stats
+    callees: Dict[tuple, list] = defaultdict(list)
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees[caller].append((func, edge[2], edge[3]))
+
+    totals: Dict[str, float] = defaultdict(float)
+
+    def walk(func, path, own, cumulative):
+        path = path + (_label(func),)
+        totals[";".join(path)] += own
+        func_total = entries[func][3]
+        if len(path) >= MAX_STACK_DEPTH or not func_total:
+            return
+        share = cumulative / func_total
+        for child, child_own, child_cumulative in callees.get(func, ()):
+            if child_cumulative * share * 1e6 < MIN_STACK_US or _label(child) in path:
+                continue
+            walk(child, path, child_own * share, child_cumulative * share)
+
+    for func, (_, _, own, cumulative, callers) in entries.items():
+        if not callers:
+            walk(func, (), own, cumulative)
+
+    return [f"{stack} {round(seconds * 1e6)}" for stack, seconds in sorted(totals.items())
+            if seconds * 1e6 >= MIN_STACK_US]
+
+
+def _path(profile_id: str, suffix: str) -> str:
+    return os.path.join(PROFILE_DIR, f"{profile_id}.{suffix}")
+
+
+def save_profile(method: str, route: str, profilers: List[cProfile.Profile], seconds: float) -> ProfileInfo:
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    slug = "".join(c if c.isalnum() else "_" for c in route).strip("_") or "root"
+    profile_id = f"{time.time_ns() // 1000}-{method.lower()}-{slug}"
+
+    stats = pstats.Stats(profilers[0])
+    for profiler in profilers[1:]:
+        stats.add(profiler)
+    stats.dump_stats(_path(profile_id, "prof"))
+    with open(_path(profile_id, "collapsed"), "w") as f:
+        f.write("\n".join(collapsed_stacks(stats)) + "\n")
+
+    info = ProfileInfo(profileID=profile_id, method=method, route=route, durationMs=seconds * 1000,
+                       createdAt=time.time())
+    with open(_path(profile_id, "json"), "w") as f:
+        f.write(info.model_dump_json())
+
+    _prune()
+    return info
+
+
+def _profile_ids() -> List[str]:
+    """Newest first; IDs start with a microsecond timestamp."""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    ids = [name[:-len(".json")] for name in os.listdir(PROFILE_DIR) if name.endswith(".json")]
+    return sorted(ids, key=lambda profile_id: int(profile_id.split("-", 1)[0]), reverse=True)
+
+
+def _prune() -> None:
+    for profile_id in _profile_ids()[PROFILE_KEEP:]:
+        for suffix in ("json", "prof", "collapsed"):
+            try:
+                os.remove(_path(profile_id, suffix))
+            except FileNotFoundError:
+                pass
+
+
+async def require_admin(current_user: User = Depends(get_current_user)):
+    if not is_admin(current_user):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin only")
+    return current_user
+
+
+router = APIRouter(
+    prefix="/profiles",
+    tags=["Profiling"],
+    dependencies=[Depends(require_admin)]
+)
+
+@router.get("/", response_model=List[ProfileInfo])
+def list_profiles(limit: int = 20):
+    profiles = []
+    for profile_id in _profile_ids()[:limit]:
+        try:
+            with open(_path(profile_id, "json")) as f:
+                profiles.append(json.load(f))
+        except FileNotFoundError:
+            continue
+    return profiles
+
+@router.get("/{profile_id}/{kind}")
+def download_profile(profile_id: str, kind: str):
+    if kind not in ("prof", "collapsed") or profile_id not in _profile_ids():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    media_type = "text/plain" if kind == "collapsed" else "application/octet-stream"
+    return FileResponse(_path(profile_id, kind), media_type=media_type, filename=f"{profile_id}.{kind}")
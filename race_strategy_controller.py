@@ -1,10 +1,15 @@
-from fastapi import APIRouter, HTTPException, Depends, status
-from models import RaceStrategy, StrategyPlan, User
+from fastapi import APIRouter, HTTPException, Depends, Request, status
+from models import BulkImportResult, RaceStrategy, StrategyPlan, User
 from dependencies import get_current_user, db_race_strategies
+from profiling import ProfiledRoute, profiling_gate
+from ndjson import import_ndjson
+from fast_json import trusted_response
 
 router = APIRouter(
     prefix="/race_strategy",
-    tags=["Race Strategy"]
+    tags=["Race Strategy"],
+    route_class=ProfiledRoute,
+    dependencies=[Depends(profiling_gate)]
 )
 
 @router.post("/", response_model=RaceStrategy)
@@ -12,19 +17,28 @@ def create_race_strategy(strategy: RaceStrategy, current_user: User = Depends(ge
     db_race_strategies[strategy.race.raceID] = strategy
     return strategy
 
+@router.post("/bulk", response_model=BulkImportResult)
+async def bulk_import_race_strategies(request: Request, current_user: User = Depends(get_current_user)):
+    def insert_batch(rows):
+        db_race_strategies.put_many((strategy.race.raceID, strategy) for _, strategy in rows)
+        return []
+
+    return await import_ndjson(request.stream(), RaceStrategy, insert_batch)
+
 @router.get("/{race_id}", response_model=RaceStrategy)
 def get_race_strategy(race_id: int, current_user: User = Depends(get_current_user)):
     strategy = db_race_strategies.get(race_id)
     if not strategy:
         raise HTTPException(status_code=404, detail="Race strategy not found")
-    return strategy
+    return trusted_response(strategy)
 
 @router.put("/{race_id}/plan", response_model=RaceStrategy)
 def update_strategy_plan(race_id: int, plan: StrategyPlan, current_user: User = Depends(get_current_user)):
-    strategy = db_race_strategies.get(race_id)
-    if not strategy:
-        raise HTTPException(status_code=404, detail="Race strategy not found")
-    
-    strategy.strategyPlan = plan
-    db_race_strategies[race_id] = strategy
-    return strategy
\ No newline at end of file
+    while True:
+        strategy = db_race_strategies.get(race_id)
+        if not strategy:
+            raise HTTPException(status_code=404, detail="Race strategy not found")
+
+        updated = strategy.model_copy(update={"strategyPlan": plan})
+        if db_race_strategies.compare_and_set(race_id, strategy, updated):
+            return updated
\ No newline at end of file
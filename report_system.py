@@ -1,52 +1,152 @@
-from fastapi import APIRouter, HTTPException, Depends, status
-from typing import Dict
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
-from models import RaceReport, Race, User
-from dependencies import get_current_user, db_race_strategies, db_teams 
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from collections import OrderedDict
+import os
+import threading
+from models import CacheStats, RaceReport, ReportBatchRequest, ReportChanges, ReportJob, ReportJobResult, Race, User
+from dependencies import get_current_user, db_race_strategies, db_teams, race_strategies_version, teams_version
+from profiling import ProfiledRoute, profiling_gate
+from storage import (
+    CountIndex, FieldIndex, IdAllocator, IndexedStore, VersionIndex, collect_changes, create_repository
+)
+from cache import LRUCache
+from fast_json import trusted_response
 
 router = APIRouter(
     prefix="/report_system",
-    tags=["Report System"]
+    tags=["Report System"],
+    route_class=ProfiledRoute,
+    dependencies=[Depends(profiling_gate)]
+)
+
+reports_by_race = FieldIndex("raceID")
+reports_version = VersionIndex()
+reports_count = CountIndex()
+db_race_reports = IndexedStore(
+    create_repository("race_reports", RaceReport, index_fields=("raceID",)),
+    indexes=[reports_by_race, reports_version, reports_count],
 )
+report_ids = IdAllocator(start=max(db_race_reports, default=0) + 1)
+
+# (race_id, strategy version, teams version) -> report
+report_cache = LRUCache(maxsize=int(os.getenv("REPORT_CACHE_SIZE", 256)), name="reports")
+# report ID -> the (race_id, strategy version, teams version) it was built from
+report_inputs: Dict[int, Tuple[int, int, int]] = {}
+
+class ReportJobStore:
+    """Progress of batch generation jobs; keeps the most recent `history` jobs."""
+
+    def __init__(self, history: int = 100):
+        self.history = history
+        self._jobs: "OrderedDict[int, ReportJob]" = OrderedDict()
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def create(self, race_ids: List[int]) -> ReportJob:
+        with self._lock:
+            job = ReportJob(
+                jobID=self._next_id, status="running", total=len(race_ids), completed=0,
+                results=[ReportJobResult(raceID=race_id, status="pending") for race_id in race_ids],
+            )
+            if not race_ids:
+                job.status = "done"
+            self._next_id += 1
+            self._jobs[job.jobID] = job
+            while len(self._jobs) > self.history:
+                self._jobs.popitem(last=False)
+            return job
+
+    def get(self, job_id: int) -> Optional[ReportJob]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.model_copy(deep=True) if job else None
+
+    def finish(self, job_id: int, race_id: int, report_id: Optional[int] = None, error: Optional[str] = None) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            result = next(r for r in job.results if r.raceID == race_id)
+            result.status = "failed" if error else "done"
+            result.reportID = report_id
+            result.error = error
+            job.completed += 1
+            if job.completed == job.total:
+                job.status = "done"
+
+    def finish_from_future(self, job_id: int, race_id: int, future: Future) -> None:
+        exc = future.exception()
+        if exc is not None:
+            self.finish(job_id, race_id, error=str(exc))
+        else:
+            self.finish(job_id, race_id, report_id=future.result().reportID)
+
+report_jobs = ReportJobStore(history=int(os.getenv("REPORT_JOB_HISTORY", 100)))
+
+def driver_name(entry: str) -> str:
+    """Driver part of a "P1: Driver (Team)" entry; the team is optional."""
+    open_paren = entry.find('(')
+    end = open_paren if open_paren != -1 else len(entry)
+    return entry[entry.find(':', 0, end) + 1:end].strip()
 
-db_race_reports: Dict[int, RaceReport] = {}
-next_report_id = 1
+def parse_race_result(result: List[str]) -> List[Tuple[int, str, str]]:
+    """Turn "P1: Driver (Team)" entries into (position, driver, team) rows; entries without a team are skipped."""
+    rows = []
+    for position, entry in enumerate(result, start=1):
+        open_paren = entry.find('(')
+        if open_paren == -1:
+            continue
+        close_paren = entry.find(')', open_paren)
+        team = entry[open_paren + 1:close_paren if close_paren != -1 else len(entry)]
+        rows.append((position, driver_name(entry), team))
+    return rows
 
-def simulate_report_generation(race: Race) -> RaceReport:
-    if not race.result:
+def best_result_by_team(rows: List[Tuple[int, str, str]]) -> Dict[str, Tuple[int, str]]:
+    best = {}
+    for position, driver, team in rows:
+        if team not in best:
+            best[team] = (position, driver)
+    return best
+
+def build_report(race: Race, team_names: List[str], report_id: int) -> RaceReport:
+    """Pure report builder; safe to run in a worker process."""
+    rows = parse_race_result(race.result)
+    if not rows:
         summary = f"Balapan di {race.circuitName} ({race.date}) belum memiliki hasil akhir yang terekam."
         key_incidents = ["Tidak ada insiden tercatat (balapan belum selesai/data kurang)."]
         team_analysis = {}
     else:
-        winner_entry = race.result[0]
-        winner = winner_entry.split(':')[1].split('(')[0].strip()
-        winning_team = winner_entry.split('(')[1].strip(')')
-        
-        summary = f"Race Report: {winner} dari tim {winning_team} memenangkan balapan di {race.circuitName} pada {race.date}. Cuaca: {race.weather}."
-        
+        # The winner is always the first entry; rows skip entries without a team.
+        winner = driver_name(race.result[0])
+        winning_team = rows[0][2] if rows[0][0] == 1 else None
+
+        if winning_team:
+            summary = f"Race Report: {winner} dari tim {winning_team} memenangkan balapan di {race.circuitName} pada {race.date}. Cuaca: {race.weather}."
+        else:
+            summary = f"Race Report: {winner} memenangkan balapan di {race.circuitName} pada {race.date}. Cuaca: {race.weather}."
+
         key_incidents = ["Start bersih tanpa insiden besar."]
         if "Rain" in race.weather or "Wet" in race.weather:
              key_incidents.append("Kondisi lintasan basah pada awal balapan memengaruhi strategi ban.")
-        
+
         team_analysis = {}
-        all_teams = db_teams.values()
-        for team in all_teams:
-            team_drivers_in_result = [r for r in race.result if f"({team.name})" in r]
-            
-            if team_drivers_in_result:
-                best_pos_index = min([race.result.index(r) for r in team_drivers_in_result])
-                best_driver_result = race.result[best_pos_index]
-                best_driver_pos = best_pos_index + 1
-                
-                analysis_text = f"Performa tim **{team.name}** solid. Hasil terbaik P{best_driver_pos} dicapai oleh {best_driver_result.split(':')[1].split('(')[0].strip()}. Tim berhasil mengumpulkan poin penting."
+        best_by_team = best_result_by_team(rows)
+        for team_name in team_names:
+            best = best_by_team.get(team_name)
+
+            if best:
+                best_driver_pos, best_driver = best
+                analysis_text = f"Performa tim **{team_name}** solid. Hasil terbaik P{best_driver_pos} dicapai oleh {best_driver}. Tim berhasil mengumpulkan poin penting."
             else:
-                analysis_text = f"Tim **{team.name}** tidak tercatat di hasil akhir balapan (DNF/Di luar Poin). Perlu evaluasi strategi/kendaraan."
+                analysis_text = f"Tim **{team_name}** tidak tercatat di hasil akhir balapan (DNF/Di luar Poin). Perlu evaluasi strategi/kendaraan."
 
-            team_analysis[team.name] = analysis_text
+            team_analysis[team_name] = analysis_text
 
 
     new_report = RaceReport(
-        reportID=next_report_id,
+        reportID=report_id,
         raceID=race.raceID,
         raceSummary=summary,
         teamPerformanceAnalysis=team_analysis,
@@ -56,28 +156,150 @@ def simulate_report_generation(race: Race) -> RaceReport:
     
     return new_report
 
+def simulate_report_generation(race: Race, report_id: Optional[int] = None) -> RaceReport:
+    team_names = [team.name for team in db_teams.values()]
+    return build_report(race, team_names, report_ids.next() if report_id is None else report_id)
+
+def _cache_key(race_id: int) -> Tuple[int, int, int]:
+    return (race_id, race_strategies_version.key_version(race_id), teams_version.version)
+
+def refresh_report(report: RaceReport) -> RaceReport:
+    """Return the report if its race and the teams are unchanged, else regenerate it.
+
+    Staleness is decided by the inputs recorded in `report_inputs`; the LRU only
+    saves work and an evicted entry never causes a rebuild. A report with no
+    recorded inputs (e.g. loaded from disk after a restart) is taken as current.
+    """
+    key = _cache_key(report.raceID)
+    built_from = report_inputs.setdefault(report.reportID, key)
+    cached = report_cache.get(key)
+    if cached is not None and cached.reportID == report.reportID:
+        return cached
+    if built_from == key:
+        return report
+
+    race_strategy = db_race_strategies.get(report.raceID)
+    if not race_strategy:
+        return report
+
+    fresh = simulate_report_generation(race_strategy.race, report_id=report.reportID)
+    db_race_reports[fresh.reportID] = fresh
+    report_inputs[fresh.reportID] = key
+    report_cache.set(key, fresh)
+    return fresh
+
+def _new_report_pool() -> Executor:
+    workers = int(os.getenv("REPORT_WORKERS", os.cpu_count() or 2))
+    if os.getenv("REPORT_POOL", "thread") == "process":
+        return ProcessPoolExecutor(max_workers=workers)
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="report")
+
+_report_pool: Optional[Executor] = None
+
+def get_report_pool() -> Executor:
+    """Created on first use and again after shutdown_report_pool()."""
+    global _report_pool
+    if _report_pool is None:
+        _report_pool = _new_report_pool()
+    return _report_pool
+
+def shutdown_report_pool() -> None:
+    global _report_pool
+    pool, _report_pool = _report_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False)
+
+# Guards the duplicate check and the in-flight map together.
+_report_lock = threading.Lock()
+_in_flight: Dict[int, Future] = {}
+
+def _store_report(race_id: int, key: Tuple[int, int, int], computation: Future, stored: Future) -> None:
+    with _report_lock:
+        exc = computation.exception()
+        if exc is None:
+            report = computation.result()
+            db_race_reports[report.reportID] = report
+            report_inputs[report.reportID] = key
+            report_cache.set(key, report)
+        _in_flight.pop(race_id, None)
+    if exc is None:
+        stored.set_result(report)
+    else:
+        stored.set_exception(exc)
+
+def submit_report(race_id: int) -> Future:
+    """Schedule report generation for a race, joining any in-flight computation for it.
+
+    The returned future resolves once the report has been stored.
+    """
+    with _report_lock:
+        stored = _in_flight.get(race_id)
+        if stored is not None:
+            return stored
+
+        race_strategy = db_race_strategies.get(race_id)
+        if not race_strategy:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Race dengan ID {race_id} tidak ditemukan.")
+
+        if reports_by_race.lookup(race_id):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Laporan untuk Race ID {race_id} sudah ada.")
+
+        report_id = report_ids.next()
+        key = _cache_key(race_id)
+        team_names = [team.name for team in db_teams.values()]
+        stored = Future()
+        _in_flight[race_id] = stored
+        computation = get_report_pool().submit(build_report, race_strategy.race, team_names, report_id)
+
+    computation.add_done_callback(lambda f: _store_report(race_id, key, f, stored))
+    return stored
+
+@router.post("/generate/batch", response_model=ReportJob, status_code=status.HTTP_202_ACCEPTED)
+def generate_race_reports_batch(batch: ReportBatchRequest, current_user: User = Depends(get_current_user)):
+    race_ids = list(dict.fromkeys(batch.raceIDs))
+    job = report_jobs.create(race_ids)
+
+    for race_id in race_ids:
+        try:
+            future = submit_report(race_id)
+        except HTTPException as exc:
+            report_jobs.finish(job.jobID, race_id, error=exc.detail)
+            continue
+        future.add_done_callback(lambda f, race_id=race_id: report_jobs.finish_from_future(job.jobID, race_id, f))
+
+    return report_jobs.get(job.jobID)
+
+@router.get("/jobs/{job_id}", response_model=ReportJob)
+def get_report_job(job_id: int, current_user: User = Depends(get_current_user)):
+    job = report_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job tidak ditemukan")
+    return trusted_response(job)
+
 @router.post("/generate/{race_id}", response_model=RaceReport, status_code=status.HTTP_201_CREATED)
 def generate_race_report(race_id: int, current_user: User = Depends(get_current_user)):
-    global next_report_id
+    return submit_report(race_id).result()
 
-    race_strategy = db_race_strategies.get(race_id)
-    if not race_strategy:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Race dengan ID {race_id} tidak ditemukan.")
-    
-    race = race_strategy.race
-
-    if any(r.raceID == race_id for r in db_race_reports.values()):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Laporan untuk Race ID {race_id} sudah ada.")
-        
-    report = simulate_report_generation(race)
-    db_race_reports[report.reportID] = report
-    next_report_id += 1
-    
-    return report
+@router.get("/cache/stats", response_model=CacheStats)
+def get_report_cache_stats(current_user: User = Depends(get_current_user)):
+    return report_cache.stats()
+
+@router.get("/changes", response_model=ReportChanges)
+def get_report_changes(
+    since: int = Query(0, ge=0), epoch: Optional[str] = None, current_user: User = Depends(get_current_user)
+):
+    return trusted_response(collect_changes(db_race_reports, reports_version, since, epoch))
+
+@router.get("/race/{race_id}", response_model=RaceReport)
+def get_race_report_by_race(race_id: int, current_user: User = Depends(get_current_user)):
+    report_ids = reports_by_race.lookup(race_id)
+    if not report_ids:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Laporan tidak ditemukan")
+    return trusted_response(refresh_report(db_race_reports[max(report_ids)]))
 
 @router.get("/{report_id}", response_model=RaceReport)
 def get_race_report(report_id: int, current_user: User = Depends(get_current_user)):
     report = db_race_reports.get(report_id)
     if not report:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Laporan tidak ditemukan")
-    return report
\ No newline at end of file
+    return trusted_response(refresh_report(report))
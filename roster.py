@@ -0,0 +1,54 @@
+from typing import Dict, Optional
+
+from storage import Repository, StoreIndex
+
+
+class RosterIndex(StoreIndex):
+    """driverID -> teamID and engineerID -> teamID, kept in sync with db_teams.
+
+    Drivers are also mirrored into the `drivers` repository so they can be read
+    without loading their team. IDs are expected to be unique across teams; if
+    two teams list the same ID, the most recent write owns it.
+    """
+
+    def __init__(self, drivers: Repository):
+        self.drivers = drivers
+        self._driver_team: Dict[int, int] = {}
+        self._engineer_team: Dict[int, int] = {}
+
+    def add(self, key, value):
+        team_drivers = value.drivers or []
+        for driver in team_drivers:
+            self._driver_team[driver.driverID] = key
+        self.drivers.put_many((driver.driverID, driver) for driver in team_drivers)
+        for engineer in value.engineers or []:
+            self._engineer_team[engineer.engineerID] = key
+
+    def remove(self, key, value):
+        for driver in value.drivers or []:
+            if self._driver_team.get(driver.driverID) == key:
+                del self._driver_team[driver.driverID]
+                self.drivers.pop(driver.driverID, None)
+        for engineer in value.engineers or []:
+            if self._engineer_team.get(engineer.engineerID) == key:
+                del self._engineer_team[engineer.engineerID]
+
+    def clear(self):
+        self._driver_team.clear()
+        self._engineer_team.clear()
+        self.drivers.clear()
+
+    def driver_team(self, driver_id: int) -> Optional[int]:
+        return self._driver_team.get(driver_id)
+
+    def engineer_team(self, engineer_id: int) -> Optional[int]:
+        return self._engineer_team.get(engineer_id)
+
+    def has_engineer(self, engineer_id: int) -> bool:
+        return engineer_id in self._engineer_team
+
+    def driver_count(self) -> int:
+        return len(self._driver_team)
+
+    def engineer_count(self) -> int:
+        return len(self._engineer_team)
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, HTTPException, Depends
+from models import DriverAssignment, Team, User
+from dependencies import get_current_user, db_drivers, db_teams, roster_index
+from profiling import ProfiledRoute, profiling_gate
+from fast_json import trusted_response
+
+router = APIRouter(tags=["Roster"], route_class=ProfiledRoute, dependencies=[Depends(profiling_gate)])
+
+@router.get("/drivers/{driver_id}", response_model=DriverAssignment)
+def get_driver(driver_id: int, current_user: User = Depends(get_current_user)):
+    with db_teams.lock:
+        team_id = roster_index.driver_team(driver_id)
+        driver = db_drivers.get(driver_id)
+        if team_id is None or driver is None:
+            raise HTTPException(status_code=404, detail="Driver not found")
+        return trusted_response(DriverAssignment(driver=driver, teamID=team_id, teamName=db_teams[team_id].name))
+
+@router.get("/engineers/{engineer_id}/team", response_model=Team)
+def get_engineer_team(engineer_id: int, current_user: User = Depends(get_current_user)):
+    with db_teams.lock:
+        team_id = roster_index.engineer_team(engineer_id)
+        if team_id is None:
+            raise HTTPException(status_code=404, detail="Engineer not found")
+        return trusted_response(db_teams[team_id])
@@ -0,0 +1,596 @@
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from datetime import date, time
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, List, Optional, Set, Tuple
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "memory")
+STORAGE_PATH = os.getenv("STORAGE_PATH", "f1_data.sqlite3")
+
+
+class Repository(MutableMapping):
+    """Dict-like store for one aggregate type, keyed by its integer ID."""
+
+    def __init__(self, name: str, model, index_fields: Iterable[str] = ()):
+        self.name = name
+        self.model = model
+        self.index_fields = tuple(index_fields)
+
+    def find(self, field: str, value) -> List[Any]:
+        raise NotImplementedError
+
+    def get_many(self, keys: Iterable[int]) -> List[Any]:
+        """Values of the keys that exist, in the order given."""
+        return [self[key] for key in keys if key in self]
+
+    def put_many(self, items: Iterable[Tuple[int, Any]]) -> None:
+        with self.batch():
+            for key, value in items:
+                self[key] = value
+
+    @contextmanager
+    def batch(self):
+        yield self
+
+    def close(self) -> None:
+        pass
+
+
+class InMemoryRepository(Repository):
+    def __init__(self, name: str, model, index_fields: Iterable[str] = ()):
+        super().__init__(name, model, index_fields)
+        self._data: Dict[int, Any] = {}
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+
+    def __delitem__(self, key):
+        del self._data[key]
+
+    # Iteration works on snapshots: sync endpoints run on a threadpool, and
+    # iterating a live dict while another thread writes raises RuntimeError.
+    def __iter__(self):
+        return iter(list(self._data))
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        return self._data.get(key, default)
+
+    def keys(self):
+        return list(self._data)
+
+    def values(self):
+        return list(self._data.values())
+
+    def items(self):
+        return list(self._data.items())
+
+    def clear(self):
+        self._data.clear()
+
+    def find(self, field: str, value) -> List[Any]:
+        return [item for item in self.values() if getattr(item, field) == value]
+
+    def get_many(self, keys: Iterable[int]) -> List[Any]:
+        data = self._data
+        return [data[key] for key in keys if key in data]
+
+
+def _column_value(value):
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    return value
+
+
+class SQLiteDatabase:
+    """One WAL-mode connection per database file, shared by every repository in it."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, cached_statements=256
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.lock = threading.RLock()
+        self._depth = 0
+
+    def query(self, sql: str, params=()) -> List[tuple]:
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def execute(self, sql: str, params=()) -> int:
+        with self.lock:
+            return self.conn.execute(sql, params).rowcount
+
+    def executemany(self, sql: str, rows) -> None:
+        with self.batch():
+            self.conn.executemany(sql, rows)
+
+    @contextmanager
+    def batch(self):
+        with self.lock:
+            if self._depth == 0:
+                self.conn.execute("BEGIN")
+            self._depth += 1
+            try:
+                yield
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self.conn.execute("ROLLBACK")
+                raise
+            self._depth -= 1
+            if self._depth == 0:
+                self.conn.execute("COMMIT")
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
+
+
+_databases: Dict[str, SQLiteDatabase] = {}
+_databases_lock = threading.Lock()
+
+
+def open_database(path: str) -> SQLiteDatabase:
+    with _databases_lock:
+        db = _databases.get(path)
+        if db is None:
+            db = SQLiteDatabase(path)
+            _databases[path] = db
+        return db
+
+
+class SQLiteRepository(Repository):
+    """Stores each aggregate as JSON, with the index fields copied into indexed columns."""
+
+    def __init__(self, name: str, model, index_fields: Iterable[str] = (), path: str = STORAGE_PATH):
+        super().__init__(name, model, index_fields)
+        for field in (name, *self.index_fields):
+            if not field.isidentifier():
+                raise ValueError(f"Invalid table or column name: {field}")
+        self.db = open_database(path)
+
+        columns = "".join(f", {field}" for field in self.index_fields)
+        placeholders = ", ?" * len(self.index_fields)
+        self.db.execute(f"CREATE TABLE IF NOT EXISTS {name} (id INTEGER PRIMARY KEY, data TEXT NOT NULL{columns})")
+        for field in self.index_fields:
+            self.db.execute(f"CREATE INDEX IF NOT EXISTS idx_{name}_{field} ON {name} ({field})")
+
+        self._sql_get = f"SELECT data FROM {name} WHERE id = ?"
+        self._sql_exists = f"SELECT 1 FROM {name} WHERE id = ?"
+        self._sql_put = f"INSERT OR REPLACE INTO {name} (id, data{columns}) VALUES (?, ?{placeholders})"
+        self._sql_delete = f"DELETE FROM {name} WHERE id = ?"
+        self._sql_keys = f"SELECT id FROM {name} ORDER BY id"
+        self._sql_items = f"SELECT id, data FROM {name} ORDER BY id"
+        # Keys travel as one JSON array parameter, so any number of them is a single query.
+        self._sql_get_many = f"SELECT id, data FROM {name} WHERE id IN (SELECT value FROM json_each(?))"
+        self._sql_count = f"SELECT COUNT(*) FROM {name}"
+        self._sql_clear = f"DELETE FROM {name}"
+        self._sql_find = {
+            field: f"SELECT data FROM {name} WHERE {field} = ? ORDER BY id" for field in self.index_fields
+        }
+
+    def _row(self, key, value) -> tuple:
+        return (key, value.model_dump_json(), *(_column_value(getattr(value, f)) for f in self.index_fields))
+
+    def __getitem__(self, key):
+        rows = self.db.query(self._sql_get, (key,))
+        if not rows:
+            raise KeyError(key)
+        return self.model.model_validate_json(rows[0][0])
+
+    def __setitem__(self, key, value):
+        self.db.execute(self._sql_put, self._row(key, value))
+
+    def __delitem__(self, key):
+        if self.db.execute(self._sql_delete, (key,)) == 0:
+            raise KeyError(key)
+
+    def __iter__(self):
+        return iter([row[0] for row in self.db.query(self._sql_keys)])
+
+    def __len__(self):
+        return self.db.query(self._sql_count)[0][0]
+
+    def __contains__(self, key):
+        return bool(self.db.query(self._sql_exists, (key,)))
+
+    def values(self):
+        return [self.model.model_validate_json(data) for _, data in self.db.query(self._sql_items)]
+
+    def items(self):
+        return [(key, self.model.model_validate_json(data)) for key, data in self.db.query(self._sql_items)]
+
+    def clear(self):
+        self.db.execute(self._sql_clear)
+
+    def find(self, field: str, value) -> List[Any]:
+        sql = self._sql_find.get(field)
+        if sql is None:
+            return [item for item in self.values() if getattr(item, field) == value]
+        return [self.model.model_validate_json(data) for (data,) in self.db.query(sql, (_column_value(value),))]
+
+    def get_many(self, keys: Iterable[int]) -> List[Any]:
+        keys = list(keys)
+        if not keys:
+            return []
+        rows = dict(self.db.query(self._sql_get_many, (json.dumps(keys),)))
+        return [self.model.model_validate_json(rows[key]) for key in keys if key in rows]
+
+    def put_many(self, items: Iterable[Tuple[int, Any]]) -> None:
+        self.db.executemany(self._sql_put, [self._row(key, value) for key, value in items])
+
+    def batch(self):
+        return self.db.batch()
+
+
+class IdAllocator:
+    """Thread-safe monotonic integer ID source."""
+
+    def __init__(self, start: int = 1):
+        self._next = start
+        self._lock = threading.Lock()
+
+    def next(self) -> int:
+        with self._lock:
+            value = self._next
+            self._next += 1
+            return value
+
+    def allocate(self, count: int) -> range:
+        """Reserve `count` consecutive IDs in one step."""
+        with self._lock:
+            block = range(self._next, self._next + count)
+            self._next += count
+            return block
+
+    def observe(self, used: int) -> None:
+        """Make sure IDs chosen by clients are never handed out again."""
+        with self._lock:
+            if used >= self._next:
+                self._next = used + 1
+
+
+class StoreIndex:
+    """Secondary index kept in sync by IndexedStore on every write."""
+
+    def add(self, key, value) -> None:
+        raise NotImplementedError
+
+    def remove(self, key, value) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class FieldIndex(StoreIndex):
+    """field value -> set of keys."""
+
+    def __init__(self, field: str):
+        self.field = field
+        self._keys: Dict[Any, Set[int]] = {}
+
+    def add(self, key, value):
+        self._keys.setdefault(getattr(value, self.field), set()).add(key)
+
+    def remove(self, key, value):
+        field_value = getattr(value, self.field)
+        keys = self._keys.get(field_value)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys[field_value]
+
+    def clear(self):
+        self._keys.clear()
+
+    def lookup(self, field_value) -> FrozenSet[int]:
+        """A snapshot, so callers can iterate it while other threads write."""
+        return frozenset(self._keys.get(field_value, ()))
+
+
+class SortedIndex(StoreIndex):
+    """Sorted (field value, key) pairs for range queries."""
+
+    def __init__(self, field: str):
+        self.field = field
+        self._entries: List[Tuple[Any, int]] = []
+
+    def add(self, key, value):
+        insort(self._entries, (getattr(value, self.field), key))
+
+    def remove(self, key, value):
+        entry = (getattr(value, self.field), key)
+        i = bisect_left(self._entries, entry)
+        if i < len(self._entries) and self._entries[i] == entry:
+            del self._entries[i]
+
+    def clear(self):
+        self._entries.clear()
+
+    def range(self, low=None, high=None) -> List[int]:
+        """Keys whose field value lies in [low, high]; either bound may be None."""
+        entries = self._entries
+        start = 0 if low is None else bisect_left(entries, (low,))
+        end = len(entries) if high is None else bisect_right(entries, (high, float("inf")))
+        return [key for _, key in entries[start:end]]
+
+    def page(self, after=None, limit: Optional[int] = None) -> List[int]:
+        """Up to `limit` keys whose field value is strictly greater than `after`."""
+        entries = self._entries
+        start = 0 if after is None else bisect_right(entries, (after, float("inf")))
+        end = len(entries) if limit is None else min(len(entries), start + limit)
+        return [key for _, key in entries[start:end]]
+
+
+class IntervalIndex(StoreIndex):
+    """Half-open intervals bucketed by group, for overlap queries.
+
+    Each bucket is sorted by start; a lookup bisects to the last interval that
+    starts before the query ends and walks back only as far as the longest
+    interval in the bucket could reach, so it costs O(log n + k).
+    """
+
+    def __init__(self, group: Callable[[Any], Hashable], interval: Callable[[Any], Tuple[int, int]]):
+        self.group = group
+        self.interval = interval
+        self._buckets: Dict[Hashable, List[Tuple[int, int, int]]] = {}
+        self._max_span: Dict[Hashable, int] = {}
+
+    def add(self, key, value):
+        group = self.group(value)
+        start, end = self.interval(value)
+        insort(self._buckets.setdefault(group, []), (start, end, key))
+        self._max_span[group] = max(self._max_span.get(group, 0), end - start)
+
+    def remove(self, key, value):
+        group = self.group(value)
+        bucket = self._buckets.get(group)
+        if bucket is None:
+            return
+        start, end = self.interval(value)
+        i = bisect_left(bucket, (start, end, key))
+        if i < len(bucket) and bucket[i] == (start, end, key):
+            del bucket[i]
+        if not bucket:
+            del self._buckets[group]
+            del self._max_span[group]
+
+    def clear(self):
+        self._buckets.clear()
+        self._max_span.clear()
+
+    def overlapping(self, group, start: int, end: int, exclude=None) -> List[int]:
+        bucket = self._buckets.get(group)
+        if not bucket:
+            return []
+        earliest = start - self._max_span[group]
+        matches = []
+        i = bisect_left(bucket, (end,)) - 1
+        while i >= 0 and bucket[i][0] > earliest:
+            other_start, other_end, key = bucket[i]
+            if other_end > start and key != exclude:
+                matches.append(key)
+            i -= 1
+        matches.reverse()
+        return matches
+
+
+class CountIndex(StoreIndex):
+    """Live record count, so summaries need no COUNT(*) or scan per read."""
+
+    def __init__(self):
+        self.count = 0
+
+    def add(self, key, value):
+        self.count += 1
+
+    def remove(self, key, value):
+        self.count -= 1
+
+    def clear(self):
+        self.count = 0
+
+
+class VersionIndex(StoreIndex):
+    """Monotonic write counter for the whole store and per key.
+
+    Keys are kept in write order, so the keys changed after a given version can
+    be read without scanning the store. Deleted keys stay behind as tombstones.
+    `epoch` tells clients holding a version from another process apart.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self.epoch = uuid.uuid4().hex[:12]
+        self._cleared_at = 0
+        self._key_versions: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._deleted: Set[Hashable] = set()
+
+    def _touch(self, key):
+        self.version += 1
+        self._key_versions[key] = self.version
+        self._key_versions.move_to_end(key)
+
+    def add(self, key, value):
+        self._touch(key)
+        self._deleted.discard(key)
+
+    def remove(self, key, value):
+        self._touch(key)
+        self._deleted.add(key)
+
+    def clear(self):
+        self.version += 1
+        self._cleared_at = self.version
+        self._key_versions.clear()
+        self._deleted.clear()
+
+    def key_version(self, key) -> int:
+        return max(self._key_versions.get(key, 0), self._cleared_at)
+
+    def changed_since(self, since: int) -> Optional[Tuple[List[Hashable], List[Hashable]]]:
+        """(written keys, deleted keys) changed after version `since`, oldest first.
+
+        None when `since` is older than the last clear or newer than the store:
+        the caller has to start over from a full snapshot. Call with the store lock held.
+        """
+        if since < self._cleared_at or since > self.version:
+            return None
+        written, deleted = [], []
+        for key in reversed(self._key_versions):
+            if self._key_versions[key] <= since:
+                break
+            (deleted if key in self._deleted else written).append(key)
+        return written[::-1], deleted[::-1]
+
+
+class IndexedStore(MutableMapping):
+    """Wraps a Repository and keeps its secondary indexes up to date."""
+
+    def __init__(self, repository: Repository, indexes: Iterable[StoreIndex] = ()):
+        self.repository = repository
+        self.indexes = list(indexes)
+        self.lock = threading.RLock()
+        for key, value in repository.items():
+            for index in self.indexes:
+                index.add(key, value)
+
+    @property
+    def name(self):
+        return self.repository.name
+
+    def __getitem__(self, key):
+        return self.repository[key]
+
+    def __setitem__(self, key, value):
+        with self.lock:
+            old = self.repository.get(key)
+            self.repository[key] = value
+            for index in self.indexes:
+                if old is not None:
+                    index.remove(key, old)
+                index.add(key, value)
+
+    def __delitem__(self, key):
+        with self.lock:
+            old = self.repository[key]
+            del self.repository[key]
+            for index in self.indexes:
+                index.remove(key, old)
+
+    def compare_and_set(self, key, expected, value) -> bool:
+        """Replace `expected` with `value` unless another writer got there first.
+
+        Callers read a value, derive a new one outside the lock and retry on
+        False, so a read-modify-write never overwrites a concurrent update.
+        An `expected` of None means "only if the key is free".
+        """
+        with self.lock:
+            current = self.repository.get(key)
+            if current is not expected and current != expected:
+                return False
+            self[key] = value
+            return True
+
+    def __iter__(self):
+        return iter(self.repository)
+
+    def __len__(self):
+        return len(self.repository)
+
+    def __contains__(self, key):
+        return key in self.repository
+
+    def get(self, key, default=None):
+        return self.repository.get(key, default)
+
+    def keys(self):
+        return self.repository.keys()
+
+    def values(self):
+        return self.repository.values()
+
+    def items(self):
+        return self.repository.items()
+
+    def clear(self):
+        with self.lock:
+            self.repository.clear()
+            for index in self.indexes:
+                index.clear()
+
+    def find(self, field: str, value) -> List[Any]:
+        return self.repository.find(field, value)
+
+    def get_many(self, keys: Iterable[int]) -> List[Any]:
+        return self.repository.get_many(keys)
+
+    def put_many(self, items: Iterable[Tuple[int, Any]]) -> None:
+        with self.lock, self.repository.batch():
+            for key, value in items:
+                self[key] = value
+
+    @contextmanager
+    def batch(self):
+        # Store lock before the repository's (on SQLite, the shared database lock), as in put_many;
+        # single writes take the store lock first too, so the two can never wait on each other.
+        with self.lock, self.repository.batch():
+            yield
+
+
+def collect_changes(store: IndexedStore, versions: VersionIndex, since: int, epoch: Optional[str] = None):
+    """Body of a `?since=` delta endpoint: values written and keys deleted after `since`.
+
+    Falls back to a full snapshot with reset=True when the client's version is
+    from another epoch or no longer covered by `versions`.
+    """
+    # One read of the changed values (not one per key), so on SQLite the
+    # store lock is held for a single query.
+    with store.lock:
+        delta = versions.changed_since(since) if epoch in (None, versions.epoch) else None
+        if delta is None:
+            changed, deleted, reset = store.values(), [], True
+        else:
+            (written, deleted), reset = delta, False
+            changed = store.get_many(written)
+        return {
+            "epoch": versions.epoch, "sequence": versions.version, "reset": reset,
+            "changed": changed, "deleted": deleted,
+        }
+
+
+_repositories: Dict[str, Repository] = {}
+
+
+def create_repository(name: str, model, index_fields: Iterable[str] = (), backend: str = None) -> Repository:
+    backend = backend or STORAGE_BACKEND
+    if backend == "memory":
+        repository = InMemoryRepository(name, model, index_fields)
+    elif backend == "sqlite":
+        repository = SQLiteRepository(name, model, index_fields, path=STORAGE_PATH)
+    else:
+        raise ValueError(f"Unknown storage backend: {backend}")
+    _repositories[name] = repository
+    return repository
+
+
+def registered_repositories() -> Dict[str, Repository]:
+    return dict(_repositories)
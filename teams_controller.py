@@ -1,10 +1,20 @@
-from fastapi import APIRouter, HTTPException, Depends, status
-from models import Team, User
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, status
+from typing import Callable, List
+from pydantic import BaseModel
+from models import (
+    BulkImportResult, Driver, DriverUpdate, Engineer, EngineerUpdate, InventoryItem, InventoryItemUpdate,
+    Sponsor, SponsorUpdate, Team, TeamMember, User
+)
 from dependencies import get_current_user, db_teams
+from profiling import ProfiledRoute, profiling_gate
+from ndjson import import_ndjson
+from fast_json import trusted_response
 
 router = APIRouter(
     prefix="/teams",
-    tags=["Teams"]
+    tags=["Teams"],
+    route_class=ProfiledRoute,
+    dependencies=[Depends(profiling_gate)]
 )
 
 @router.post("/", response_model=Team)
@@ -12,9 +22,102 @@ def create_team(team: Team, current_user: User = Depends(get_current_user)):
     db_teams[team.teamID] = team
     return team
 
+@router.post("/bulk", response_model=BulkImportResult)
+async def bulk_import_teams(request: Request, current_user: User = Depends(get_current_user)):
+    def insert_batch(rows):
+        db_teams.put_many((team.teamID, team) for _, team in rows)
+        return []
+
+    return await import_ndjson(request.stream(), Team, insert_batch)
+
 @router.get("/{team_id}", response_model=Team)
 def get_team(team_id: int, current_user: User = Depends(get_current_user)):
     team = db_teams.get(team_id)
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
-    return team
\ No newline at end of file
+    return trusted_response(team)
+
+def _get_team(team_id: int) -> Team:
+    team = db_teams.get(team_id)
+    if not team:
+        raise HTTPException(status_code=404, detail="Team not found")
+    return team
+
+def _apply_to_collection(team_id: int, attr: str, change: Callable[[list], object]):
+    """Apply `change` to a copy of one Team list and store a shallow copy of the team.
+
+    The stored Team is never mutated in place, so store indexes still see the old state on removal.
+    Retries if another request replaced the team in between, so concurrent updates are not lost.
+    """
+    while True:
+        team = _get_team(team_id)
+        items = list(getattr(team, attr) or [])
+        result = change(items)
+        if db_teams.compare_and_set(team_id, team, team.model_copy(update={attr: items})):
+            return result
+
+def _position(items: List[BaseModel], id_field: str, element_id: int, label: str) -> int:
+    for i, item in enumerate(items):
+        if getattr(item, id_field) == element_id:
+            return i
+    raise HTTPException(status_code=404, detail=f"{label} not found")
+
+def _register_collection(path: str, attr: str, model, update_model, id_field: str, label: str):
+    def upsert_element(team_id: int, element: model, current_user: User = Depends(get_current_user)):
+        def change(items):
+            element_id = getattr(element, id_field)
+            for i, item in enumerate(items):
+                if getattr(item, id_field) == element_id:
+                    items[i] = element
+                    return element
+            items.append(element)
+            return element
+        return _apply_to_collection(team_id, attr, change)
+
+    def patch_element(
+        team_id: int, element_id: int, delta: update_model, current_user: User = Depends(get_current_user)
+    ):
+        def change(items):
+            i = _position(items, id_field, element_id, label)
+            items[i] = items[i].model_copy(update=delta.model_dump(exclude_unset=True, exclude_none=True))
+            return items[i]
+        return _apply_to_collection(team_id, attr, change)
+
+    def delete_element(team_id: int, element_id: int, current_user: User = Depends(get_current_user)):
+        _apply_to_collection(team_id, attr, lambda items: items.pop(_position(items, id_field, element_id, label)))
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+    router.add_api_route(
+        f"/{{team_id}}/{path}", upsert_element, methods=["POST"], response_model=model,
+        name=f"upsert_team_{path}",
+    )
+    router.add_api_route(
+        f"/{{team_id}}/{path}/{{element_id}}", patch_element, methods=["PATCH"], response_model=model,
+        name=f"patch_team_{path}",
+    )
+    router.add_api_route(
+        f"/{{team_id}}/{path}/{{element_id}}", delete_element, methods=["DELETE"],
+        status_code=status.HTTP_204_NO_CONTENT, name=f"delete_team_{path}",
+    )
+
+_register_collection("drivers", "drivers", Driver, DriverUpdate, "driverID", "Driver")
+_register_collection("engineers", "engineers", Engineer, EngineerUpdate, "engineerID", "Engineer")
+_register_collection("sponsors", "sponsors", Sponsor, SponsorUpdate, "sponsorID", "Sponsor")
+_register_collection("inventory", "inventory", InventoryItem, InventoryItemUpdate, "itemID", "Inventory item")
+
+@router.post("/{team_id}/members", response_model=List[str])
+def add_team_member(team_id: int, member: TeamMember, current_user: User = Depends(get_current_user)):
+    def change(members):
+        if member.name not in members:
+            members.append(member.name)
+        return list(members)
+    return _apply_to_collection(team_id, "members", change)
+
+@router.delete("/{team_id}/members/{name}", status_code=status.HTTP_204_NO_CONTENT)
+def remove_team_member(team_id: int, name: str, current_user: User = Depends(get_current_user)):
+    def change(members):
+        if name not in members:
+            raise HTTPException(status_code=404, detail="Member not found")
+        members.remove(name)
+    _apply_to_collection(team_id, "members", change)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,140 @@
+import math
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Tuple
+
+TELEMETRY_BUFFER_SIZE = int(os.getenv("TELEMETRY_BUFFER_SIZE", 4096))
+
+FIELDS = ("timestamp", "speed", "rpm", "temperature")
+RPM_MIN, RPM_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+class _Chronological:
+    """Read-only view of a ring column in insertion order, for bisect."""
+
+    def __init__(self, column: array, start: int, count: int):
+        self.column = column
+        self.start = start
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        return self.column[(self.start + i) % len(self.column)]
+
+
+class TelemetryRing:
+    """Fixed-size columnar ring buffer of telemetry samples for one driver.
+
+    Samples are stored in preallocated typed arrays, so appending never
+    allocates. Time-window queries assume samples arrive in timestamp order.
+    """
+
+    def __init__(self, capacity: int = TELEMETRY_BUFFER_SIZE):
+        self.capacity = capacity
+        self.timestamp = array("d", [0.0]) * capacity
+        self.speed = array("d", [0.0]) * capacity
+        self.rpm = array("q", [0]) * capacity
+        self.temperature = array("d", [0.0]) * capacity
+        self.head = 0
+        self.count = 0
+        self.total = 0
+        self.lock = threading.Lock()
+
+    def append(self, timestamp: float, speed: float, rpm: int, temperature: float) -> None:
+        with self.lock:
+            i = self.head
+            self.timestamp[i] = timestamp
+            self.speed[i] = speed
+            self.rpm[i] = rpm
+            self.temperature[i] = temperature
+            self.head = (i + 1) % self.capacity
+            if self.count < self.capacity:
+                self.count += 1
+            self.total += 1
+
+    def _start(self) -> int:
+        return (self.head - self.count) % self.capacity
+
+    def _slice(self, first: int, last: int) -> Dict[str, List]:
+        """Columns for chronological positions [first, last)."""
+        start = self._start()
+        positions = [(start + i) % self.capacity for i in range(first, last)]
+        return {field: [getattr(self, field)[p] for p in positions] for field in FIELDS}
+
+    def latest(self, n: int) -> Dict[str, List]:
+        with self.lock:
+            n = max(0, min(n, self.count))
+            return self._slice(self.count - n, self.count)
+
+    def window(self, since: Optional[float] = None, until: Optional[float] = None) -> Dict[str, List]:
+        with self.lock:
+            times = _Chronological(self.timestamp, self._start(), self.count)
+            first = 0 if since is None else bisect_left(times, since)
+            last = self.count if until is None else bisect_right(times, until)
+            return self._slice(first, max(first, last))
+
+    def last(self) -> Optional[Tuple[float, float, int, float]]:
+        with self.lock:
+            if not self.count:
+                return None
+            i = (self.head - 1) % self.capacity
+            return (self.timestamp[i], self.speed[i], self.rpm[i], self.temperature[i])
+
+
+class TelemetryHub:
+    """driverID -> TelemetryRing, created on first sample."""
+
+    def __init__(self, capacity: int = TELEMETRY_BUFFER_SIZE):
+        self.capacity = capacity
+        self._rings: Dict[int, TelemetryRing] = {}
+        self._lock = threading.Lock()
+
+    def ring(self, driver_id: int) -> TelemetryRing:
+        ring = self._rings.get(driver_id)
+        if ring is None:
+            with self._lock:
+                ring = self._rings.setdefault(driver_id, TelemetryRing(self.capacity))
+        return ring
+
+    def get(self, driver_id: int) -> Optional[TelemetryRing]:
+        return self._rings.get(driver_id)
+
+    def ingest(self, sample: dict) -> None:
+        """Append one decoded JSON sample; raises KeyError/TypeError/ValueError if malformed.
+
+        Every field is converted and checked before the driver's ring is looked
+        up, so a rejected sample never allocates a ring.
+        """
+        timestamp = sample.get("ts")
+        try:
+            driver_id = int(sample["driverID"])
+            rpm = int(sample["rpm"])
+        except OverflowError as exc:  # int() of an infinite float
+            raise ValueError(str(exc)) from exc
+        # The rpm column is a signed 64-bit array.
+        if not RPM_MIN <= rpm <= RPM_MAX:
+            raise ValueError(f"rpm out of range: {rpm}")
+        values = (
+            time.time() if timestamp is None else float(timestamp),
+            float(sample["speed"]),
+            float(sample["temperature"]),
+        )
+        if not all(math.isfinite(value) for value in values):
+            raise ValueError("ts, speed and temperature must be finite")
+        timestamp, speed, temperature = values
+        self.ring(driver_id).append(timestamp, speed, rpm, temperature)
+
+    def drivers(self) -> List[int]:
+        return sorted(self._rings)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._rings.clear()
+
+
+telemetry_hub = TelemetryHub()
@@ -0,0 +1,77 @@
+from fastapi import APIRouter, HTTPException, Depends, Request, WebSocket, WebSocketDisconnect, status
+from typing import Optional
+import json
+from models import TelemetryIngestResult, TelemetrySeries, User
+from dependencies import authenticate_token, get_current_user
+from profiling import ProfiledRoute, profiling_gate
+from ndjson import iter_ndjson_lines
+from fast_json import plain_response
+from telemetry import telemetry_hub
+
+# No router-level profiling_gate: it would also apply to the WebSocket route.
+router = APIRouter(
+    prefix="/telemetry",
+    tags=["Telemetry"],
+    route_class=ProfiledRoute
+)
+
+MAX_REPORTED_ERRORS = 20
+
+class _IngestCounter:
+    def __init__(self):
+        self.accepted = 0
+        self.rejected = 0
+        self.errors = []
+
+    def feed(self, line_no: int, line) -> None:
+        try:
+            telemetry_hub.ingest(json.loads(line))
+            self.accepted += 1
+        except (ValueError, KeyError, TypeError, AttributeError) as exc:
+            self.rejected += 1
+            if len(self.errors) < MAX_REPORTED_ERRORS:
+                self.errors.append(f"line {line_no}: {exc!r}")
+
+    def result(self) -> TelemetryIngestResult:
+        return TelemetryIngestResult(accepted=self.accepted, rejected=self.rejected, errors=self.errors)
+
+@router.post("/ingest", response_model=TelemetryIngestResult, dependencies=[Depends(profiling_gate)])
+async def ingest_telemetry(request: Request, current_user: User = Depends(get_current_user)):
+    counter = _IngestCounter()
+    async for line_no, line in iter_ndjson_lines(request.stream()):
+        counter.feed(line_no, line)
+    return counter.result()
+
+@router.websocket("/ws")
+async def telemetry_websocket(websocket: WebSocket, token: str):
+    if authenticate_token(token) is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+    try:
+        while True:
+            message = await websocket.receive_text()
+            counter = _IngestCounter()
+            for line_no, line in enumerate(message.splitlines(), start=1):
+                if line.strip():
+                    counter.feed(line_no, line)
+            await websocket.send_json({"accepted": counter.accepted, "rejected": counter.rejected})
+    except WebSocketDisconnect:
+        pass
+
+@router.get("/{driver_id}", response_model=TelemetrySeries, dependencies=[Depends(profiling_gate)])
+def get_telemetry(
+    driver_id: int,
+    last: Optional[int] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    current_user: User = Depends(get_current_user),
+):
+    ring = telemetry_hub.get(driver_id)
+    if ring is None:
+        raise HTTPException(status_code=404, detail="No telemetry for this driver")
+    if since is not None or until is not None:
+        columns = ring.window(since, until)
+    else:
+        columns = ring.latest(last if last is not None else ring.capacity)
+    return plain_response({"driverID": driver_id, **columns})
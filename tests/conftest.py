@@ -7,6 +7,7 @@ from dependencies import (
 )
 from engineer_management import db_engineer_schedules
 from report_system import db_race_reports
+from telemetry import telemetry_hub
 
 @pytest.fixture(scope="module")
 def client():
@@ -21,6 +22,7 @@ def reset_db():
     db_driver_performance.clear()
     db_engineer_schedules.clear()
     db_race_reports.clear()
+    telemetry_hub.clear()
     
     users_db.clear()
     users_db["jbenham"] = {
@@ -0,0 +1,86 @@
+import json
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from api_client import ApiClient
+
+
+class RecordingAdapter(BaseAdapter):
+    """Answers every request locally with a JSON body naming the call count."""
+
+    def __init__(self, status_code=200):
+        super().__init__()
+        self.calls = []
+        self.status_code = status_code
+        self.on_send = None
+
+    def send(self, request, **kwargs):
+        self.calls.append((request.method, request.url, kwargs.get("timeout")))
+        if self.on_send is not None:
+            self.on_send()
+        response = requests.Response()
+        response.status_code = self.status_code
+        response._content = json.dumps({"call": len(self.calls)}).encode()
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def api():
+    client = ApiClient("http://backend", cache_ttl=60)
+    adapter = RecordingAdapter()
+    client.session.mount("http://", adapter)
+    client.adapter = adapter
+    yield client
+    client.close()
+
+
+def test_get_is_cached_per_token_and_params(api):
+    assert api.request("GET", "/teams/1", token="a").json() == {"call": 1}
+    assert api.request("GET", "/teams/1", token="a").json() == {"call": 1}
+    assert api.request("GET", "/teams/1", token="b").json() == {"call": 2}
+    assert api.request("GET", "/engineer_management/schedules/", token="a", params={"race_id": 1}).json() == {"call": 3}
+    assert api.request("GET", "/engineer_management/schedules/", token="a", params={"race_id": 2}).json() == {"call": 4}
+    assert api.request("GET", "/teams/1", token="a", cached=False).json() == {"call": 5}
+    assert api.adapter.calls[0][2] == api.timeout
+
+
+def test_write_invalidates_resource_and_dependents(api):
+    api.request("GET", "/teams/1", token="a")
+    api.request("GET", "/inventory/", token="a")
+    api.request("GET", "/engineer_management/schedules/", token="a")
+
+    api.request("PATCH", "/teams/1/inventory/3", token="a", data={"quantity": 1})
+
+    assert api.request("GET", "/teams/1", token="a").json() == {"call": 5}
+    assert api.request("GET", "/inventory/", token="a").json() == {"call": 6}
+    assert api.request("GET", "/engineer_management/schedules/", token="a").json() == {"call": 3}
+
+
+@pytest.mark.parametrize("write", ["/teams/", "/race_strategy/1"])
+def test_report_reads_invalidated_by_their_inputs(api, write):
+    api.request("GET", "/report_system/race/1", token="a")
+    api.request("PUT", write, token="a", data={})
+
+    assert api.request("GET", "/report_system/race/1", token="a").json() == {"call": 3}
+
+
+def test_errors_are_not_cached(api):
+    api.adapter.status_code = 404
+    api.request("GET", "/teams/9", token="a")
+    api.request("GET", "/teams/9", token="a")
+    assert len(api.adapter.calls) == 2
+
+
+def test_get_racing_a_write_is_not_cached(api):
+    api.adapter.on_send = lambda: api.invalidate("/teams/1")
+    api.request("GET", "/teams/1", token="a")
+    api.adapter.on_send = None
+
+    assert api.request("GET", "/teams/1", token="a").json() == {"call": 2}
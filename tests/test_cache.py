@@ -0,0 +1,53 @@
+import cache as cache_module
+from cache import LRUCache, TTLCache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats() == {"size": 2, "maxsize": 2, "hits": 3, "misses": 1, "hitRate": 0.75}
+
+
+def test_lru_cache_pop_and_clear():
+    cache = LRUCache()
+    cache.set("a", 1)
+    assert cache.pop("a") == 1
+    assert cache.pop("a", "gone") == "gone"
+    cache.set("b", 2)
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats()["hitRate"] == 0.0
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2, expires_at=1010.0)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") == 2
+    now[0] = 1010.0
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    now[0] = 1060.0
+    assert cache.get("a") is None
+    assert cache.stats()["misses"] == 2
+    assert len(cache) == 0
+
+
+def test_discard_if_drops_matching_keys():
+    cache = LRUCache()
+    for key in [("teams", 1), ("teams", 2), ("reports", 1)]:
+        cache.set(key, key)
+    assert cache.discard_if(lambda key: key[0] == "teams") == 2
+    assert len(cache) == 1
+    assert cache.get(("reports", 1)) == ("reports", 1)
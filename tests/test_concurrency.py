@@ -0,0 +1,167 @@
+import json
+import sys
+import threading
+import time
+
+import pytest
+
+from dependencies import db_teams, inventory_index
+from engineer_management import db_engineer_schedules, schedules_by_engineer, schedules_by_id
+from models import EngineerSchedule, RaceReport, Team
+from report_system import db_race_reports
+from storage import SQLiteRepository
+
+THREADS = 16
+# A run that takes longer than this is treated as deadlocked.
+DEADLOCK_SECONDS = 60
+
+STORES = [
+    (db_engineer_schedules, EngineerSchedule, ("engineerID", "raceID", "date")),
+    (db_teams, Team, ()),
+    (db_race_reports, RaceReport, ("raceID",)),
+]
+
+
+@pytest.fixture(autouse=True, params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    """Run every stress test against both backends; SQLite adds its shared connection lock to the mix."""
+    if request.param == "memory":
+        yield request.param
+        return
+    originals = [(store, store.repository) for store, _, _ in STORES]
+    path = str(tmp_path / "stress.sqlite3")
+    for store, model, fields in STORES:
+        store.repository = SQLiteRepository(store.name, model, fields, path=path)
+        store.clear()
+    yield request.param
+    for store, repository in originals:
+        store.repository = repository
+        store.clear()
+
+
+@pytest.fixture(autouse=True)
+def frequent_thread_switches():
+    """Make the interpreter switch threads often so unguarded check-then-act sequences interleave."""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def hammer(fn, jobs):
+    """fn over jobs on THREADS daemon threads; fails, rather than hangs, if they deadlock."""
+    jobs = list(enumerate(jobs))
+    results, errors = [None] * len(jobs), []
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with lock:
+                if not jobs or errors:
+                    return
+                i, job = jobs.pop()
+            try:
+                results[i] = fn(job)
+            except BaseException as exc:
+                errors.append(exc)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + DEADLOCK_SECONDS
+    for thread in threads:
+        thread.join(max(0.0, deadline - time.monotonic()))
+    assert not any(thread.is_alive() for thread in threads), "worker threads deadlocked"
+    if errors:
+        raise errors[0]
+    return results
+
+
+def schedule(engineer_id, start="09:00:00", end="10:00:00"):
+    return {
+        "engineerID": engineer_id, "taskDescription": "Task", "date": "2025-10-10",
+        "startTime": start, "endTime": end, "location": "Garage", "raceID": 1,
+    }
+
+
+def test_concurrent_schedule_creation_allocates_unique_ids(client, auth_headers):
+    def create(i):
+        return client.post("/engineer_management/schedules/", json=schedule(i), headers=auth_headers)
+
+    responses = hammer(create, range(400))
+
+    assert {r.status_code for r in responses} == {201}
+    ids = [r.json()["scheduleID"] for r in responses]
+    assert len(set(ids)) == 400
+    assert len(db_engineer_schedules) == 400
+    assert schedules_by_id.range() == sorted(ids)
+    assert all(schedules_by_engineer.lookup(i) for i in range(400))
+
+
+def test_concurrent_bulk_and_single_schedule_creates(client, auth_headers):
+    def bulk(i):
+        body = "\n".join(json.dumps(schedule(10_000 + 50 * i + n)) for n in range(50))
+        return client.post("/engineer_management/schedules/bulk", content=body, headers=auth_headers)
+
+    def single(i):
+        return client.post("/engineer_management/schedules/", json=schedule(i), headers=auth_headers)
+
+    responses = hammer(lambda i: bulk(i) if i % 4 == 0 else single(i), range(120))
+
+    assert {r.status_code for r in responses} <= {200, 201}
+    assert all(r.json()["inserted"] == 50 for r in responses if r.status_code == 200)
+    assert len(db_engineer_schedules) == 30 * 50 + 90
+    assert schedules_by_id.range() == sorted(db_engineer_schedules)
+    assert all(schedules_by_engineer.lookup(10_000 + 50 * i) for i in range(0, 120, 4))
+
+
+def test_concurrent_overlapping_schedules_admit_exactly_one(client, auth_headers):
+    def create(i):
+        return client.post("/engineer_management/schedules/", json=schedule(7, "09:00:00", f"10:{i:02d}:00"),
+                           headers=auth_headers).status_code
+
+    codes = hammer(create, range(48))
+
+    assert codes.count(201) == 1
+    assert codes.count(409) == 47
+    assert len(db_engineer_schedules) == 1
+
+
+def test_concurrent_team_updates_are_not_lost(client, auth_headers):
+    client.post("/teams/", json={"teamID": 1, "name": "Ferrari"}, headers=auth_headers)
+
+    def add_item(i):
+        item = {"itemID": i, "partName": "Front Wing", "quantity": 1, "status": "Ready"}
+        return client.post("/teams/1/inventory", json=item, headers=auth_headers).status_code
+
+    def add_member(i):
+        return client.post("/teams/1/members", json={"name": f"Member {i}"}, headers=auth_headers).status_code
+
+    codes = hammer(lambda i: add_item(i) if i % 2 else add_member(i), range(300))
+
+    assert set(codes) == {200}
+    team = client.get("/teams/1", headers=auth_headers).json()
+    assert sorted(item["itemID"] for item in team["inventory"]) == list(range(1, 300, 2))
+    assert len(team["members"]) == 150
+    assert inventory_index.total("Front Wing", "Ready") == 150
+
+
+def test_concurrent_report_generation_one_report_per_race(client, auth_headers):
+    for race_id in range(1, 6):
+        client.post("/race_strategy/", json={
+            "race": {"raceID": race_id, "circuitName": "Monza", "date": "2025-09-07", "weather": "Sunny",
+                     "result": ["P1: Charles Leclerc (Ferrari)"]},
+            "strategyPlan": {"pitStopSchedule": [], "tyreStrategy": [], "fuelPlan": ""},
+            "liveTelemetry": {"speed": 0, "rpm": 0, "temperature": 0},
+        }, headers=auth_headers)
+
+    def generate(i):
+        return client.post(f"/report_system/generate/{i % 5 + 1}", headers=auth_headers)
+
+    responses = hammer(generate, range(100))
+
+    created = [r.json() for r in responses if r.status_code == 201]
+    assert {r.status_code for r in responses} <= {201, 400}
+    assert len(db_race_reports) == 5
+    assert len({report["reportID"] for report in created}) == 5
+    assert sorted({report["raceID"] for report in created}) == [1, 2, 3, 4, 5]
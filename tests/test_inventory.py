@@ -0,0 +1,30 @@
+from inventory import InventoryIndex
+from models import InventoryItem, Team
+from storage import IndexedStore, InMemoryRepository
+
+
+def make_team(team_id, *items):
+    return Team(teamID=team_id, name=f"Team {team_id}", inventory=[
+        InventoryItem(itemID=i, partName=part, quantity=quantity, status=status)
+        for i, (part, quantity, status) in enumerate(items)
+    ])
+
+
+def test_inventory_index_aggregates_incrementally():
+    index = InventoryIndex()
+    store = IndexedStore(InMemoryRepository("teams", Team), indexes=[index])
+
+    store[1] = make_team(1, ("Tyre", 8, "Ready"), ("Tyre", 2, "Ready"), ("Tyre", 0, "Damaged"))
+    store[2] = make_team(2, ("Tyre", 5, "Ready"))
+    assert index.total("Tyre") == 15
+    assert index.breakdown("Tyre", "Ready") == {1: 10, 2: 5}
+    assert index.team_count("Tyre", "Damaged") == 1
+    assert index.below(0) == [(0, "Tyre", "Damaged")]
+
+    store[1] = make_team(1, ("Tyre", 1, "Ready"))
+    assert index.parts() == [("Tyre", "Ready")]
+    assert index.below(10) == [(6, "Tyre", "Ready")]
+
+    del store[2]
+    del store[1]
+    assert index.parts() == [] and index.below(100) == [] and index.statuses("Tyre") == []
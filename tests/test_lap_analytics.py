@@ -0,0 +1,43 @@
+from array import array
+
+import numpy as np
+import pytest
+
+from lap_analytics import analyze_laps, packed_to_ms, rolling_mean, slope, stint_bounds
+
+
+def test_rolling_mean_and_slope():
+    ms = np.array([100, 102, 104, 106], dtype=np.int64)
+    assert rolling_mean(ms, 2).tolist() == [101.0, 103.0, 105.0]
+    assert rolling_mean(ms, 5).tolist() == []
+    assert slope(ms) == pytest.approx(2.0)
+    assert slope(ms[:1]) == 0.0
+
+
+def test_stint_bounds_ignores_out_of_range_pit_laps():
+    assert stint_bounds(10, [3, 7, 7, 10, 0]) == [(0, 3), (3, 7), (7, 10)]
+    assert stint_bounds(5, []) == [(0, 5)]
+
+
+def test_analyze_laps_summary():
+    ms = np.array([91000, 90000, 90500, 95000, 89000, 89500], dtype=np.int64)
+    result = analyze_laps(ms, window=3, pit_laps=[3])
+
+    assert result["bestLapMs"] == 89000
+    assert result["bestLapNumber"] == 5
+    assert result["medianLapMs"] == 90250.0
+    assert len(result["rollingPaceMs"]) == 4
+    assert [(s["startLap"], s["endLap"]) for s in result["stints"]] == [(1, 3), (4, 6)]
+    assert result["stints"][1]["bestLapMs"] == 89000
+
+
+def test_packed_to_ms_is_a_view():
+    packed = array("I", [91000, 90000, 90500, 95000, 89000, 89500])
+    ms = packed_to_ms(packed)
+    assert np.shares_memory(ms, np.frombuffer(packed, dtype=np.uint32))
+    assert analyze_laps(ms, window=3, pit_laps=[3]) == analyze_laps(ms.astype(np.int64), window=3, pit_laps=[3])
+
+
+def test_analyze_no_laps():
+    result = analyze_laps(np.empty(0, dtype=np.int64))
+    assert result["laps"] == 0 and result["bestLapMs"] is None and result["stints"] == []
@@ -247,3 +247,812 @@ def test_get_driver_performance_not_found(client, auth_headers):
     res = client.get("/driver_performance/999", headers=auth_headers)
     assert res.status_code == 404
 
+
+def test_get_schedules_with_filters(client, auth_headers):
+    rows = [
+        (101, "2025-10-10", "Garage", 1),
+        (102, "2025-10-11", "Pit Lane", 1),
+        (101, "2025-10-12", "Garage", 2),
+        (103, "2025-10-20", "Garage", 2),
+    ]
+    for eng_id, day, loc, race in rows:
+        client.post("/engineer_management/schedules/", json={
+            "engineerID": eng_id, "taskDescription": "Task", "date": day,
+            "startTime": "09:00:00", "endTime": "10:00:00", "location": loc, "raceID": race
+        }, headers=auth_headers)
+
+    res = client.get("/engineer_management/schedules/?race_id=1", headers=auth_headers)
+    assert [s["engineerID"] for s in res.json()] == [101, 102]
+
+    res = client.get("/engineer_management/schedules/?from=2025-10-11&to=2025-10-12", headers=auth_headers)
+    assert [s["date"] for s in res.json()] == ["2025-10-11", "2025-10-12"]
+
+    res = client.get("/engineer_management/schedules/?location=Garage&race_id=2&from=2025-10-15", headers=auth_headers)
+    assert [s["engineerID"] for s in res.json()] == [103]
+
+    res = client.get("/engineer_management/schedules/?race_id=99", headers=auth_headers)
+    assert res.json() == []
+
+def test_schedule_indexes_follow_updates(client, auth_headers):
+    payload = {
+        "engineerID": 101, "taskDescription": "Task", "date": "2025-10-10",
+        "startTime": "09:00:00", "endTime": "10:00:00", "location": "Garage", "raceID": 1
+    }
+    sch_id = client.post("/engineer_management/schedules/", json=payload, headers=auth_headers).json()["scheduleID"]
+
+    payload.update({"engineerID": 102, "raceID": 2})
+    client.put(f"/engineer_management/schedules/{sch_id}", json=payload, headers=auth_headers)
+
+    assert client.get("/engineer_management/schedules/engineer/101", headers=auth_headers).json() == []
+    assert len(client.get("/engineer_management/schedules/engineer/102", headers=auth_headers).json()) == 1
+    assert client.get("/engineer_management/schedules/?race_id=1", headers=auth_headers).json() == []
+
+def _schedule(eng_id, start, end, race_id=1, day="2025-10-10"):
+    return {
+        "engineerID": eng_id, "taskDescription": "Task", "date": day,
+        "startTime": start, "endTime": end, "location": "Garage", "raceID": race_id
+    }
+
+def test_create_overlapping_schedule_rejected(client, auth_headers):
+    url = "/engineer_management/schedules/"
+    assert client.post(url, json=_schedule(101, "09:00:00", "10:00:00"), headers=auth_headers).status_code == 201
+    assert client.post(url, json=_schedule(101, "10:00:00", "11:00:00"), headers=auth_headers).status_code == 201
+
+    response = client.post(url, json=_schedule(101, "09:30:00", "10:30:00"), headers=auth_headers)
+    assert response.status_code == 409
+    assert "bentrok" in response.json()["detail"]
+
+    other_day = _schedule(101, "09:30:00", "10:30:00", day="2025-10-11")
+    assert client.post(url, json=other_day, headers=auth_headers).status_code == 201
+
+    forced = client.post(f"{url}?allow_overlap=true", json=_schedule(101, "09:30:00", "10:30:00"), headers=auth_headers)
+    assert forced.status_code == 201
+
+def test_update_overlapping_schedule_rejected(client, auth_headers):
+    url = "/engineer_management/schedules/"
+    client.post(url, json=_schedule(101, "09:00:00", "10:00:00"), headers=auth_headers)
+    sch_id = client.post(url, json=_schedule(101, "11:00:00", "12:00:00"), headers=auth_headers).json()["scheduleID"]
+
+    response = client.put(f"{url}{sch_id}", json=_schedule(101, "09:45:00", "12:00:00"), headers=auth_headers)
+    assert response.status_code == 409
+
+    response = client.put(f"{url}{sch_id}", json=_schedule(101, "10:30:00", "12:30:00"), headers=auth_headers)
+    assert response.status_code == 200
+
+def test_schedule_conflicts_report(client, auth_headers):
+    url = "/engineer_management/schedules/?allow_overlap=true"
+    ids = [
+        client.post(url, json=body, headers=auth_headers).json()["scheduleID"]
+        for body in [
+            _schedule(101, "09:00:00", "12:00:00"),
+            _schedule(101, "10:00:00", "11:00:00"),
+            _schedule(101, "11:30:00", "13:00:00"),
+            _schedule(102, "09:00:00", "12:00:00"),
+            _schedule(101, "09:00:00", "12:00:00", race_id=2),
+        ]
+    ]
+
+    response = client.get("/engineer_management/schedules/conflicts?race_id=1", headers=auth_headers)
+    assert response.status_code == 200
+    pairs = [c["scheduleIDs"] for c in response.json()]
+    assert pairs == [[ids[0], ids[1]], [ids[0], ids[2]]]
+    assert all(c["engineerID"] == 101 for c in response.json())
+
+def test_report_team_analysis_uses_best_position(client, auth_headers):
+    client.post("/teams/", json={"teamID": 1, "name": "RedBull"}, headers=auth_headers)
+    client.post("/teams/", json={"teamID": 2, "name": "Ferrari"}, headers=auth_headers)
+    client.post("/teams/", json={"teamID": 3, "name": "Williams"}, headers=auth_headers)
+
+    race_payload = {
+        "race": {
+            "raceID": 51, "circuitName": "Monza", "date": "2025-09-07", "weather": "Sunny",
+            "result": ["P1: Max (RedBull)", "P2: Charles (Ferrari)", "P3: Lewis (Ferrari)", "P4: Yuki (RedBull)"]
+        },
+        "strategyPlan": {"pitStopSchedule": [], "tyreStrategy": [], "fuelPlan": ""},
+        "liveTelemetry": {"speed": 0, "rpm": 0, "temperature": 0}
+    }
+    client.post("/race_strategy/", json=race_payload, headers=auth_headers)
+    data = client.post("/report_system/generate/51", headers=auth_headers).json()
+
+    assert data["raceSummary"].startswith("Race Report: Max dari tim RedBull")
+    assert "P2 dicapai oleh Charles" in data["teamPerformanceAnalysis"]["Ferrari"]
+    assert "P1 dicapai oleh Max" in data["teamPerformanceAnalysis"]["RedBull"]
+    assert "tidak tercatat" in data["teamPerformanceAnalysis"]["Williams"]
+
+def test_report_winner_without_team(client, auth_headers):
+    client.post("/teams/", json={"teamID": 1, "name": "Ferrari"}, headers=auth_headers)
+    race_payload = {
+        "race": {
+            "raceID": 54, "circuitName": "Monaco", "date": "2025-05-25", "weather": "Sunny",
+            "result": ["P1: Lando", "P2: Charles (Ferrari)"]
+        },
+        "strategyPlan": {"pitStopSchedule": [], "tyreStrategy": [], "fuelPlan": ""},
+        "liveTelemetry": {"speed": 0, "rpm": 0, "temperature": 0}
+    }
+    client.post("/race_strategy/", json=race_payload, headers=auth_headers)
+    data = client.post("/report_system/generate/54", headers=auth_headers).json()
+    assert data["raceSummary"].startswith("Race Report: Lando memenangkan balapan di Monaco")
+    assert "P2 dicapai oleh Charles" in data["teamPerformanceAnalysis"]["Ferrari"]
+
+    race_payload["race"].update(raceID=55, result=["P1: Lando", "P2: Oscar"])
+    client.post("/race_strategy/", json=race_payload, headers=auth_headers)
+    res = client.post("/report_system/generate/55", headers=auth_headers)
+    assert res.status_code == 201
+    assert "belum memiliki hasil akhir" in res.json()["raceSummary"]
+
+def test_report_cache_serves_until_inputs_change(client, auth_headers):
+    client.post("/teams/", json={"teamID": 1, "name": "RedBull"}, headers=auth_headers)
+    race_payload = {
+        "race": {
+            "raceID": 52, "circuitName": "Suzuka", "date": "2025-04-06", "weather": "Sunny",
+            "result": ["P1: Max (RedBull)"]
+        },
+        "strategyPlan": {"pitStopSchedule": [], "tyreStrategy": [], "fuelPlan": ""},
+        "liveTelemetry": {"speed": 0, "rpm": 0, "temperature": 0}
+    }
+    client.post("/race_strategy/", json=race_payload, headers=auth_headers)
+    report = client.post("/report_system/generate/52", headers=auth_headers).json()
+    report_id = report["reportID"]
+
+    before = client.get("/report_system/cache/stats", headers=auth_headers).json()
+    cached = client.get(f"/report_system/{report_id}", headers=auth_headers).json()
+    after = client.get("/report_system/cache/stats", headers=auth_headers).json()
+    assert cached == report
+    assert after["hits"] == before["hits"] + 1
+
+    client.post("/teams/", json={"teamID": 2, "name": "Ferrari"}, headers=auth_headers)
+    refreshed = client.get(f"/report_system/{report_id}", headers=auth_headers).json()
+    assert refreshed["reportID"] == report_id
+    assert "Ferrari" in refreshed["teamPerformanceAnalysis"]
+    assert client.get("/report_system/cache/stats", headers=auth_headers).json()["misses"] == after["misses"] + 1
+
+    race_payload["race"]["result"] = ["P1: Charles (Ferrari)"]
+    client.post("/race_strategy/", json=race_payload, headers=auth_headers)
+    by_race = client.get("/report_system/race/52", headers=auth_headers).json()
+    assert by_race["reportID"] == report_id
+    assert "Charles" in by_race["raceSummary"]
+
+def test_report_cache_eviction_does_not_regenerate(client, auth_headers):
+    from report_system import report_cache
+    client.post("/teams/", json={"teamID": 1, "name": "RedBull"}, headers=auth_headers)
+    client.post("/race_strategy/", json={
+        "race": {"raceID": 53, "circuitName": "Imola", "date": "2025-05-18", "weather": "Rain",
+                 "result": ["P1: Max (RedBull)"]},
+        "strategyPlan": {"pitStopSchedule": [], "tyreStrategy": [], "fuelPlan": ""},
+        "liveTelemetry": {"speed": 0, "rpm": 0, "temperature": 0}
+    }, headers=auth_headers)
+    report = client.post("/report_system/generate/53", headers=auth_headers).json()
+    sequence = client.get("/report_system/changes", headers=auth_headers).json()["sequence"]
+
+    report_cache.clear()
+    assert client.get(f"/report_system/{report['reportID']}", headers=auth_headers).json() == report
+    assert client.get("/report_system/race/53", headers=auth_headers).json() == report
+    delta = client.get(f"/report_system/changes?since={sequence}", headers=auth_headers).json()
+    assert delta["changed"] == []
+
+def test_report_by_race_not_found(client, auth_headers):
+    assert client.get("/report_system/race/999", headers=auth_headers).status_code == 404
+
+def _wait_for_job(client, auth_headers, job_id):
+    import time
+    for _ in range(200):
+        job = client.get(f"/report_system/jobs/{job_id}", headers=auth_headers).json()
+        if job["status"] == "done":
+            return job
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+def test_batch_report_generation(client, auth_headers):
+    for race_id in (60, 61):
+        client.post("/race_strategy/", json={
+            "race": {"raceID": race_id, "circuitName": "Spa", "date": "2025-08-01", "weather": "Sunny",
+                     "result": ["P1: Max (RedBull)"]},
+            "strategyPlan": {"pitStopSchedule": [], "tyreStrategy": [], "fuelPlan": ""},
+            "liveTelemetry": {"speed": 0, "rpm": 0, "temperature": 0}
+        }, headers=auth_headers)
+    client.post("/report_system/generate/61", headers=auth_headers)
+
+    response = client.post("/report_system/generate/batch", json={"raceIDs": [60, 61, 999, 60]}, headers=auth_headers)
+    assert response.status_code == 202
+    assert response.json()["total"] == 3
+
+    job = _wait_for_job(client, auth_headers, response.json()["jobID"])
+    results = {r["raceID"]: r for r in job["results"]}
+    assert job["completed"] == 3
+    assert results[60]["status"] == "done"
+    assert results[61]["status"] == "failed" and "sudah ada" in results[61]["error"]
+    assert results[999]["status"] == "failed" and "tidak ditemukan" in results[999]["error"]
+
+    report = client.get(f"/report_system/{results[60]['reportID']}", headers=auth_headers).json()
+    assert report["raceID"] == 60
+
+def test_report_job_not_found(client, auth_headers):
+    assert client.get("/report_system/jobs/999999", headers=auth_headers).status_code == 404
+
+def test_concurrent_report_requests_coalesce():
+    from concurrent.futures import Future
+    from unittest.mock import patch
+    import report_system
+    from dependencies import db_race_strategies
+    from models import RaceStrategy
+
+    db_race_strategies[70] = RaceStrategy.model_validate({
+        "race": {"raceID": 70, "circuitName": "Spa", "date": "2025-08-01", "weather": "Sunny", "result": []},
+        "strategyPlan": {"pitStopSchedule": [], "tyreStrategy": [], "fuelPlan": ""},
+        "liveTelemetry": {"speed": 0, "rpm": 0, "temperature": 0}
+    })
+    pending = Future()
+    with patch.object(report_system.get_report_pool(), "submit", return_value=pending) as submit:
+        first = report_system.submit_report(70)
+        second = report_system.submit_report(70)
+    assert first is second
+    assert submit.call_count == 1
+
+    pending.set_result(report_system.simulate_report_generation(db_race_strategies[70].race, report_id=500))
+    assert first.result().reportID == 500
+    assert report_system.reports_by_race.lookup(70) == {500}
+
+def test_auth_cache_hits_and_user_invalidation(client, auth_headers):
+    from dependencies import users_db
+
+    client.get("/teams/1", headers=auth_headers)
+    before = client.get("/auth/cache/stats", headers=auth_headers).json()
+    client.get("/teams/1", headers=auth_headers)
+    after = client.get("/auth/cache/stats", headers=auth_headers).json()
+    assert after["tokens"]["hits"] >= before["tokens"]["hits"] + 2
+    assert after["users"]["hits"] >= before["users"]["hits"] + 2
+
+    del users_db["jbenham"]
+    response = client.get("/teams/1", headers=auth_headers)
+    assert response.status_code == 401
+
+def test_invalid_token_rejected(client):
+    response = client.get("/teams/1", headers={"Authorization": "Bearer not-a-jwt"})
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Could not validate credentials"
+
+def test_token_without_subject_rejected(client):
+    from auth import create_access_token
+    token = create_access_token(data={"role": "x"})
+    response = client.get("/teams/1", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 401
+
+def test_login_returns_503_when_hash_queue_times_out(client, monkeypatch):
+    import asyncio
+    import main
+
+    async def busy(*args):
+        raise asyncio.TimeoutError
+
+    monkeypatch.setattr(main, "verify_password_async", busy)
+    response = client.post("/token", data={"username": "jbenham", "password": "opmeersucks"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+def test_verify_password_async_caps_concurrency(monkeypatch):
+    import asyncio
+    import auth
+
+    hashed = auth.get_password_hash("secret")
+    monkeypatch.setattr(auth, "LOGIN_QUEUE_TIMEOUT", 0.05)
+
+    async def scenario():
+        assert await auth.verify_password_async("secret", hashed)
+        assert not await auth.verify_password_async("wrong", hashed)
+
+        slots = auth._slots_for_running_loop()
+        for _ in range(auth.LOGIN_HASH_CONCURRENCY):
+            await slots.acquire()
+        with pytest.raises(asyncio.TimeoutError):
+            await auth.verify_password_async("secret", hashed)
+
+    asyncio.run(scenario())
+
+def _driver_performance(driver_id, lap_ms):
+    return {
+        "driver": {"driverID": driver_id, "name": f"D{driver_id}", "driverAbb": "DRV",
+                   "nationality": "UK", "physicalCondition": "Fit"},
+        "lapTimes": [{"minutes": ms // 60000, "seconds": ms // 1000 % 60, "milliseconds": ms % 1000} for ms in lap_ms],
+        "liveTelemetry": {"speed": 0, "rpm": 0, "temperature": 0}
+    }
+
+def test_driver_analytics(client, auth_headers):
+    client.post("/driver_performance/", json=_driver_performance(1, [90500, 90000, 91000, 92000]), headers=auth_headers)
+
+    res = client.get("/driver_performance/1/analytics?window=2&pit_laps=2", headers=auth_headers)
+    assert res.status_code == 200
+    data = res.json()
+    assert data["bestLapMs"] == 90000
+    assert data["rollingPaceMs"] == [90250.0, 90500.0, 91500.0]
+    assert len(data["stints"]) == 2
+
+    assert client.get("/driver_performance/999/analytics", headers=auth_headers).status_code == 404
+
+def test_compare_driver_analytics(client, auth_headers):
+    client.post("/driver_performance/", json=_driver_performance(1, [90500, 90000]), headers=auth_headers)
+    client.post("/driver_performance/", json=_driver_performance(44, [89000, 89500]), headers=auth_headers)
+
+    res = client.get("/driver_performance/analytics/compare?driver_ids=1&driver_ids=44", headers=auth_headers)
+    assert res.status_code == 200
+    assert [d["bestLapMs"] for d in res.json()] == [90000, 89000]
+
+def test_driver_performance_compact_mode(client, auth_headers):
+    client.post("/driver_performance/", json=_driver_performance(1, [90500, 61001]), headers=auth_headers)
+
+    full = client.get("/driver_performance/1", headers=auth_headers).json()
+    assert full["lapTimes"] == [
+        {"minutes": 1, "seconds": 30, "milliseconds": 500},
+        {"minutes": 1, "seconds": 1, "milliseconds": 1},
+    ]
+
+    compact = client.get("/driver_performance/1?compact=true", headers=auth_headers).json()
+    assert compact["lapTimesMs"] == [90500, 61001]
+    assert compact["driver"]["driverID"] == 1
+
+def test_create_driver_performance_compact(client, auth_headers):
+    payload = _driver_performance(7, [])
+    del payload["lapTimes"]
+    payload["lapTimesMs"] = [88000, 87500]
+    assert client.post("/driver_performance/compact", json=payload, headers=auth_headers).status_code == 200
+
+    data = client.get("/driver_performance/7", headers=auth_headers).json()
+    assert data["lapTimes"][1] == {"minutes": 1, "seconds": 27, "milliseconds": 500}
+
+    payload["lapTimesMs"] = [-1]
+    assert client.post("/driver_performance/compact", json=payload, headers=auth_headers).status_code == 422
+
+def test_negative_lap_time_rejected(client, auth_headers):
+    payload = _driver_performance(8, [])
+    payload["lapTimes"] = [{"minutes": 0, "seconds": -5, "milliseconds": 0}]
+    assert client.post("/driver_performance/", json=payload, headers=auth_headers).status_code == 422
+
+def test_out_of_range_lap_components_rejected(client, auth_headers):
+    payload = _driver_performance(9, [])
+    for lap in ({"minutes": 2, "seconds": -30, "milliseconds": 0},
+                {"minutes": 1, "seconds": 95, "milliseconds": 0},
+                {"minutes": 1, "seconds": 30, "milliseconds": 1500},
+                {"minutes": -1, "seconds": 30, "milliseconds": 0}):
+        payload["lapTimes"] = [lap]
+        assert client.post("/driver_performance/", json=payload, headers=auth_headers).status_code == 422
+    assert client.get("/driver_performance/9", headers=auth_headers).status_code == 404
+
+def test_schedules_cursor_pagination(client, auth_headers):
+    url = "/engineer_management/schedules/"
+    for i in range(5):
+        client.post(url, json=_schedule(100 + i, "09:00:00", "10:00:00", race_id=1 + i % 2), headers=auth_headers)
+
+    first = client.get(f"{url}?limit=2", headers=auth_headers)
+    ids = [s["scheduleID"] for s in first.json()]
+    assert len(ids) == 2
+    cursor = first.headers["X-Next-Cursor"]
+    assert cursor == str(ids[-1])
+
+    second = client.get(f"{url}?limit=2&after={cursor}", headers=auth_headers)
+    third = client.get(f"{url}?limit=2&after={second.headers['X-Next-Cursor']}", headers=auth_headers)
+    all_ids = ids + [s["scheduleID"] for s in second.json()] + [s["scheduleID"] for s in third.json()]
+    assert len(all_ids) == 5 and all_ids == sorted(all_ids)
+    assert "X-Next-Cursor" not in third.headers
+
+    filtered = client.get(f"{url}?race_id=1&limit=2", headers=auth_headers).json()
+    assert [s["raceID"] for s in filtered] == [1, 1]
+
+def test_schedules_ndjson_stream(client, auth_headers):
+    import json
+    url = "/engineer_management/schedules/"
+    for i in range(3):
+        client.post(url, json=_schedule(100 + i, "09:00:00", "10:00:00", race_id=1 + i % 2), headers=auth_headers)
+
+    response = client.get("/engineer_management/schedules/stream", headers=auth_headers)
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["engineerID"] for r in rows] == [100, 101, 102]
+
+    response = client.get("/engineer_management/schedules/stream?race_id=2", headers=auth_headers)
+    assert len(response.text.splitlines()) == 1
+
+def test_bulk_import_teams(client, auth_headers):
+    import json
+    body = "\n".join([
+        json.dumps({"teamID": 1, "name": "Ferrari"}),
+        json.dumps({"teamID": 2, "name": "McLaren", "members": ["Norris"]}),
+        json.dumps({"teamID": "x", "name": "Broken"}),
+        "{not json",
+        "",
+        json.dumps({"teamID": 3, "name": "Williams"}),
+    ])
+    res = client.post("/teams/bulk", content=body, headers=auth_headers)
+    assert res.status_code == 200
+    data = res.json()
+    assert (data["received"], data["inserted"], data["failed"]) == (5, 3, 2)
+    assert [e["line"] for e in data["errors"]] == [3, 4]
+    assert "teamID" in data["errors"][0]["error"]
+    assert client.get("/teams/2", headers=auth_headers).json()["members"] == ["Norris"]
+
+def test_bulk_import_race_strategies(client, auth_headers):
+    import json
+    rows = [{
+        "race": {"raceID": race_id, "circuitName": "Spa", "date": "2025-08-01", "weather": "Sunny", "result": []},
+        "strategyPlan": {"pitStopSchedule": [], "tyreStrategy": [], "fuelPlan": ""},
+        "liveTelemetry": {"speed": 0, "rpm": 0, "temperature": 0}
+    } for race_id in (80, 81)]
+    res = client.post("/race_strategy/bulk", content="\n".join(json.dumps(r) for r in rows), headers=auth_headers)
+    assert res.json()["inserted"] == 2
+    assert client.get("/race_strategy/81", headers=auth_headers).status_code == 200
+
+def test_bulk_import_schedules(client, auth_headers, monkeypatch):
+    import json
+    import ndjson
+    monkeypatch.setattr(ndjson, "BULK_BATCH_SIZE", 2)
+    rows = [
+        _schedule(101, "09:00:00", "10:00:00"),
+        _schedule(101, "09:30:00", "10:30:00"),
+        _schedule(102, "11:00:00", "10:00:00"),
+        _schedule(103, "09:00:00", "10:00:00"),
+        {**_schedule(104, "09:00:00", "10:00:00"), "scheduleID": 500},
+        {**_schedule(105, "09:00:00", "10:00:00"), "scheduleID": 500},
+    ]
+    res = client.post("/engineer_management/schedules/bulk",
+                      content="\n".join(json.dumps(r) for r in rows), headers=auth_headers)
+    data = res.json()
+    assert (data["received"], data["inserted"], data["failed"]) == (6, 3, 3)
+    assert [e["line"] for e in data["errors"]] == [2, 3, 6]
+    assert "bentrok" in data["errors"][0]["error"]
+
+    schedules = client.get("/engineer_management/schedules/", headers=auth_headers).json()
+    ids = [s["scheduleID"] for s in schedules]
+    assert len(ids) == len(set(ids)) == 3
+    assert 500 in ids
+
+    created = client.post("/engineer_management/schedules/", json=_schedule(106, "09:00:00", "10:00:00"),
+                          headers=auth_headers)
+    assert created.json()["scheduleID"] > 500
+
+def test_team_driver_subresource(client, auth_headers):
+    client.post("/teams/", json={"teamID": 1, "name": "Ferrari"}, headers=auth_headers)
+    driver = {"driverID": 16, "name": "Charles", "driverAbb": "LEC", "nationality": "MON", "physicalCondition": "Fit"}
+
+    res = client.post("/teams/1/drivers", json=driver, headers=auth_headers)
+    assert res.status_code == 200
+    res = client.patch("/teams/1/drivers/16", json={"physicalCondition": "Injured"}, headers=auth_headers)
+    assert res.status_code == 200
+    assert res.json() == {**driver, "physicalCondition": "Injured"}
+
+    team = client.get("/teams/1", headers=auth_headers).json()
+    assert team["drivers"] == [{**driver, "physicalCondition": "Injured"}]
+
+    client.post("/teams/1/drivers", json={**driver, "name": "Charles L"}, headers=auth_headers)
+    assert [d["name"] for d in client.get("/teams/1", headers=auth_headers).json()["drivers"]] == ["Charles L"]
+
+    assert client.delete("/teams/1/drivers/16", headers=auth_headers).status_code == 204
+    assert client.get("/teams/1", headers=auth_headers).json()["drivers"] == []
+    assert client.patch("/teams/1/drivers/16", json={"name": "X"}, headers=auth_headers).status_code == 404
+    assert client.post("/teams/9/drivers", json=driver, headers=auth_headers).status_code == 404
+
+def test_team_inventory_and_members_subresources(client, auth_headers):
+    client.post("/teams/", json={"teamID": 1, "name": "Ferrari", "inventory": [
+        {"itemID": 1, "partName": "Front Wing", "quantity": 4, "status": "Ready"}
+    ]}, headers=auth_headers)
+
+    res = client.patch("/teams/1/inventory/1", json={"quantity": 2}, headers=auth_headers)
+    assert res.json() == {"itemID": 1, "partName": "Front Wing", "quantity": 2, "status": "Ready"}
+    res = client.patch("/teams/1/inventory/1", json={"quantity": "lots"}, headers=auth_headers)
+    assert res.status_code == 422
+
+    client.post("/teams/1/sponsors", json={"sponsorID": 1, "sponsorName": "Shell", "contractValue": 1e6},
+                headers=auth_headers)
+    assert client.post("/teams/1/members", json={"name": "Vasseur"}, headers=auth_headers).json() == ["Vasseur"]
+    assert client.delete("/teams/1/members/Vasseur", headers=auth_headers).status_code == 204
+    assert client.delete("/teams/1/members/Vasseur", headers=auth_headers).status_code == 404
+
+    team = client.get("/teams/1", headers=auth_headers).json()
+    assert team["sponsors"][0]["sponsorName"] == "Shell"
+    assert team["members"] == []
+
+def test_inventory_index_follows_team_writes(client, auth_headers):
+    def item(item_id, part, quantity, item_status="Ready"):
+        return {"itemID": item_id, "partName": part, "quantity": quantity, "status": item_status}
+
+    client.post("/teams/", json={"teamID": 1, "name": "Ferrari", "inventory": [
+        item(1, "Front Wing", 4), item(2, "Front Wing", 1, "Damaged"), item(3, "Gearbox", 2)
+    ]}, headers=auth_headers)
+    client.post("/teams/", json={"teamID": 2, "name": "McLaren", "inventory": [item(1, "Front Wing", 6)]},
+                headers=auth_headers)
+
+    res = client.get("/inventory/parts/Front Wing", headers=auth_headers)
+    assert res.status_code == 200
+    data = res.json()
+    assert data["quantity"] == 11
+    assert data["byStatus"] == {"Damaged": 1, "Ready": 10}
+    assert [(t["teamName"], t["status"], t["quantity"]) for t in data["teams"]] == [
+        ("Ferrari", "Damaged", 1), ("Ferrari", "Ready", 4), ("McLaren", "Ready", 6)
+    ]
+
+    res = client.get("/inventory/", params={"status": "Ready"}, headers=auth_headers)
+    assert res.json() == [
+        {"partName": "Front Wing", "status": "Ready", "quantity": 10, "teams": 2},
+        {"partName": "Gearbox", "status": "Ready", "quantity": 2, "teams": 1},
+    ]
+
+    client.patch("/teams/1/inventory/3", json={"quantity": 9}, headers=auth_headers)
+    client.delete("/teams/2/inventory/1", headers=auth_headers)
+    res = client.get("/inventory/low-stock", params={"threshold": 5}, headers=auth_headers)
+    assert [(r["partName"], r["status"], r["quantity"]) for r in res.json()] == [
+        ("Front Wing", "Damaged", 1), ("Front Wing", "Ready", 4)
+    ]
+
+    assert client.get("/inventory/parts/Brake Disc", headers=auth_headers).status_code == 404
+
+def test_driver_and_engineer_lookups_follow_team_writes(client, auth_headers):
+    client.post("/teams/", json={
+        "teamID": 1, "name": "Ferrari",
+        "drivers": [{"driverID": 16, "name": "Charles Leclerc", "driverAbb": "LEC", "nationality": "MON",
+                     "physicalCondition": "Fit"}],
+        "engineers": [{"engineerID": 101, "name": "Xavier", "role": "Race Engineer"}],
+    }, headers=auth_headers)
+
+    res = client.get("/drivers/16", headers=auth_headers)
+    assert res.status_code == 200
+    assert res.json()["teamName"] == "Ferrari"
+    assert res.json()["driver"]["driverAbb"] == "LEC"
+    assert client.get("/engineers/101/team", headers=auth_headers).json()["teamID"] == 1
+
+    client.patch("/teams/1/drivers/16", json={"physicalCondition": "Injured"}, headers=auth_headers)
+    assert client.get("/drivers/16", headers=auth_headers).json()["driver"]["physicalCondition"] == "Injured"
+
+    client.delete("/teams/1/engineers/101", headers=auth_headers)
+    assert client.get("/engineers/101/team", headers=auth_headers).status_code == 404
+    client.post("/teams/", json={"teamID": 1, "name": "Ferrari"}, headers=auth_headers)
+    assert client.get("/drivers/16", headers=auth_headers).status_code == 404
+
+def test_schedule_requires_rostered_engineer_when_enforced(client, auth_headers, monkeypatch):
+    import engineer_management
+    monkeypatch.setattr(engineer_management, "ENFORCE_ENGINEER_ROSTER", True)
+
+    res = client.post("/engineer_management/schedules/", json=_schedule(101, "09:00:00", "10:00:00"),
+                      headers=auth_headers)
+    assert res.status_code == 404
+
+    client.post("/teams/", json={"teamID": 1, "name": "Ferrari", "engineers": [
+        {"engineerID": 101, "name": "Xavier", "role": "Race Engineer"}
+    ]}, headers=auth_headers)
+    res = client.post("/engineer_management/schedules/", json=_schedule(101, "09:00:00", "10:00:00"),
+                      headers=auth_headers)
+    assert res.status_code == 201
+
+def test_fast_json_responses_match_default(client, auth_headers, monkeypatch):
+    import fast_json
+
+    client.post("/teams/", json={"teamID": 1, "name": "Ferrari", "inventory": [
+        {"itemID": 1, "partName": "Front Wing", "quantity": 4, "status": "Ready"}
+    ]}, headers=auth_headers)
+    for i in range(3):
+        client.post("/engineer_management/schedules/", json=_schedule(100 + i, "09:00:00", "10:00:00"),
+                    headers=auth_headers)
+
+    paths = ["/teams/1", "/engineer_management/schedules/?limit=2", "/inventory/parts/Front Wing"]
+    default = [client.get(path, headers=auth_headers) for path in paths]
+    monkeypatch.setattr(fast_json, "FAST_JSON_RESPONSES", True)
+    fast = [client.get(path, headers=auth_headers) for path in paths]
+
+    for slow_res, fast_res in zip(default, fast):
+        assert fast_res.status_code == slow_res.status_code == 200
+        assert fast_res.json() == slow_res.json()
+        assert fast_res.headers["content-type"] == "application/json"
+    assert fast[1].headers["X-Next-Cursor"] == default[1].headers["X-Next-Cursor"]
+
+def test_metrics_endpoint_reports_routes_stores_and_caches(client, auth_headers):
+    client.post("/teams/", json={"teamID": 1, "name": "Ferrari"}, headers=auth_headers)
+    client.get("/teams/1", headers=auth_headers)
+    client.get("/teams/999", headers=auth_headers)
+    client.get("/no/such/path")
+
+    res = client.get("/metrics")
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain")
+    body = res.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/teams/{team_id}"}' in body
+    assert 'http_requests_total{method="GET",route="/teams/{team_id}",status="404"}' in body
+    assert 'route="unmatched"' in body
+    assert "/teams/999" not in body
+    assert 'http_request_size_bytes_total{method="POST",route="/teams/"}' in body
+    assert 'store_items{store="teams"} 1' in body
+    assert 'cache_hit_ratio{cache="auth_tokens"}' in body
+    assert 'cache_entries{cache="reports"}' in body
+
+def test_profiling_is_admin_only(client, auth_headers, monkeypatch, tmp_path):
+    import dependencies
+    import profiling
+    monkeypatch.setattr(dependencies, "admin_user", "someone_else")
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+
+    res = client.get("/teams/1", headers={**auth_headers, "X-Profile": "1"})
+    assert res.status_code == 403
+    assert client.get("/profiles/", headers=auth_headers).status_code == 403
+    assert list(tmp_path.iterdir()) == []
+
+def test_profiled_request_writes_bounded_profiles(client, auth_headers, monkeypatch, tmp_path):
+    import dependencies
+    import profiling
+    monkeypatch.setattr(dependencies, "admin_user", "jbenham")
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(profiling, "PROFILE_KEEP", 2)
+
+    res = client.post("/teams/", json={"teamID": 1, "name": "Ferrari"}, headers=auth_headers)
+    assert "X-Profile-Id" not in res.headers
+
+    ids = []
+    for _ in range(3):
+        res = client.post("/teams/?profile=1", json={"teamID": 1, "name": "Ferrari"}, headers=auth_headers)
+        assert res.status_code == 200
+        ids.append(res.headers["X-Profile-Id"])
+
+    listing = client.get("/profiles/", headers=auth_headers).json()
+    assert [p["profileID"] for p in listing] == ids[:0:-1]
+    assert listing[0]["route"] == "/teams/" and listing[0]["method"] == "POST"
+    assert len(list(tmp_path.iterdir())) == 6
+
+    collapsed = client.get(f"/profiles/{ids[-1]}/collapsed", headers=auth_headers)
+    assert collapsed.status_code == 200
+    assert any("create_team" in line for line in collapsed.text.splitlines())
+    assert client.get(f"/profiles/{ids[0]}/prof", headers=auth_headers).status_code == 404
+    assert client.get(f"/profiles/{ids[-1]}/json", headers=auth_headers).status_code == 404
+
+def test_flagged_request_unprofiled_while_another_profile_runs(client, auth_headers, monkeypatch, tmp_path):
+    import dependencies
+    import profiling
+    monkeypatch.setattr(dependencies, "admin_user", "jbenham")
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+
+    with profiling._loop_profiler_lock:
+        res = client.post("/teams/?profile=1", json={"teamID": 1, "name": "Ferrari"}, headers=auth_headers)
+    assert res.status_code == 200
+    assert "X-Profile-Id" not in res.headers
+    assert list(tmp_path.iterdir()) == []
+
+    res = client.get("/teams/1?profile=1", headers=auth_headers)
+    assert "X-Profile-Id" in res.headers
+
+def test_profiled_sync_endpoint(client, auth_headers, monkeypatch, tmp_path):
+    import pstats
+    import dependencies
+    import profiling
+    monkeypatch.setattr(dependencies, "admin_user", "jbenham")
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+    client.post("/teams/", json={"teamID": 1, "name": "Ferrari"}, headers=auth_headers)
+
+    res = client.get("/teams/1", headers={**auth_headers, "X-Profile": "1"})
+    assert res.status_code == 200 and res.json()["name"] == "Ferrari"
+    stats = pstats.Stats(str(tmp_path / f"{res.headers['X-Profile-Id']}.prof"))
+    assert any(name == "get_team" for _, _, name in stats.stats)
+
+def test_profiling_skipped_when_another_tool_is_active(client, auth_headers, monkeypatch, tmp_path):
+    import cProfile
+    import dependencies
+    import profiling
+
+    class Busy(cProfile.Profile):
+        def enable(self, *args, **kwargs):
+            raise ValueError("Another profiling tool is already active")
+
+    monkeypatch.setattr(dependencies, "admin_user", "jbenham")
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(profiling.cProfile, "Profile", Busy)
+
+    res = client.post("/teams/?profile=1", json={"teamID": 1, "name": "Ferrari"}, headers=auth_headers)
+    assert res.status_code == 200 and "X-Profile-Id" not in res.headers
+    assert not profiling._loop_profiler_lock.locked()
+
+def test_schedule_changes_since(client, auth_headers):
+    def schedule(hour, engineer_id=101):
+        return {"engineerID": engineer_id, "taskDescription": "Setup", "date": "2025-10-10",
+                "startTime": f"{hour:02d}:00:00", "endTime": f"{hour + 1:02d}:00:00", "location": "Garage",
+                "raceID": 1}
+
+    first = client.post("/engineer_management/schedules/", json=schedule(8), headers=auth_headers).json()
+    full = client.get("/engineer_management/schedules/changes", headers=auth_headers).json()
+    assert [s["scheduleID"] for s in full["changed"]] == [first["scheduleID"]]
+
+    second = client.post("/engineer_management/schedules/", json=schedule(10), headers=auth_headers).json()
+    client.put(f"/engineer_management/schedules/{first['scheduleID']}", json=schedule(9, engineer_id=102),
+               headers=auth_headers)
+    params = {"since": full["sequence"], "epoch": full["epoch"]}
+    delta = client.get("/engineer_management/schedules/changes", params=params, headers=auth_headers).json()
+    assert delta["reset"] is False
+    assert [s["scheduleID"] for s in delta["changed"]] == [second["scheduleID"], first["scheduleID"]]
+    assert delta["changed"][1]["engineerID"] == 102
+
+    params = {"since": delta["sequence"], "epoch": delta["epoch"]}
+    empty = client.get("/engineer_management/schedules/changes", params=params, headers=auth_headers).json()
+    assert empty["changed"] == [] and empty["sequence"] == delta["sequence"]
+
+    stale = client.get("/engineer_management/schedules/changes", params={"since": 10**9}, headers=auth_headers)
+    assert stale.json()["reset"] is True and len(stale.json()["changed"]) == 2
+
+def test_report_changes_since(client, auth_headers):
+    race_payload = {
+        "race": {"raceID": 50, "circuitName": "Spa", "date": "2025-08-01", "weather": "Rain", "result": []},
+        "strategyPlan": {"pitStopSchedule": [], "tyreStrategy": [], "fuelPlan": ""},
+        "liveTelemetry": {"speed": 0, "rpm": 0, "temperature": 0}
+    }
+    before = client.get("/report_system/changes", headers=auth_headers).json()
+    client.post("/race_strategy/", json=race_payload, headers=auth_headers)
+    report = client.post("/report_system/generate/50", headers=auth_headers).json()
+
+    params = {"since": before["sequence"], "epoch": before["epoch"]}
+    delta = client.get("/report_system/changes", params=params, headers=auth_headers).json()
+    assert [r["reportID"] for r in delta["changed"]] == [report["reportID"]]
+
+def test_dashboard_summary_counts(client, auth_headers):
+    team = {"teamID": 1, "name": "Ferrari",
+            "drivers": [{"driverID": 16, "name": "Leclerc", "driverAbb": "LEC", "nationality": "MON",
+                         "physicalCondition": "Fit"}],
+            "engineers": [{"engineerID": 101, "name": "Xavi", "role": "Race Engineer"}]}
+    client.post("/teams/", json=team, headers=auth_headers)
+    client.post("/teams/", json={**team, "name": "Scuderia Ferrari"}, headers=auth_headers)
+    client.post("/engineer_management/schedules/", json={
+        "engineerID": 101, "taskDescription": "Setup", "date": "2025-10-10", "startTime": "09:00:00",
+        "endTime": "10:00:00", "location": "Garage", "raceID": 1
+    }, headers=auth_headers)
+    client.post("/telemetry/ingest", content='{"driverID": 16, "ts": 5, "speed": 310, "rpm": 11800, "temperature": 95}\n',
+                headers=auth_headers)
+
+    summary = client.get("/dashboard/summary", headers=auth_headers).json()
+    assert (summary["teams"], summary["drivers"], summary["engineers"]) == (1, 1, 1)
+    assert summary["schedules"] == 1 and summary["reports"] == 0
+    assert summary["telemetry"] == [{"driverID": 16, "timestamp": 5.0, "speed": 310.0, "rpm": 11800,
+                                     "temperature": 95.0}]
+    assert summary["api"]["requests"] >= 4 and summary["api"]["p95Ms"] >= summary["api"]["p50Ms"] > 0
+
+def test_user_directory_builds_deferred_entries_once():
+    from dependencies import UserDirectory
+
+    calls = []
+    users = UserDirectory()
+    users.defer("admin", lambda: calls.append(1) or {"username": "admin"})
+    version = users.version
+
+    assert calls == []
+    assert "admin" in users and users["admin"] == {"username": "admin"}
+    assert users.get("admin") == {"username": "admin"} and users.get("nobody") is None
+    assert calls == [1] and users.version == version + 1
+
+    users.defer("other", lambda: {"username": "other"})
+    users.clear()
+    assert "other" not in users
+    with pytest.raises(KeyError):
+        users["other"]
+
+def test_user_directory_entry_visible_while_it_is_built():
+    import threading
+    from dependencies import UserDirectory
+
+    started, release = threading.Event(), threading.Event()
+
+    def build():
+        started.set()
+        release.wait(5)
+        return {"username": "admin"}
+
+    users = UserDirectory()
+    users.defer("admin", build)
+    warming = threading.Thread(target=users.resolve_deferred)
+    warming.start()
+    assert started.wait(5)
+
+    seen = []
+    lookup = threading.Thread(target=lambda: seen.append(users.get("admin")))
+    lookup.start()
+    lookup.join(0.05)
+    release.set()
+    warming.join(5)
+    lookup.join(5)
+    assert seen == [{"username": "admin"}]
+
+def test_lifespan_builds_deferred_users_before_serving():
+    from fastapi.testclient import TestClient
+    import main
+    from dependencies import users_db
+
+    users_db.defer("late_admin", lambda: {"username": "late_admin"})
+    with TestClient(main.app):
+        assert dict.__contains__(users_db, "late_admin")
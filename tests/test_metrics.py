@@ -0,0 +1,35 @@
+from metrics import LATENCY_BUCKETS, MetricsRegistry
+
+
+def test_registry_renders_cumulative_histogram():
+    registry = MetricsRegistry()
+    registry.observe("GET", "/teams/{team_id}", 200, 0.002, 0, 120)
+    registry.observe("GET", "/teams/{team_id}", 404, 0.2, 0, 30)
+    registry.observe("GET", "/teams/{team_id}", 200, 60.0, 0, 120)
+
+    lines = registry.render().splitlines()
+    labels = 'method="GET",route="/teams/{team_id}"'
+    assert f'http_request_duration_seconds_bucket{{{labels},le="0.001"}} 0' in lines
+    assert f'http_request_duration_seconds_bucket{{{labels},le="0.0025"}} 1' in lines
+    assert f'http_request_duration_seconds_bucket{{{labels},le="0.25"}} 2' in lines
+    assert f'http_request_duration_seconds_bucket{{{labels},le="{LATENCY_BUCKETS[-1]}"}} 2' in lines
+    assert f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 3' in lines
+    assert f'http_request_duration_seconds_count{{{labels}}} 3' in lines
+    assert f'http_requests_total{{{labels},status="404"}} 1' in lines
+    assert f'http_response_size_bytes_total{{{labels}}} 270' in lines
+
+
+def test_registry_escapes_label_values():
+    registry = MetricsRegistry()
+    registry.observe("GET", 'odd"route\\', 200, 0.01, 0, 0)
+    assert 'route="odd\\"route\\\\"' in registry.render()
+
+
+def test_registry_recent_latency_percentiles():
+    registry = MetricsRegistry()
+    assert registry.recent_latency() == {"p50Ms": 0.0, "p95Ms": 0.0}
+    for ms in range(1, 101):
+        registry.observe("GET", "/teams/{team_id}", 200, ms / 1000, 0, 0)
+    assert registry.total == 100
+    latency = registry.recent_latency()
+    assert round(latency["p50Ms"]) == 51 and round(latency["p95Ms"]) == 96
@@ -0,0 +1,215 @@
+from datetime import date, time
+import pytest
+
+from models import EngineerSchedule
+from storage import (
+    FieldIndex, IndexedStore, InMemoryRepository, IntervalIndex, SortedIndex, SQLiteRepository, VersionIndex,
+    collect_changes, create_repository, registered_repositories
+)
+
+
+def make_schedule(schedule_id, engineer_id=101, race_id=1):
+    return EngineerSchedule(
+        scheduleID=schedule_id, engineerID=engineer_id, taskDescription=f"Task {schedule_id}",
+        date=date(2025, 10, 10), startTime=time(9), endTime=time(10), location="Garage", raceID=race_id
+    )
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def repo(request, tmp_path):
+    fields = ("engineerID", "raceID", "date")
+    if request.param == "memory":
+        return InMemoryRepository("schedules", EngineerSchedule, fields)
+    return SQLiteRepository("schedules", EngineerSchedule, fields, path=str(tmp_path / "test.sqlite3"))
+
+
+def test_repository_crud(repo):
+    repo[1] = make_schedule(1)
+    repo[2] = make_schedule(2, engineer_id=102)
+
+    assert len(repo) == 2
+    assert 1 in repo and 3 not in repo
+    assert repo[1].taskDescription == "Task 1"
+    assert repo.get(3) is None
+    assert sorted(repo) == [1, 2]
+    assert [s.scheduleID for s in repo.values()] == [1, 2]
+
+    del repo[1]
+    assert 1 not in repo
+    with pytest.raises(KeyError):
+        del repo[1]
+    with pytest.raises(KeyError):
+        repo[1]
+
+    repo.clear()
+    assert len(repo) == 0
+
+
+def test_repository_get_many(repo):
+    repo.put_many((i, make_schedule(i)) for i in range(1, 6))
+
+    assert [s.scheduleID for s in repo.get_many([4, 1, 9, 2])] == [4, 1, 2]
+    assert repo.get_many([]) == []
+
+
+def test_collect_changes_reads_in_one_query(tmp_path):
+    versions = VersionIndex()
+    repository = SQLiteRepository("schedules", EngineerSchedule, path=str(tmp_path / "test.sqlite3"))
+    store = IndexedStore(repository, indexes=[versions])
+    store.put_many((i, make_schedule(i)) for i in range(1, 6))
+    seen = versions.version
+    store[5] = make_schedule(5, engineer_id=102)
+    store[6] = make_schedule(6)
+
+    statements = []
+    repository.db.conn.set_trace_callback(statements.append)
+    try:
+        delta = collect_changes(store, versions, seen)
+        snapshot = collect_changes(store, versions, seen, epoch="other")
+    finally:
+        repository.db.conn.set_trace_callback(None)
+
+    assert [s.scheduleID for s in delta["changed"]] == [5, 6]
+    assert snapshot["reset"] and [s.scheduleID for s in snapshot["changed"]] == [1, 2, 3, 4, 5, 6]
+    assert len(statements) == 2
+
+
+def test_repository_find_by_index_field(repo):
+    repo.put_many((i, make_schedule(i, engineer_id=100 + i % 2, race_id=i)) for i in range(1, 7))
+
+    assert [s.scheduleID for s in repo.find("engineerID", 101)] == [1, 3, 5]
+    assert [s.scheduleID for s in repo.find("raceID", 4)] == [4]
+    assert len(repo.find("date", date(2025, 10, 10))) == 6
+    assert [s.scheduleID for s in repo.find("location", "Garage")][:2] == [1, 2]
+
+
+def test_sqlite_batch_rolls_back_on_error(tmp_path):
+    repo = SQLiteRepository("schedules", EngineerSchedule, path=str(tmp_path / "test.sqlite3"))
+    with pytest.raises(RuntimeError):
+        with repo.batch():
+            repo[1] = make_schedule(1)
+            raise RuntimeError("boom")
+    assert len(repo) == 0
+
+
+def test_sqlite_data_survives_reopen(tmp_path):
+    path = str(tmp_path / "test.sqlite3")
+    SQLiteRepository("schedules", EngineerSchedule, path=path)[7] = make_schedule(7)
+
+    reopened = SQLiteRepository("schedules", EngineerSchedule, path=path)
+    assert reopened[7].scheduleID == 7
+
+
+def test_create_repository_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        create_repository("things", EngineerSchedule, backend="redis")
+
+
+def test_app_stores_are_registered():
+    import dependencies  # noqa: F401
+    import engineer_management  # noqa: F401
+    import report_system  # noqa: F401
+
+    names = set(registered_repositories())
+    assert {"teams", "race_strategies", "driver_performance", "engineer_schedules", "race_reports"} <= names
+
+
+def test_indexed_store_keeps_indexes_in_sync():
+    by_engineer = FieldIndex("engineerID")
+    by_date = SortedIndex("date")
+    store = IndexedStore(InMemoryRepository("schedules", EngineerSchedule), indexes=[by_engineer, by_date])
+
+    store[1] = make_schedule(1)
+    store[2] = make_schedule(2)
+    store[2] = make_schedule(2, engineer_id=102)
+    assert by_engineer.lookup(101) == {1}
+    assert by_engineer.lookup(102) == {2}
+
+    del store[1]
+    assert by_engineer.lookup(101) == set()
+    assert by_date.range(date(2025, 10, 1), date(2025, 10, 31)) == [2]
+    assert by_date.range(high=date(2025, 10, 9)) == []
+
+    store.clear()
+    assert by_engineer.lookup(102) == set()
+    assert by_date.range() == []
+
+
+def test_indexed_store_rebuilds_from_existing_data(tmp_path):
+    repo = SQLiteRepository("schedules", EngineerSchedule, path=str(tmp_path / "test.sqlite3"))
+    repo.put_many((i, make_schedule(i, engineer_id=100 + i)) for i in range(1, 4))
+
+    by_engineer = FieldIndex("engineerID")
+    IndexedStore(repo, indexes=[by_engineer])
+    assert by_engineer.lookup(102) == {2}
+
+
+def test_interval_index_overlaps():
+    index = IntervalIndex(lambda v: v[0], lambda v: (v[1], v[2]))
+    index.add(1, ("a", 0, 100))
+    index.add(2, ("a", 100, 110))
+    index.add(3, ("a", 200, 300))
+    index.add(4, ("b", 0, 1000))
+
+    assert index.overlapping("a", 50, 150) == [1, 2]
+    assert index.overlapping("a", 110, 200) == []
+    assert index.overlapping("a", 250, 260) == [3]
+    assert index.overlapping("a", 0, 100, exclude=1) == []
+
+    index.remove(1, ("a", 0, 100))
+    assert index.overlapping("a", 50, 150) == [2]
+    assert index.overlapping("c", 0, 10) == []
+
+
+def test_sqlite_stores_compact_driver_performance(tmp_path):
+    from lap_store import CompactDriverPerformance
+    from models import Driver, TelemetryData
+
+    record = CompactDriverPerformance.from_ms(
+        Driver(driverID=1, name="Lewis", driverAbb="HAM", nationality="UK", physicalCondition="Fit"),
+        [90500, 91000], TelemetryData(speed=300, rpm=11000, temperature=90),
+    )
+    repo = SQLiteRepository("driver_performance", CompactDriverPerformance, path=str(tmp_path / "test.sqlite3"))
+    repo[1] = record
+
+    loaded = repo[1]
+    assert loaded.lap_ms.tolist() == [90500, 91000]
+    assert loaded.to_model().lapTimes[0].seconds == 30
+
+
+def test_indexed_store_compare_and_set():
+    store = IndexedStore(InMemoryRepository("schedules", EngineerSchedule))
+    first, second = make_schedule(1), make_schedule(1, engineer_id=102)
+
+    assert store.compare_and_set(1, None, first)
+    assert not store.compare_and_set(1, None, second)
+    assert store[1] is first
+
+    assert store.compare_and_set(1, first, second)
+    assert not store.compare_and_set(1, first, make_schedule(1, engineer_id=103))
+    assert store[1].engineerID == 102
+
+
+def test_version_index_changes_since():
+    versions = VersionIndex()
+    store = IndexedStore(InMemoryRepository("schedules", EngineerSchedule), indexes=[versions])
+    store.put_many((i, make_schedule(i)) for i in (1, 2, 3))
+    seen = versions.version
+
+    assert versions.changed_since(seen) == ([], [])
+    store[2] = make_schedule(2, engineer_id=102)
+    store[4] = make_schedule(4)
+    del store[1]
+    assert versions.changed_since(seen) == ([2, 4], [1])
+    assert versions.changed_since(0) == ([3, 2, 4], [1])
+    assert versions.changed_since(versions.version + 1) is None
+
+    delta = collect_changes(store, versions, seen)
+    assert not delta["reset"] and delta["sequence"] == versions.version
+    assert [s.scheduleID for s in delta["changed"]] == [2, 4] and delta["deleted"] == [1]
+
+    store.clear()
+    store[5] = make_schedule(5)
+    assert versions.changed_since(seen) is None
+    assert collect_changes(store, versions, seen)["reset"]
+    assert collect_changes(store, versions, versions.version, epoch="other")["reset"]
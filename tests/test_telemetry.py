@@ -0,0 +1,99 @@
+import json
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from telemetry import TelemetryRing, telemetry_hub
+
+
+def test_ring_keeps_latest_samples_in_order():
+    ring = TelemetryRing(capacity=3)
+    assert ring.last() is None
+    for i in range(5):
+        ring.append(float(i), 100.0 + i, 10000 + i, 90.0)
+
+    assert ring.count == 3 and ring.total == 5
+    assert ring.latest(10)["timestamp"] == [2.0, 3.0, 4.0]
+    assert ring.latest(2)["rpm"] == [10003, 10004]
+    assert ring.last() == (4.0, 104.0, 10004, 90.0)
+
+
+def test_ring_time_window():
+    ring = TelemetryRing(capacity=4)
+    for i in range(6):
+        ring.append(float(i), 0.0, 0, 0.0)
+
+    assert ring.window(3.0, 4.0)["timestamp"] == [3.0, 4.0]
+    assert ring.window(since=4.5)["timestamp"] == [5.0]
+    assert ring.window(until=1.0)["timestamp"] == []
+
+
+def test_ingest_ndjson_and_query(client, auth_headers):
+    lines = [
+        {"driverID": 1, "ts": 10.0, "speed": 300.5, "rpm": 11000, "temperature": 95.0},
+        {"driverID": 1, "ts": 11.0, "speed": 301.0, "rpm": 11100, "temperature": 95.5},
+        {"driverID": 44, "ts": 10.5, "speed": 290.0, "rpm": 10800, "temperature": 97.0},
+    ]
+    body = "\n".join(json.dumps(line) for line in lines) + "\nnot json\n{\"driverID\": 1}\n"
+    response = client.post("/telemetry/ingest", content=body, headers=auth_headers)
+    assert response.status_code == 200
+    result = response.json()
+    assert result["accepted"] == 3
+    assert result["rejected"] == 2
+    assert result["errors"][0].startswith("line 4")
+
+    series = client.get("/telemetry/1?last=1", headers=auth_headers).json()
+    assert series["timestamp"] == [11.0]
+    assert series["rpm"] == [11100]
+
+    window = client.get("/telemetry/1?since=9&until=10.5", headers=auth_headers).json()
+    assert window["speed"] == [300.5]
+
+    assert len(client.get("/telemetry/44", headers=auth_headers).json()["speed"]) == 1
+    assert client.get("/telemetry/99", headers=auth_headers).status_code == 404
+
+
+def test_ingest_rejects_out_of_range_numbers(client, auth_headers):
+    body = (
+        '{"driverID": 1, "ts": 1, "speed": 300, "rpm": 1e30, "temperature": 90}\n'
+        '{"driverID": 1, "ts": 2, "speed": 300, "rpm": Infinity, "temperature": 90}\n'
+        '{"driverID": Infinity, "ts": 3, "speed": 300, "rpm": 11000, "temperature": 90}\n'
+        '{"driverID": 1, "ts": 4, "speed": 300, "rpm": 11000, "temperature": 90}\n'
+    )
+    result = client.post("/telemetry/ingest", content=body, headers=auth_headers).json()
+    assert (result["accepted"], result["rejected"]) == (1, 3)
+    assert client.get("/telemetry/1", headers=auth_headers).json()["rpm"] == [11000]
+
+    token = auth_headers["Authorization"].split()[1]
+    with client.websocket_connect(f"/telemetry/ws?token={token}") as ws:
+        ws.send_text(body)
+        assert ws.receive_json() == {"accepted": 1, "rejected": 3}
+
+
+def test_rejected_sample_allocates_no_ring(client, auth_headers):
+    body = (
+        '{"driverID": 77, "speed": "x", "rpm": 11000, "temperature": 90}\n'
+        '{"driverID": 78, "speed": NaN, "rpm": 11000, "temperature": 90}\n'
+        '{"driverID": 79, "speed": 300, "rpm": 11000, "temperature": Infinity}\n'
+        '{"driverID": 80, "ts": -Infinity, "speed": 300, "rpm": 11000, "temperature": 90}\n'
+    )
+    result = client.post("/telemetry/ingest", content=body, headers=auth_headers).json()
+    assert (result["accepted"], result["rejected"]) == (0, 4)
+    assert telemetry_hub.drivers() == []
+    assert client.get("/telemetry/77", headers=auth_headers).status_code == 404
+
+
+def test_telemetry_websocket(client, auth_headers):
+    token = auth_headers["Authorization"].split()[1]
+    with client.websocket_connect(f"/telemetry/ws?token={token}") as ws:
+        ws.send_text('{"driverID": 16, "speed": 310, "rpm": 11500, "temperature": 99}\n'
+                     '{"driverID": 16, "speed": 312, "rpm": 11600, "temperature": 99}')
+        assert ws.receive_json() == {"accepted": 2, "rejected": 0}
+
+    series = client.get("/telemetry/16", headers=auth_headers).json()
+    assert series["speed"] == [310.0, 312.0]
+
+
+def test_telemetry_websocket_rejects_bad_token(client):
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect("/telemetry/ws?token=bad") as ws:
+            ws.receive_text()